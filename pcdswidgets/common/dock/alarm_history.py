@@ -0,0 +1,230 @@
+"""
+Recording and playback of device alarm levels for the IndicatorGrid.
+
+Alarm transitions are appended to a local file with one json value per line:
+
+- A transition is a short list: ``[timestamp, device_name, level]``
+- A keyframe is a dict with the full state:
+  ``{"t": timestamp, "keyframe": {device_name: level, ...}}``
+
+Keyframes are written when recording starts and then periodically,
+so that the state at any time can be rebuilt from the closest
+keyframe before it plus a few transitions, without replaying the
+whole file.
+
+Recording is cheap for the GUI thread: transitions are collected in a
+list and handed to a background thread in batches for writing.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import json
+import logging
+import os
+import queue
+import time
+
+from qtpy import QtCore
+
+logger = logging.getLogger(__name__)
+
+
+# Keep running writers alive until they finish, even if their recorder is deleted
+_RUNNING_WRITERS: set[AlarmHistoryWriter] = set()
+
+
+class AlarmHistoryWriter(QtCore.QThread):
+    """
+    Thread that appends batches of lines to the alarm history file.
+
+    Parameters
+    ----------
+    filename : str
+        The file to append to. It is created if it doesn't exist.
+    """
+
+    def __init__(self, filename: str):
+        super().__init__()
+        self.filename = filename
+        self._queue: queue.Queue[list[str] | None] = queue.Queue()
+        _RUNNING_WRITERS.add(self)
+        self.finished.connect(functools.partial(_RUNNING_WRITERS.discard, self))
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def write(self, lines: list[str]) -> None:
+        """Queue lines to be written. This returns immediately."""
+        self._queue.put(lines)
+
+    def stop(self) -> None:
+        """Write everything that is queued and then end the thread."""
+        if self.isRunning():
+            self._queue.put(None)
+            self.wait()
+
+    def run(self):
+        """Write each batch of lines as it arrives."""
+        with open(self.filename, "a") as f:
+            while True:
+                lines = self._queue.get()
+                if lines is None:
+                    return
+                try:
+                    f.write("".join(lines))
+                    f.flush()
+                except Exception:
+                    logger.error("Failed to write alarm history to %s", self.filename)
+                    logger.debug("Failed to write alarm history to %s", self.filename, exc_info=True)
+
+
+class AlarmRecorder(QtCore.QObject):
+    """
+    Records device alarm transitions to an append-only file.
+
+    Call record from the GUI thread whenever a device alarm level changes.
+
+    Parameters
+    ----------
+    filename : str
+        The file to append to.
+    flush_interval_ms : int, optional
+        How often to hand the collected transitions to the writer thread.
+    keyframe_interval : float, optional
+        The minimum number of seconds between keyframes.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        flush_interval_ms: int = 1000,
+        keyframe_interval: float = 300.0,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.filename = filename
+        self.keyframe_interval = keyframe_interval
+        self.state: dict[str, int] = {}
+        self._pending: list[str] = []
+        self._last_keyframe: float | None = None
+        self._writer = AlarmHistoryWriter(filename)
+        self._writer.start()
+        self._timer = QtCore.QTimer(parent=self)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start(flush_interval_ms)
+
+    def record(self, name: str, level: int, timestamp: float | None = None) -> None:
+        """Record that a device changed to a new alarm level."""
+        level = int(level)
+        if self.state.get(name) == level:
+            return
+        self.state[name] = level
+        if timestamp is None:
+            timestamp = time.time()
+        self._pending.append(json.dumps([round(timestamp, 3), name, level]) + "\n")
+
+    def flush(self) -> None:
+        """Send the recorded transitions to the writer, adding a keyframe if one is due."""
+        now = time.time()
+        if self._last_keyframe is None or now - self._last_keyframe >= self.keyframe_interval:
+            self._pending.append(json.dumps({"t": round(now, 3), "keyframe": self.state}) + "\n")
+            self._last_keyframe = now
+        if self._pending:
+            self._writer.write(self._pending)
+            self._pending = []
+
+    def stop(self) -> None:
+        """Write everything and stop recording."""
+        self._timer.stop()
+        self.flush()
+        self._writer.stop()
+
+
+class AlarmHistory:
+    """
+    Reads an alarm history file to rebuild the alarm state at any time.
+
+    Parameters
+    ----------
+    filename : str
+        The file written by an AlarmRecorder.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._offset = 0
+        self._times: list[float] = []
+        self._names: list[str] = []
+        self._levels: list[int] = []
+        self._keyframe_times: list[float] = []
+        # The state and the number of transitions before each keyframe
+        self._keyframes: list[tuple[dict[str, int], int]] = []
+        self.update()
+
+    def update(self) -> None:
+        """Read any lines that were added to the file since the last update."""
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, "r") as f:
+            f.seek(self._offset)
+            while True:
+                line = f.readline()
+                # Stop at a partially written line, we'll read it next time
+                if not line.endswith("\n"):
+                    break
+                self._offset = f.tell()
+                try:
+                    self._add_line(json.loads(line))
+                except Exception:
+                    logger.debug("Skipping bad alarm history line %r", line, exc_info=True)
+
+    def _add_line(self, value: list | dict) -> None:
+        """Include one decoded line from the file."""
+        if isinstance(value, list):
+            timestamp, name, level = value
+            self._times.append(timestamp)
+            self._names.append(name)
+            self._levels.append(level)
+        else:
+            self._keyframe_times.append(value["t"])
+            self._keyframes.append((value["keyframe"], len(self._times)))
+
+    @property
+    def start_time(self) -> float | None:
+        """The time of the first keyframe or transition, if any."""
+        times = [times[0] for times in (self._times, self._keyframe_times) if times]
+        return min(times, default=None)
+
+    @property
+    def end_time(self) -> float | None:
+        """The time of the last keyframe or transition, if any."""
+        times = [times[-1] for times in (self._times, self._keyframe_times) if times]
+        return max(times, default=None)
+
+    def state_at(self, timestamp: float) -> dict[str, int]:
+        """
+        Return the alarm level of every recorded device at a given time.
+
+        Parameters
+        ----------
+        timestamp : float
+            The time as a unix timestamp, like time.time().
+
+        Returns
+        -------
+        state : dict
+            Mapping from device name to alarm level.
+        """
+        index = bisect.bisect_right(self._keyframe_times, timestamp) - 1
+        if index < 0:
+            state = {}
+            start = 0
+        else:
+            keyframe, start = self._keyframes[index]
+            state = dict(keyframe)
+        end = bisect.bisect_right(self._times, timestamp, lo=start)
+        for name, level in zip(self._names[start:end], self._levels[start:end], strict=True):
+            state[name] = level
+        return state
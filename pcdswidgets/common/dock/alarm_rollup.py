@@ -0,0 +1,135 @@
+"""
+Incremental rollup of device alarm levels into groups of devices.
+
+Each device belongs to a few groups, e.g. its IndicatorCell and the row
+and column IndicatorGroup headers of the IndicatorGrid.
+For every group we keep the number of devices at each alarm level,
+so that a single device alarm change is an O(1) update rather than a
+re-scan of every device in the group.
+
+The alarm levels match typhos.alarm.AlarmLevel, but we don't import typhos
+here so that this can be used without the optional dependencies.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Hashable, Iterable
+
+from qtpy import QtCore
+
+logger = logging.getLogger(__name__)
+
+# Same order and values as typhos.alarm.AlarmLevel
+ALARM_LEVELS = ("NO_ALARM", "MINOR", "MAJOR", "INVALID", "DISCONNECTED")
+DISCONNECTED = len(ALARM_LEVELS) - 1
+
+
+class AlarmRollup(QtCore.QObject):
+    """
+    Keeps the alarm counts and worst alarm level for groups of devices.
+
+    Changes are coalesced: rollup_changed is emitted at most once per
+    interval_ms with the set of groups that changed, no matter how many
+    device alarm transitions happened in the meantime.
+
+    Parameters
+    ----------
+    interval_ms : int, optional
+        The minimum time between rollup_changed emissions. Defaults to 200.
+    """
+
+    rollup_changed = QtCore.Signal(object)
+
+    def __init__(self, interval_ms: int = 200, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self._levels: dict[Hashable, int] = {}
+        self._device_groups: dict[Hashable, tuple[Hashable, ...]] = {}
+        self._counts: dict[Hashable, list[int]] = {}
+        self._changed: set[Hashable] = set()
+        self._timer = QtCore.QTimer(parent=self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def add_device(self, device: Hashable, groups: Iterable[Hashable], level: int = DISCONNECTED) -> None:
+        """
+        Start tracking a device.
+
+        Parameters
+        ----------
+        device : hashable
+            A key that identifies the device in later updates.
+        groups : iterable of hashable
+            Every group that this device should be counted in.
+        level : int, optional
+            The device's current alarm level. Defaults to DISCONNECTED.
+        """
+        if device in self._levels:
+            self.remove_device(device)
+        groups = tuple(groups)
+        level = int(level)
+        self._levels[device] = level
+        self._device_groups[device] = groups
+        for group in groups:
+            self._counts.setdefault(group, [0] * len(ALARM_LEVELS))[level] += 1
+        self._mark_changed(groups)
+
+    def remove_device(self, device: Hashable) -> None:
+        """Stop tracking a device."""
+        level = self._levels.pop(device)
+        groups = self._device_groups.pop(device)
+        for group in groups:
+            self._counts[group][level] -= 1
+        self._mark_changed(groups)
+
+    def update_device(self, device: Hashable, level: int) -> None:
+        """Record a new alarm level for one device."""
+        level = int(level)
+        old = self._levels.get(device)
+        if old is None or old == level:
+            return
+        self._levels[device] = level
+        groups = self._device_groups[device]
+        for group in groups:
+            counts = self._counts[group]
+            counts[old] -= 1
+            counts[level] += 1
+        self._mark_changed(groups)
+
+    def remove_group(self, group: Hashable) -> None:
+        """Forget a group that no longer has any devices, e.g. because its widget was deleted."""
+        self._counts.pop(group, None)
+        self._changed.discard(group)
+
+    def _mark_changed(self, groups: Iterable[Hashable]) -> None:
+        """Remember the changed groups and schedule a rollup_changed."""
+        self._changed.update(groups)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Emit rollup_changed now for all groups that changed."""
+        self._timer.stop()
+        if not self._changed:
+            return
+        changed = self._changed
+        self._changed = set()
+        self.rollup_changed.emit(changed)
+
+    def counts(self, group: Hashable) -> tuple[int, ...]:
+        """Return the number of devices in the group at each alarm level."""
+        return tuple(self._counts.get(group, [0] * len(ALARM_LEVELS)))
+
+    def worst(self, group: Hashable) -> int:
+        """Return the most severe alarm level in the group, or NO_ALARM if empty."""
+        counts = self._counts.get(group, ())
+        for level in reversed(range(len(counts))):
+            if counts[level]:
+                return level
+        return 0
+
+
+def format_alarm_counts(counts: Iterable[int]) -> str:
+    """Return a short multi-line summary of counts per alarm level, for tooltips."""
+    return "\n".join(f"{name}: {count}" for name, count in zip(ALARM_LEVELS, counts, strict=True) if count)
@@ -0,0 +1,280 @@
+"""
+Bounded cache of device displays for the IndicatorGrid.
+
+Device displays are expensive to create, so we keep them around after
+they are closed, but only up to a limit on both the number of displays
+and the total number of widgets they contain.
+The least recently used displays are deleted first, skipping any
+display that is still shown to the user, e.g. in a window or a dock tab.
+
+The DisplayPrewarmer can build displays ahead of time while the user is
+idle, so that the first click on a device is fast.
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+import time
+from typing import Any, Callable, Hashable
+
+from qtpy import QtCore
+from qtpy.QtWidgets import QStackedWidget, QWidget
+
+from .screen_cache import USER_INPUT_EVENTS
+
+logger = logging.getLogger(__name__)
+
+
+def display_in_use(display: QWidget) -> bool:
+    """
+    Return True if the display is shown or belongs to a dock tab.
+
+    Tabs that aren't the current tab are hidden but still in use.
+    """
+    if display.isVisible():
+        return True
+    parent = display.parentWidget()
+    return isinstance(parent, QStackedWidget) and parent.indexOf(display) != -1
+
+
+class DeviceDisplayCache:
+    """
+    Least recently used cache of one display widget per device.
+
+    This can be used like a dictionary from device to display.
+
+    Parameters
+    ----------
+    max_displays : int, optional
+        The maximum number of displays to keep.
+    max_widgets : int, optional
+        The maximum total number of child widgets in all the displays,
+        as a rough bound on the memory used.
+    """
+
+    def __init__(self, max_displays: int = 50, max_widgets: int = 50000):
+        self.max_displays = max_displays
+        self.max_widgets = max_widgets
+        self._displays: collections.OrderedDict[Hashable, QWidget] = collections.OrderedDict()
+        self._widget_counts: dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.build_times: dict[str, float] = {}
+
+    def __contains__(self, device: Hashable) -> bool:
+        return device in self._displays
+
+    def __len__(self) -> int:
+        return len(self._displays)
+
+    def __getitem__(self, device: Hashable) -> QWidget:
+        """Return a cached display and mark it as recently used, or raise KeyError."""
+        try:
+            display = self._displays[device]
+        except KeyError:
+            self.misses += 1
+            raise
+        self._displays.move_to_end(device)
+        self.hits += 1
+        return display
+
+    def __setitem__(self, device: Hashable, display: QWidget):
+        self.add(device, display)
+
+    def add(self, device: Hashable, display: QWidget, build_time: float | None = None) -> None:
+        """
+        Include a new display, evicting old displays if we are over the limits.
+
+        Parameters
+        ----------
+        device : hashable
+            The device that the display is for.
+        display : QWidget
+            The display widget.
+        build_time : float, optional
+            The number of seconds it took to create the display, for statistics.
+        """
+        if device in self._displays:
+            self.discard(device)
+        self._displays[device] = display
+        self._widget_counts[device] = len(display.findChildren(QWidget))
+        display.destroyed.connect(self._forget_destroyed(device, display))
+        if build_time is not None:
+            self.build_times[getattr(device, "name", str(device))] = build_time
+        self.evict()
+
+    def _forget_destroyed(self, device: Hashable, display: QWidget) -> Callable[[], None]:
+        """Make a callback that forgets a display if it gets deleted elsewhere."""
+
+        def forget(*args):
+            if self._displays.get(device) is display:
+                self.discard(device)
+
+        return forget
+
+    def discard(self, device: Hashable) -> QWidget | None:
+        """Stop caching a display without deleting it."""
+        self._widget_counts.pop(device, None)
+        return self._displays.pop(device, None)
+
+    @property
+    def widget_count(self) -> int:
+        """The total number of widgets in all cached displays."""
+        return sum(self._widget_counts.values())
+
+    def is_full(self) -> bool:
+        """Return True if adding one more display would be over the limits."""
+        return len(self._displays) >= self.max_displays or self.widget_count >= self.max_widgets
+
+    def evict(self) -> None:
+        """Delete the least recently used displays that aren't in use until we are within the limits."""
+        widget_count = self.widget_count
+        for device in list(self._displays):
+            if len(self._displays) <= self.max_displays and widget_count <= self.max_widgets:
+                return
+            display = self._displays[device]
+            if display_in_use(display):
+                continue
+            widget_count -= self._widget_counts[device]
+            self.discard(device)
+            self.evictions += 1
+            logger.debug("Deleting cached display for %s", getattr(device, "name", device))
+            display.setParent(None)
+            display.deleteLater()
+
+    def clear(self) -> None:
+        """Forget all cached displays without deleting them."""
+        self._displays.clear()
+        self._widget_counts.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the cache statistics as a dictionary."""
+        build_times = list(self.build_times.values())
+        return {
+            "displays": len(self._displays),
+            "widgets": self.widget_count,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "builds": len(build_times),
+            "mean_build_time": sum(build_times) / len(build_times) if build_times else 0.0,
+            "max_build_time": max(build_times, default=0.0),
+        }
+
+
+class DisplayPrewarmer(QtCore.QObject):
+    """
+    Builds device displays ahead of time, one at a time, when the user is idle.
+
+    Devices are built in the order they were queued, with urgent devices
+    (e.g. devices in alarm) moved to the front. Urgent devices still wait
+    for the user to be idle: displays are built in the GUI thread, and a
+    burst of alarms is exactly when the operators need the GUI to respond.
+    We wait until there has been no user input for idle_ms before each build,
+    and after each build we wait long enough to keep within cpu_fraction.
+    We stop building when the cache is full so that warming never
+    evicts a display that the user opened.
+
+    Parameters
+    ----------
+    build : callable
+        Function that creates and caches the display for a device,
+        e.g. display_for_device.
+    cache : DeviceDisplayCache
+        The cache that the build function stores displays in.
+    idle_ms : int, optional
+        How long the user must be idle before we build the next display.
+    cpu_fraction : float, optional
+        The largest fraction of the time to spend building, e.g. 0.25 waits
+        three times as long as the last display took before building the next.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[Any], QWidget],
+        cache: DeviceDisplayCache,
+        idle_ms: int = 2000,
+        cpu_fraction: float = 0.25,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.build = build
+        self.cache = cache
+        self.idle_ms = idle_ms
+        self.cpu_fraction = cpu_fraction
+        self.busy_seconds = 0.0
+        self._queue: collections.OrderedDict[Hashable, None] = collections.OrderedDict()
+        self._last_input = time.monotonic()
+        self._watching_input = False
+        self._timer = QtCore.QTimer(parent=self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._build_next)
+
+    def enqueue(self, device: Hashable, urgent: bool = False) -> None:
+        """Queue a device to have its display built, unless it already has one."""
+        if device in self.cache:
+            return
+        self._queue[device] = None
+        if urgent:
+            self._queue.move_to_end(device, last=False)
+        if not self._timer.isActive():
+            self._watch_input(True)
+            self._schedule(busy=0.0)
+
+    def pending(self) -> int:
+        """Return the number of devices waiting to be built."""
+        return len(self._queue)
+
+    def stop(self) -> None:
+        """Stop building displays and forget the queued devices."""
+        self._timer.stop()
+        self._queue.clear()
+        self._watch_input(False)
+
+    def eventFilter(self, obj: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        """Pause on any user input, without consuming the event."""
+        if event.type() in USER_INPUT_EVENTS:
+            self._last_input = time.monotonic()
+            if self._timer.isActive():
+                self._timer.start(self.idle_ms)
+        return False
+
+    def _watch_input(self, watch: bool) -> None:
+        """Start or stop watching for user input, only while there is work to do."""
+        app = QtCore.QCoreApplication.instance()
+        if app is None or watch == self._watching_input:
+            return
+        if watch:
+            app.installEventFilter(self)
+        else:
+            app.removeEventFilter(self)
+        self._watching_input = watch
+
+    def _schedule(self, busy: float) -> None:
+        """Build the next display once the user is idle, within the CPU budget."""
+        duty_delay = busy * (1 / self.cpu_fraction - 1)
+        idle_delay = self.idle_ms / 1000 - (time.monotonic() - self._last_input)
+        self._timer.start(int(1000 * max(duty_delay, idle_delay, 0)))
+
+    def _build_next(self) -> None:
+        """Build the display for the next queued device."""
+        if not self._queue or self.cache.is_full():
+            self._watch_input(False)
+            return
+        device, _ = self._queue.popitem(last=False)
+        elapsed = 0.0
+        if device not in self.cache:
+            start = time.monotonic()
+            try:
+                self.build(device)
+            except Exception:
+                logger.debug("Failed to prepare display for %s", getattr(device, "name", device), exc_info=True)
+            elapsed = time.monotonic() - start
+            self.busy_seconds += elapsed
+            logger.debug("Prepared display for %s in %.2f s", getattr(device, "name", device), elapsed)
+        if self._queue:
+            self._schedule(busy=elapsed)
+        else:
+            self._watch_input(False)
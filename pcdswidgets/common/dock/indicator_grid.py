@@ -13,20 +13,30 @@ are supported.
 """
 
 import collections
+import datetime
 import functools
+import hashlib
+import json
 import logging
+import os
 import textwrap
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 from typing import Any, Callable, Iterable, Protocol, cast
 
 from pydm.utilities import is_qt_designer
 from qtpy import QtCore
 from qtpy.QtCore import QEvent, QSize, Qt
 from qtpy.QtGui import QHoverEvent, QMouseEvent
-from qtpy.QtWidgets import QGridLayout, QMenu, QPushButton, QWidget
+from qtpy.QtWidgets import QGridLayout, QHBoxLayout, QMenu, QPushButton, QWidget
 
 from pcdswidgets.common.toolbar.yaml_toolbar import YamlTabLayout
 
+from .alarm_history import AlarmHistory, AlarmRecorder
+from .alarm_rollup import DISCONNECTED, AlarmRollup, format_alarm_counts
+from .display_cache import DeviceDisplayCache, DisplayPrewarmer
 from .tab_dock import TabDock
 
 try:
@@ -89,12 +99,18 @@ class BaseDeviceButton(QPushButton):
             widget = display_for_device(device)
             widget.setParent(self)
             self._device_displays[device.name] = widget
+            # The display cache may delete this later if it is not in use
+            widget.destroyed.connect(functools.partial(self._device_displays.pop, device.name, None))
         return self._device_displays[device.name]
 
     def show_all(self) -> list[QWidget]:
         """Return the typhos displays for all devices, creating them if necessary."""
         return [self.show_device(device=device) for device in self.devices]
 
+    def set_alarm_rollup(self, worst: int, counts: tuple[int, ...]):
+        """Show the number of devices at each alarm level in the tooltip."""
+        self.setToolTip(format_alarm_counts(counts))
+
     def get_all_titles(self):
         """Return the titles of each window, e.g. the name of each device."""
         return [device.name for device in self.devices]
@@ -206,6 +222,7 @@ class IndicatorCell(BaseDeviceButton):
         self._selecting_widgets = []
         self.installEventFilter(self)
         self.devices = []
+        self.indicators: list[QWidget] = []
 
     @Property(bool)  # type: ignore
     def selected(self) -> bool:
@@ -218,12 +235,38 @@ class IndicatorCell(BaseDeviceButton):
         widget.setMinimumSize(self.icon_size, self.icon_size)
         self.layout().addWidget(widget)
 
-    def add_device(self, device: Device):
-        """Add a device to the IndicatorCell"""
-        indicator = indicator_for_device(device)
-        indicator.setContextMenuPolicy(Qt.NoContextMenu)
+    def add_device(self, device: Device, indicator: QWidget | None = None) -> QWidget:
+        """
+        Add a device to the IndicatorCell, returning its indicator.
+
+        An existing indicator can be passed in to move it from another cell.
+        """
+        if indicator is None:
+            indicator = indicator_for_device(device)
+            indicator.setContextMenuPolicy(Qt.NoContextMenu)
         self.devices.append(device)
+        self.indicators.append(indicator)
         self.add_indicator(indicator)
+        return indicator
+
+    def remove_device(self, device: Device) -> QWidget:
+        """
+        Remove a device from the IndicatorCell, returning its indicator.
+
+        The indicator is not deleted so that it can be re-used in another cell.
+        The remaining indicators are packed to fill the gap.
+        """
+        index = self.devices.index(device)
+        del self.devices[index]
+        indicator = self.indicators.pop(index)
+        layout = self.layout()
+        layout.removeWidget(indicator)
+        indicator.setParent(None)  # type: ignore
+        for widget in self.indicators:
+            layout.removeWidget(widget)
+        for widget in self.indicators:
+            layout.addWidget(widget)
+        return indicator
 
     def sizeHint(self):
         size_per_icon = self.icon_size + self.spacing
@@ -244,10 +287,23 @@ class IndicatorGroup(BaseDeviceButton):
         self.cells: list[IndicatorCell] = []
         self.installEventFilter(self)
         self.orientation = orientation
+        self.rollup_indicator: QWidget | None = None
 
     def add_cell(self, cell: IndicatorCell):
         self.cells.append(cell)
 
+    def set_alarm_rollup(self, worst: int, counts: tuple[int, ...]):
+        """Show the worst alarm level of the group in an aggregate indicator."""
+        super().set_alarm_rollup(worst, counts)
+        if self.rollup_indicator is None:
+            self.rollup_indicator = rollup_indicator()
+            layout = QHBoxLayout()
+            layout.setContentsMargins(2, 2, 2, 2)
+            layout.addStretch()
+            layout.addWidget(self.rollup_indicator)
+            self.setLayout(layout)
+        self.rollup_indicator.set_alarm_color(worst)
+
     @property
     def devices(self) -> list[Device]:  # type: ignore
         """All devices contained in the ``IndicatorGroup``"""
@@ -292,6 +348,28 @@ class IndicatorGrid(QWidget):
         self.grid.setSpacing(0)
         self.grid.setSizeConstraint(QGridLayout.SetFixedSize)
         self._groups: dict[str, IndicatorGroup] = {}
+        self._cells: dict[str, IndicatorCell] = {}
+        # Device name to its "stand|system" key, device object, and indicator
+        self._device_entries: dict[str, tuple[str, Device, QWidget]] = {}
+        self._happi_metadata: dict[str, dict[str, Any]] = {}
+        self.loader: HappiLoader | None = None
+        # Set when a refresh is requested while a loader is still running
+        self._refresh_pending = False
+        self._auto_refresh = False
+        self._happi_watcher: QtCore.QFileSystemWatcher | None = None
+        self._refresh_timer = QtCore.QTimer(parent=self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(1000)
+        self._refresh_timer.timeout.connect(self.refresh_happi)
+        self._alarm_history_file = ""
+        self.alarm_recorder: AlarmRecorder | None = None
+        self._alarm_history: AlarmHistory | None = None
+        self._history_time: float | None = None
+        self._replay_timer = QtCore.QTimer(parent=self)
+        self._replay_timer.timeout.connect(self._replay_step)
+        self._replay_range = (0.0, 0.0, 1.0)
+        self.alarm_rollup = AlarmRollup(parent=self)
+        self.alarm_rollup.rollup_changed.connect(self._update_alarm_rollups)
         self.setStyleSheet(
             textwrap.dedent(
                 """
@@ -313,11 +391,250 @@ class IndicatorGrid(QWidget):
     beamline = Property("QString", get_beamline, set_beamline)
 
     def add_devices(self, devices: list[Device], system: str, stand: str):
-        """Add many devices for a specific system/stand group to the grid."""
-        # Create cell
-        cell = IndicatorCell()
+        """
+        Add many devices for a specific system/stand group to the grid.
+
+        The cell for this group is created the first time, and re-used
+        if we add more devices to the same group later.
+        """
+        key = f"{stand}|{system}"
+        cell = self._get_cell(key)
         for device in devices:
-            cell.add_device(device)
+            indicator = cell.add_device(device)
+            self._device_entries[device.name] = (key, device, indicator)
+            self._track_alarms(device, indicator, (cell, self._groups[stand], self._groups[system]))
+
+    def _get_cell(self, key: str) -> IndicatorCell:
+        """Return the cell for a "stand|system" key, creating it if needed."""
+        cell = self._cells.get(key)
+        if cell is None:
+            stand, system = key.split("|")
+            cell = self._add_cell(system=system, stand=stand)
+            self._cells[key] = cell
+        return cell
+
+    def update_from_dict(self, devices: HappiLoaderCbDict):
+        """
+        Update the grid to match new HappiLoader results, changing as little as possible.
+
+        Devices that are the same objects in the same cells are left alone,
+        so their indicators keep their existing connections.
+        Devices that are the same objects in different cells have their
+        indicators moved. Devices that are gone or were re-created
+        have their indicators removed, and new devices get new indicators.
+        Rows and columns that are gone are removed, and the rest are put
+        in sorted order, so the grid matches one loaded from scratch.
+        """
+        if devices is None:
+            return
+        new_entries = {device.name: (key, device) for key, dev_list in devices.items() for device in dev_list}
+        for name, (key, device, _) in list(self._device_entries.items()):
+            new_key, new_device = new_entries.get(name, (None, None))
+            if new_device is not device:
+                self._remove_device(name)
+            elif new_key != key:
+                self._move_device(name, new_key)
+        self._remove_unused_groups(list(devices))
+        self.add_layout(list(devices))
+        for name, (key, device) in new_entries.items():
+            if name not in self._device_entries:
+                self.add_loaded_device(key, device)
+        self._sort_layout()
+
+    def _remove_unused_groups(self, keys: list[str]):
+        """Delete the headers, and their cells, that aren't in any of the "stand|system" keys."""
+        stands = {key.split("|")[0] for key in keys}
+        systems = {key.split("|")[1] for key in keys}
+        for key, cell in list(self._cells.items()):
+            stand, system = key.split("|")
+            if stand in stands and system in systems:
+                continue
+            # Every device was already moved or removed, so the cell is empty
+            del self._cells[key]
+            for group_name in (stand, system):
+                group = self._groups.get(group_name)
+                if group is not None and cell in group.cells:
+                    group.cells.remove(cell)
+            self._delete_button(cell)
+        for title, group in list(self._groups.items()):
+            if title not in (stands if group.orientation == "row" else systems):
+                del self._groups[title]
+                self._delete_button(group)
+
+    def _delete_button(self, button: BaseDeviceButton):
+        """Take a cell or header out of the grid and delete it."""
+        self.alarm_rollup.remove_group(button)
+        self.grid.removeWidget(button)
+        button.deleteLater()
+
+    def _sort_layout(self):
+        """Place the headers in sorted order and every cell where its headers meet, as add_layout does."""
+        rows = {}
+        cols = {}
+        for title in sorted(self._groups):
+            group = self._groups[title]
+            self.grid.removeWidget(group)
+            if group.orientation == "row":
+                cols[title] = len(cols) + 1
+                self.grid.addWidget(group, 0, cols[title], Qt.AlignVCenter)
+            else:
+                rows[title] = len(rows) + 1
+                self.grid.addWidget(group, rows[title], 0, Qt.AlignVCenter)
+        for key, cell in self._cells.items():
+            stand, system = key.split("|")
+            self.grid.removeWidget(cell)
+            self.grid.addWidget(cell, rows[system], cols[stand], Qt.AlignTop)
+
+    def _remove_device(self, name: str):
+        """Remove a device's indicator from the grid and delete it."""
+        key, device, indicator = self._device_entries.pop(name)
+        self._cells[key].remove_device(device)
+        self.alarm_rollup.remove_device(indicator)
+        indicator.deleteLater()
+
+    def _move_device(self, name: str, new_key: str):
+        """Move a device's existing indicator to a different cell."""
+        key, device, indicator = self._device_entries[name]
+        self._cells[key].remove_device(device)
+        cell = self._get_cell(new_key)
+        cell.add_device(device, indicator=indicator)
+        self._device_entries[name] = (new_key, device, indicator)
+        stand, system = new_key.split("|")
+        self.alarm_rollup.add_device(
+            indicator,
+            (cell, self._groups[stand], self._groups[system]),
+            level=indicator.alarm_summary,
+        )
+
+    def _track_alarms(self, device: Device, indicator: QWidget, groups: tuple[BaseDeviceButton, ...]):
+        """Include a device indicator in the alarm rollups of its cell and headers."""
+        self.alarm_rollup.add_device(indicator, groups, level=indicator.alarm_summary)
+        indicator.alarm_changed.connect(functools.partial(self._indicator_alarm_changed, device, indicator))
+        if self.alarm_recorder is not None:
+            self.alarm_recorder.record(device.name, indicator.alarm_summary)
+        if self._history_time is not None:
+            indicator.alarm_changed.disconnect(indicator.set_alarm_color)
+
+    def _indicator_alarm_changed(self, device: Device, indicator: QWidget, level: int):
+        """Record a live alarm change and update the rollups, unless we are showing history."""
+        if self.alarm_recorder is not None:
+            self.alarm_recorder.record(device.name, level)
+        if self._history_time is not None:
+            return
+        self.alarm_rollup.update_device(indicator, level)
+        self._prepare_display_in_alarm(device, level)
+
+    def _prepare_display_in_alarm(self, device: Device, level: int):
+        """Queue the display of a device that just went into alarm to be built once the user is idle."""
+        # MINOR, MAJOR, or INVALID, not NO_ALARM or DISCONNECTED
+        if 0 < level < DISCONNECTED:
+            get_display_prewarmer().enqueue(device, urgent=True)
+
+    def get_alarm_history_file(self) -> str:
+        """Return the file we record alarm history to."""
+        return self._alarm_history_file
+
+    def set_alarm_history_file(self, filename: str):
+        """
+        Set the file to record alarm history to, or an empty string to stop recording.
+
+        Every alarm transition of every device in the grid is appended to this file,
+        which can be used to show the grid as it was at any time, see show_history.
+        """
+        if self.alarm_recorder is not None:
+            self.alarm_recorder.stop()
+            self.alarm_recorder.deleteLater()
+            self.alarm_recorder = None
+        self._alarm_history_file = filename
+        self._alarm_history = None
+        if not filename or is_qt_designer():
+            return
+        self.alarm_recorder = AlarmRecorder(filename, parent=self)
+        for _, device, indicator in self._device_entries.values():
+            self.alarm_recorder.record(device.name, indicator.alarm_summary)
+
+    alarmHistoryFile = Property("QString", get_alarm_history_file, set_alarm_history_file)
+
+    def show_history(self, timestamp: float):
+        """
+        Show the alarm state of the grid at a past time from the alarm history file.
+
+        The indicators and rollups stop following the live alarm state until show_live
+        is called, but live alarm transitions are still recorded.
+
+        Parameters
+        ----------
+        timestamp : float
+            The time to show, as a unix timestamp like time.time().
+        """
+        if not self._alarm_history_file:
+            raise RuntimeError("No alarmHistoryFile is set, there is no history to show.")
+        if self.alarm_recorder is not None:
+            self.alarm_recorder.flush()
+        if self._alarm_history is None:
+            self._alarm_history = AlarmHistory(self._alarm_history_file)
+        else:
+            self._alarm_history.update()
+        if self._history_time is None:
+            for _, _, indicator in self._device_entries.values():
+                indicator.alarm_changed.disconnect(indicator.set_alarm_color)
+        self._history_time = timestamp
+        state = self._alarm_history.state_at(timestamp)
+        for name, (_, _, indicator) in self._device_entries.items():
+            self._show_alarm_level(indicator, state.get(name, DISCONNECTED))
+
+    def show_live(self):
+        """Stop showing history and go back to the live alarm state."""
+        self._replay_timer.stop()
+        if self._history_time is None:
+            return
+        self._history_time = None
+        for _, _, indicator in self._device_entries.values():
+            indicator.alarm_changed.connect(indicator.set_alarm_color)
+            self._show_alarm_level(indicator, indicator.alarm_summary)
+
+    def _show_alarm_level(self, indicator: QWidget, level: int):
+        """Show an alarm level on an indicator and its rollups."""
+        indicator.set_alarm_color(level)
+        self.alarm_rollup.update_device(indicator, level)
+
+    def replay_history(self, start: float, stop: float | None = None, speed: float = 10.0, interval_ms: int = 100):
+        """
+        Step through the alarm history in the grid, faster than real time.
+
+        Parameters
+        ----------
+        start : float
+            The unix timestamp to start from.
+        stop : float, optional
+            The unix timestamp to stop at. Defaults to now.
+        speed : float, optional
+            How many seconds of history to show per second.
+        interval_ms : int, optional
+            The time between steps.
+        """
+        if stop is None:
+            stop = time.time()
+        self._replay_range = (start, stop, speed * interval_ms / 1000)
+        self.show_history(start)
+        self._replay_timer.start(interval_ms)
+
+    def _replay_step(self):
+        """Show the next step of replay_history."""
+        _, stop, step = self._replay_range
+        timestamp = min(self._history_time + step, stop)
+        self.show_history(timestamp)
+        if timestamp >= stop:
+            self._replay_timer.stop()
+
+    def _update_alarm_rollups(self, changed: set[BaseDeviceButton]):
+        """Update the cells and headers whose alarm rollups changed."""
+        for button in changed:
+            button.set_alarm_rollup(self.alarm_rollup.worst(button), self.alarm_rollup.counts(button))
+
+    def _add_cell(self, system: str, stand: str) -> IndicatorCell:
+        """Create a new empty IndicatorCell at the correct location in the grid."""
+        cell = IndicatorCell()
         # Add to proper location in grid
         coords = []
         for i, group_name in enumerate((system, stand)):
@@ -329,11 +646,10 @@ class IndicatorGrid(QWidget):
             group = self._groups[group_name]
             idx = self.grid.indexOf(group)
             coords.append(self.grid.getItemPosition(idx)[i])
-            if cell:
-                group.add_cell(cell)
+            group.add_cell(cell)
         # Add cell to correct location in grid
-        if cell:
-            self.grid.addWidget(cell, coords[0], coords[1], Qt.AlignTop)
+        self.grid.addWidget(cell, coords[0], coords[1], Qt.AlignTop)
+        return cell
 
     def _add_group(self, group_name: str, as_row: bool):
         """Create a new IndicatorGroup and add it to the grid."""
@@ -349,32 +665,127 @@ class IndicatorGrid(QWidget):
 
     def add_from_dict(self, devices: HappiLoaderCbDict):
         """Add devices from the dict presented to HappiLoader callbacks."""
-        rows = set()
-        cols = set()
         if devices is None:
             return
-        for e in devices:
+        self.add_layout(list(devices))
+        for location, dev_list in devices.items():
+            stand, system = location.split("|")
+            self.add_devices(dev_list, stand=stand, system=system)
+
+    def add_layout(self, keys: list[str]):
+        """
+        Create the empty cells for every "stand|system" key, in sorted order.
+
+        This lets us lay out the full grid before any devices are loaded.
+        """
+        rows = set()
+        cols = set()
+        for e in keys:
             r, c = e.split("|")
             rows.add(r)
             cols.add(c)
 
-        data = collections.OrderedDict()
         for r in sorted(rows):
             for c in sorted(cols):
-                data[f"{r}|{c}"] = devices.get(f"{r}|{c}") or []
+                self.add_devices([], stand=r, system=c)
 
-        for location, dev_list in data.items():
-            stand, system = location.split("|")
-            self.add_devices(dev_list, stand=stand, system=system)
+    def add_loaded_device(self, key: str, device: Device):
+        """Add a single device as soon as the HappiLoader has it ready."""
+        stand, system = key.split("|")
+        self.add_devices([device], stand=stand, system=system)
 
     def load_happi(self, beamline: str):
-        """Load happi devices into the grid using a background thread."""
+        """
+        Load happi devices into the grid using background threads.
+
+        The empty grid is shown as soon as the happi search completes,
+        and each device is added to its cell as soon as it is loaded.
+        """
         self.configure_ophyd()
+        self._refresh_pending = False
+        self.loader = HappiLoader(beamline=[beamline], group_keys=("location_group", "functional_group"), callbacks=[])
+        self.loader.layout_loaded.connect(self.add_layout)
+        self.loader.device_loaded.connect(self.add_loaded_device)
+        self.loader.finished.connect(self._loader_finished)
+        self._happi_metadata = self.loader.metadata
+        self.loader.start()
+        if self._auto_refresh:
+            self._watch_happi()
+
+    def refresh_happi(self):
+        """
+        Search happi again and update the grid in place with update_from_dict.
+
+        Devices whose happi entries didn't change are re-used rather than
+        instantiated again. If the previous load is still running, the refresh
+        waits for it to finish, so that it can re-use all of its devices.
+        """
+        if not self._beamline or is_qt_designer():
+            return
+        if self.loader is not None and self.loader.isRunning():
+            self._refresh_pending = True
+            return
+        self._refresh_pending = False
+        reuse = {
+            name: (self._happi_metadata[name], device)
+            for name, (_, device, _) in self._device_entries.items()
+            if name in self._happi_metadata
+        }
         self.loader = HappiLoader(
-            beamline=[beamline], group_keys=("location_group", "functional_group"), callbacks=[self.add_from_dict]
+            beamline=[self._beamline],
+            group_keys=("location_group", "functional_group"),
+            callbacks=[self.update_from_dict],
+            reuse=reuse,
         )
+        self.loader.finished.connect(self._loader_finished)
+        self._happi_metadata = self.loader.metadata
         self.loader.start()
 
+    def _loader_finished(self):
+        """Start the refresh that was requested while the loader was running."""
+        if self._refresh_pending and not (self.loader is not None and self.loader.isRunning()):
+            self.refresh_happi()
+
+    def get_auto_refresh(self) -> bool:
+        """Return whether we watch the happi database for changes."""
+        return self._auto_refresh
+
+    def set_auto_refresh(self, auto_refresh: bool):
+        """
+        Set whether to watch the happi database for changes.
+
+        This only works for file-based happi backends, such as the json backend.
+        When the file changes, we call refresh_happi after a short delay.
+        """
+        self._auto_refresh = auto_refresh
+        if not auto_refresh:
+            if self._happi_watcher is not None:
+                self._happi_watcher.deleteLater()
+                self._happi_watcher = None
+        elif self._beamline and not is_qt_designer():
+            self._watch_happi()
+
+    autoRefresh = Property(bool, get_auto_refresh, set_auto_refresh)
+
+    def _watch_happi(self):
+        """Start watching the happi database file, if there is one."""
+        path = getattr(get_happi_client().backend, "path", None)
+        if not path:
+            logger.warning("Cannot watch the happi database for changes, it is not a file.")
+            return
+        if self._happi_watcher is None:
+            self._happi_watcher = QtCore.QFileSystemWatcher(parent=self)
+            self._happi_watcher.fileChanged.connect(self._happi_file_changed)
+        if path not in self._happi_watcher.files():
+            self._happi_watcher.addPath(path)
+
+    def _happi_file_changed(self, path: str):
+        """Debounce file changes and make sure we keep watching replaced files."""
+        if path not in self._happi_watcher.files():
+            # The file was replaced rather than modified, e.g. by an atomic write
+            self._happi_watcher.addPath(path)
+        self._refresh_timer.start()
+
     def configure_ophyd(self):
         """
         Configure settings for ophyd that make the grid experience smoother.
@@ -437,8 +848,54 @@ def get_happi_entry_value(entry: Entry, key: str) -> Any:
     return value
 
 
+# Keep running loaders alive until they finish, even if the grid replaces or drops them
+_RUNNING_LOADERS: set["HappiLoader"] = set()
+
+
 class HappiLoader(QtCore.QThread):
-    """Thread for loading happi devices in the background."""
+    """
+    Thread for loading happi devices in the background.
+
+    The devices are instantiated in parallel using a pool of worker threads.
+    Results are delivered in three ways:
+
+    - layout_loaded is emitted once with the sorted "row|col" keys
+      as soon as the happi search is done, before any device is loaded.
+    - device_loaded is emitted with the key and the device object
+      each time a single device finishes loading.
+    - devices_loaded is emitted once at the end with all of the devices,
+      and the callbacks are called with the same dictionary.
+
+    The time it took to load each device is kept in the load_times
+    dictionary, and the happi metadata of each device in the metadata
+    dictionary, both by device name.
+
+    The happi search results and their "row|col" keys are cached on disk,
+    see load_happi_cache. If the happi database has not changed since the
+    last time, the layout is emitted straight from the cache without
+    searching happi again.
+
+    Parameters
+    ----------
+    beamline : iterable of str
+        The happi beamlines to load active devices from.
+    group_keys : tuple of str
+        The happi metadata keys to group the devices by.
+    callbacks : iterable of callable
+        Functions to call in the receiver thread with all the devices.
+    max_workers : int, optional
+        The maximum number of devices to instantiate at the same time.
+    use_cache : bool, optional
+        Whether to read and write the on-disk happi search cache.
+    reuse : dict, optional
+        Mapping from device name to the (metadata, device) of devices that
+        were already loaded. If a device's happi metadata is unchanged,
+        we return the existing device instead of creating it again.
+    """
+
+    layout_loaded = QtCore.Signal(object)
+    device_loaded = QtCore.Signal(str, object)
+    devices_loaded = QtCore.Signal(object)
 
     def __init__(
         self,
@@ -446,39 +903,111 @@ class HappiLoader(QtCore.QThread):
         beamline: Iterable[str],
         group_keys: tuple[str, str],
         callbacks: Iterable[HappiLoaderCallback],
+        max_workers: int = 8,
+        use_cache: bool = True,
+        reuse: dict[str, tuple[dict[str, Any], Device]] | None = None,
         **kwargs,
     ):
         self.beamline = beamline
         self.group_keys = group_keys
         self.callbacks = callbacks
+        self.max_workers = max_workers
+        self.use_cache = use_cache
+        self.reuse = reuse or {}
+        self.load_times: dict[str, float] = {}
+        self.metadata: dict[str, dict[str, Any]] = {}
         super().__init__(*args, **kwargs)
+        self.devices_loaded.connect(self._run_callbacks)
+        _RUNNING_LOADERS.add(self)
+        self.finished.connect(functools.partial(_RUNNING_LOADERS.discard, self))
 
-    def _load_from_happi(self, row_group_key: str, col_group_key: str) -> HappiLoaderCbDict:
-        """Fill with Data from Happi"""
+    def _search_happi(self, row_group_key: str, col_group_key: str) -> list[tuple[str, Entry]]:
+        """Find the happi entries to load and the "row|col" key for each of them."""
         cli = get_happi_client()
+        fingerprint = get_happi_fingerprint(cli) if self.use_cache else None
+        if fingerprint is not None:
+            cached = load_happi_cache(self.beamline, self.group_keys, fingerprint)
+            if cached is not None:
+                try:
+                    return [(key, search_result_from_metadata(cli, metadata)) for key, metadata in cached]
+                except Exception:
+                    logger.warning("Unable to use cached happi results, searching happi instead.")
+                    logger.debug("Unable to use cached happi results", exc_info=True)
+
         results = []
         for line in self.beamline:
             results += cli.search(beamline=line, active=True)
 
-        dev_groups = collections.defaultdict(list)
-
         if not len(results):
             raise ValueError(f"Could not find entries for beamline {self.beamline}")
 
+        entries = []
+        for res in results:
+            try:
+                stand = get_happi_entry_value(res, row_group_key)
+                system = get_happi_entry_value(res, col_group_key)
+            except Exception:
+                name = res.metadata["name"]
+                logger.error("Failed to load device %s", name)
+                logger.debug("Failed to load device %s", name, exc_info=True)
+                continue
+            entries.append((f"{stand}|{system}", res))
+        if fingerprint is not None:
+            save_happi_cache(
+                self.beamline,
+                self.group_keys,
+                fingerprint,
+                [(key, res.metadata) for key, res in entries],
+            )
+        return entries
+
+    def _load_device(self, res: Any) -> Device | None:
+        """Instantiate a single device in a worker thread, recording how long it took."""
+        name = res.metadata["name"]
+        self.metadata[name] = res.metadata
+        try:
+            metadata, device = self.reuse[name]
+        except KeyError:
+            ...
+        else:
+            if metadata == res.metadata:
+                return device
+        start = time.monotonic()
+        try:
+            return res.get(threaded=True)
+        except Exception:
+            logger.error("Failed to load device %s", name)
+            logger.debug("Failed to load device %s", name, exc_info=True)
+            return None
+        finally:
+            self.load_times[name] = time.monotonic() - start
+
+    def _load_from_happi(self, row_group_key: str, col_group_key: str) -> HappiLoaderCbDict:
+        """Fill with Data from Happi"""
+        entries = self._search_happi(row_group_key, col_group_key)
+        self.layout_loaded.emit(sorted({key for key, _ in entries}))
+
         import typhos
 
-        with typhos.utils.no_device_lazy_load():
-            for res in results:
-                try:
-                    stand = get_happi_entry_value(res, row_group_key)
-                    system = get_happi_entry_value(res, col_group_key)
-                    dev_obj = res.get(threaded=True)
-                    dev_groups[f"{stand}|{system}"].append(dev_obj)
-                except Exception:
-                    name = res.metadata["name"]
-                    logger.error("Failed to load device %s", name)
-                    logger.debug("Failed to load device %s", name, exc_info=True)
+        loaded: dict[int, Device] = {}
+        start = time.monotonic()
+        with typhos.utils.no_device_lazy_load(), ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._load_device, res): index for index, (_, res) in enumerate(entries)}
+            for future in as_completed(futures):
+                dev_obj = future.result()
+                if dev_obj is None:
                     continue
+                index = futures[future]
+                loaded[index] = dev_obj
+                self.device_loaded.emit(entries[index][0], dev_obj)
+        logger.info("Loaded %d of %d happi devices in %.1f s", len(loaded), len(entries), time.monotonic() - start)
+        slowest = sorted(self.load_times.items(), key=lambda item: item[1], reverse=True)[:10]
+        logger.debug("Slowest happi devices to load: %s", ", ".join(f"{name} ({dt:.2f} s)" for name, dt in slowest))
+
+        # Keep the happi search order for the callbacks
+        dev_groups = collections.defaultdict(list)
+        for index in sorted(loaded):
+            dev_groups[entries[index][0]].append(loaded[index])
         return dev_groups
 
     def run(self):
@@ -487,17 +1016,134 @@ class HappiLoader(QtCore.QThread):
 
         dev_groups = self._load_from_happi(row_group_key, col_group_key)
 
-        # Call the callback using the Receiver Slot Thread
+        # Call the callbacks using the Receiver Slot Thread
+        self.devices_loaded.emit(dev_groups)
+
+    def _run_callbacks(self, dev_groups: HappiLoaderCbDict):
+        """Run the callbacks in the thread that created the loader."""
         for cb in self.callbacks:
-            f = functools.partial(cb, devices=dev_groups)
-            QtCore.QTimer.singleShot(0, f)
+            cb(devices=dev_groups)
+
+
+HAPPI_CACHE_DIR = Path.home() / ".cache" / "pcdswidgets" / "happi"
+
+
+def get_happi_fingerprint(client: Any) -> str | None:
+    """
+    Return a string that changes whenever the happi database changes.
+
+    This uses the modification time and size of the database file, so it is
+    only available for file-based backends such as the JSON backend.
+    For other backends this returns None, and we don't cache anything.
+    """
+    path = getattr(getattr(client, "backend", None), "path", None)
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
 
 
-device_display_cache = {}
+def _happi_cache_path(beamline: Iterable[str], group_keys: tuple[str, str]) -> Path:
+    """Return the cache file to use for a beamline and grouping."""
+    key = json.dumps([sorted(beamline), list(group_keys)])
+    return HAPPI_CACHE_DIR / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+
+def load_happi_cache(
+    beamline: Iterable[str],
+    group_keys: tuple[str, str],
+    fingerprint: str,
+) -> list[tuple[str, dict[str, Any]]] | None:
+    """
+    Load the cached happi search results for a beamline.
+
+    Parameters
+    ----------
+    beamline : iterable of str
+        The happi beamlines that were searched.
+    group_keys : tuple of str
+        The happi metadata keys that the results were grouped by.
+    fingerprint : str
+        The current database fingerprint from get_happi_fingerprint.
+
+    Returns
+    -------
+    entries : list of tuple or None
+        The "row|col" key and the happi metadata of each search result,
+        or None if there is no cache or it was made from a different database.
+    """
+    path = _happi_cache_path(beamline, group_keys)
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f, object_hook=_happi_cache_decode)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.debug("Unable to read happi cache %s", path, exc_info=True)
+        return None
+    if cache.get("fingerprint") != fingerprint:
+        logger.debug("Happi database changed, ignoring happi cache %s", path)
+        return None
+    return [(key, metadata) for key, metadata in cache["entries"]]
+
+
+def save_happi_cache(
+    beamline: Iterable[str],
+    group_keys: tuple[str, str],
+    fingerprint: str,
+    entries: list[tuple[str, dict[str, Any]]],
+) -> None:
+    """
+    Save happi search results for a beamline for the next load_happi_cache.
+
+    Timestamps are saved in a form that load_happi_cache restores,
+    any other values that can't be saved as json are saved as strings.
+    Errors are logged rather than raised because the cache is optional.
+    """
+    path = _happi_cache_path(beamline, group_keys)
+    cache = {"fingerprint": fingerprint, "entries": entries}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f, default=_happi_cache_encode)
+        os.replace(tmp_path, path)
+    except Exception:
+        logger.warning("Unable to save happi cache to %s", path)
+        logger.debug("Unable to save happi cache to %s", path, exc_info=True)
+
+
+def _happi_cache_encode(value: Any) -> Any:
+    """json.dump default for happi metadata values."""
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    return str(value)
+
+
+def _happi_cache_decode(obj: dict[str, Any]) -> Any:
+    """json.load object_hook that undoes _happi_cache_encode."""
+    if len(obj) == 1 and "__datetime__" in obj:
+        return datetime.datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+
+def search_result_from_metadata(client: Any, metadata: dict[str, Any]) -> Entry:
+    """Rebuild a happi SearchResult from cached metadata without searching."""
+    # Embed optional dependency imports in function call
+    from happi import SearchResult
+
+    item = client.create_item(metadata["type"], **metadata)
+    return SearchResult(client=client, item=item)
+
+
+device_display_cache = DeviceDisplayCache()
 
 
 def display_for_device(device: Device):
-    """Create a TyphosDeviceDisplay for a given device"""
+    """Create a TyphosDeviceDisplay for a given device, or return it from the cache."""
     # Embed optional dependency imports in function call
     from typhos.display import TyphosDeviceDisplay
     from typhos.utils import apply_standard_stylesheets, no_device_lazy_load
@@ -506,14 +1152,26 @@ def display_for_device(device: Device):
         return device_display_cache[device]
     except KeyError:
         ...
+    start = time.monotonic()
     with no_device_lazy_load():
         logger.debug("Creating device display for %r", device)
         display = TyphosDeviceDisplay.from_device(device, scroll_option="scrollbar")
         apply_standard_stylesheets(widget=display)
-    device_display_cache[device] = display
+    device_display_cache.add(device, display, build_time=time.monotonic() - start)
     return display
 
 
+_DISPLAY_PREWARMER = None
+
+
+def get_display_prewarmer() -> DisplayPrewarmer:
+    """Create and cache the DisplayPrewarmer that fills device_display_cache."""
+    global _DISPLAY_PREWARMER
+    if _DISPLAY_PREWARMER is None:
+        _DISPLAY_PREWARMER = DisplayPrewarmer(build=display_for_device, cache=device_display_cache)
+    return _DISPLAY_PREWARMER
+
+
 _HAPPI_CLIENT = None
 
 
@@ -528,6 +1186,17 @@ def get_happi_client():
     return _HAPPI_CLIENT
 
 
+def rollup_indicator() -> QWidget:
+    """Create a QWidget without devices to show an aggregate alarm level."""
+    # Embed optional dependency imports in function call
+    from typhos.alarm import TyphosAlarmCircle
+
+    circle = TyphosAlarmCircle()  # type: ignore
+    circle.setFixedSize(IndicatorCell.icon_size, IndicatorCell.icon_size)
+    circle.setContextMenuPolicy(Qt.NoContextMenu)
+    return circle
+
+
 def indicator_for_device(device):  # type: ignore
     """Create a QWidget to indicate the alarm state of a Device."""
     # Embed optional dependency imports in function call
@@ -0,0 +1,415 @@
+"""
+Cache of compiled pydm screen files, shared by every TabDockButton.
+
+Parsing and compiling a .ui file is the slow part of opening a screen,
+so the compiled form of each file is cached by its resolved path and
+shared by every button that opens the file, whatever its macros.
+A compiled file is re-used as long as the file's modification time and
+size are unchanged, which only needs a stat call rather than reading
+the file. When a file changes, only that file is compiled again.
+
+Caching compiled files relies on private pydm helpers. With a pydm that
+doesn't have them, .ui files are loaded with pydm's load_file instead,
+which still shares compiled files through pydm's own cache but can't
+recompile just the files that changed.
+
+The widgets themselves are not shared: each DeferredScreen, e.g. the one
+kept by a TabDockButton, re-uses the last screen it built until the file
+changes or the screen is deleted.
+
+DeferredScreen is the deferred widget that TabDockButton gives to the
+TabDock. It can do the slow parsing and compiling of a .ui file in a
+background thread before the screen is built in the GUI thread.
+
+ScreenPrewarmer compiles .ui files ahead of time while the user is idle,
+so that opening them later only needs to create the widgets.
+"""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+import logging
+import os
+import threading
+import time
+from typing import cast
+
+from pydm.display import Display, ScreenTarget, load_file
+from pydm.utilities.stylesheet import merge_widget_stylesheet
+from qtpy import QtCore
+from qtpy.QtWidgets import QWidget
+
+logger = logging.getLogger(__name__)
+
+try:
+    # Private pydm helpers: the uncached compile, rather than pydm's lru_cache
+    # that can only be cleared all at once, and the code that loads its result
+    from pydm.display import _compile_ui_file, _load_compiled_ui_into_display
+
+    _compile_ui = _compile_ui_file.__wrapped__
+except (ImportError, AttributeError):
+    logger.debug("pydm can't load compiled .ui files, screens will be loaded with load_file")
+    _compile_ui = None
+    _load_compiled_ui_into_display = None
+
+
+def uses_screen_cache(filename: str) -> bool:
+    """Return True if the file is loaded through the screen cache, False if with pydm's load_file."""
+    return filename.endswith(".ui") and _compile_ui is not None
+
+
+@dataclasses.dataclass
+class CompiledScreen:
+    """The python code compiled from a .ui file, and the version of the file it came from."""
+
+    code: str
+    class_name: str
+    mtime_ns: int
+    size: int
+
+
+def stat_file(path: str) -> tuple[int, int]:
+    """Return the modification time and size that identify a version of a file."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ScreenCache:
+    """
+    Compiled .ui files, validated by the file modification time and size.
+
+    This is safe to use from background threads.
+
+    Parameters
+    ----------
+    max_files : int, optional
+        The most compiled files to keep. The least recently used are dropped first.
+    """
+
+    def __init__(self, max_files: int = 128):
+        self.max_files = max_files
+        self._compiled: collections.OrderedDict[str, CompiledScreen] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._compiled)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._compiled
+
+    def is_current(self, path: str) -> bool:
+        """Return True if the file is compiled and hasn't changed since, or False if it can't be found."""
+        with self._lock:
+            cached = self._compiled.get(path)
+        if cached is None:
+            return False
+        try:
+            return stat_file(path) == (cached.mtime_ns, cached.size)
+        except OSError:
+            return False
+
+    def compile(self, path: str) -> CompiledScreen:
+        """
+        Return the compiled form of a .ui file, compiling it only if it is new or changed.
+
+        Raises
+        ------
+        OSError
+            If the file can't be found.
+        RuntimeError
+            If this version of pydm can't load compiled files, see uses_screen_cache.
+        """
+        if _compile_ui is None:
+            raise RuntimeError("This version of pydm can't load compiled .ui files")
+        # Check the file before reading it, so that changes made while compiling are noticed next time
+        mtime_ns, size = stat_file(path)
+        with self._lock:
+            cached = self._compiled.get(path)
+            if cached is not None and (cached.mtime_ns, cached.size) == (mtime_ns, size):
+                self._compiled.move_to_end(path)
+                return cached
+        if cached is not None:
+            logger.debug("%s changed, compiling it again", path)
+        code, class_name = _compile_ui(path)
+        compiled = CompiledScreen(code=code, class_name=class_name, mtime_ns=mtime_ns, size=size)
+        with self._lock:
+            self._compiled[path] = compiled
+            self._compiled.move_to_end(path)
+            while len(self._compiled) > self.max_files:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    def invalidate(self, path: str) -> None:
+        """Forget the compiled form of one file."""
+        with self._lock:
+            self._compiled.pop(path, None)
+
+    def clear(self) -> None:
+        """Forget every compiled file."""
+        with self._lock:
+            self._compiled.clear()
+
+
+screen_cache = ScreenCache()
+
+
+# The most recent load timings in seconds for each file, e.g. {"prepare": 0.5, "build": 1.2}
+screen_load_times: dict[str, dict[str, float]] = {}
+
+
+def load_compiled_screen(path: str, compiled: CompiledScreen, macros: dict[str, str] | None = None) -> Display:
+    """
+    Create a screen from a compiled .ui file, as pydm's load_file would.
+
+    This mirrors load_file and Display.load_ui_from_file, which compile the file themselves.
+    """
+    display = Display(macros=macros)
+    display._loaded_file = path
+    _load_compiled_ui_into_display(compiled.code, compiled.class_name, display, macros)
+    base = os.path.splitext(path)[0]
+    for help_file in (base + ".txt", base + ".html"):
+        if os.path.exists(help_file):
+            display.load_help_file(help_file)
+            break
+    return display
+
+
+class DeferredScreen:
+    """
+    Deferred widget for the TabDock that loads a pydm screen from a file.
+
+    Calling this builds the screen. The screen is kept and returned again
+    by later calls, until the file changes or the screen is deleted.
+    Before that, prepare can optionally be called from a background thread
+    to do the slow parts that don't need the GUI thread.
+
+    Parameters
+    ----------
+    filename : str
+        The full path to the .ui or .py file.
+    macros : dict, optional
+        The macros to use in the screen.
+    title : str, optional
+        The title to use for the tab or window, instead of the screen's window title.
+    """
+
+    def __init__(self, filename: str, macros: dict[str, str] | None = None, title: str = ""):
+        self.filename = filename
+        self.macros = macros or {}
+        self.title = title
+        self.widget: QWidget | None = None
+        self._widget_stat: tuple[int, int] | None = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(filename={self.filename!r}, macros={self.macros!r}, title={self.title!r})"
+
+    def __call__(self) -> QWidget:
+        return self.build()
+
+    def _widget_is_current(self) -> bool:
+        """Return True if we have a screen and the file hasn't changed since we built it."""
+        if self.widget is None:
+            return False
+        try:
+            return stat_file(self.filename) == self._widget_stat
+        except OSError:
+            return False
+
+    def is_cached(self) -> bool:
+        """Return True if building the screen will be fast, because it was built or compiled already."""
+        return self._widget_is_current() or screen_cache.is_current(self.filename)
+
+    def prepare(self) -> None:
+        """Parse and compile a .ui file. This is safe to call from a background thread."""
+        start = time.monotonic()
+        if uses_screen_cache(self.filename):
+            screen_cache.compile(self.filename)
+        screen_load_times.setdefault(self.filename, {})["prepare"] = time.monotonic() - start
+
+    def build(self) -> QWidget:
+        """Create or re-use the screen. This must be called from the GUI thread."""
+        if self._widget_is_current():
+            return cast(QWidget, self.widget)
+        if self.widget is not None:
+            logger.debug("%s changed, reloading", self.filename)
+            self.widget.close()
+        start = time.monotonic()
+        mtime_ns, size = stat_file(self.filename)
+        if uses_screen_cache(self.filename):
+            display = load_compiled_screen(self.filename, screen_cache.compile(self.filename), macros=self.macros)
+        else:
+            display = cast(QWidget, load_file(self.filename, macros=self.macros, target=ScreenTarget.DIALOG))
+        display.hide()
+        merge_widget_stylesheet(widget=display)
+        self.widget = display
+        self._widget_stat = (mtime_ns, size)
+        # The dock may delete the screen to save resources, see TabDock.hibernate_tab
+        display.destroyed.connect(lambda *args: self._forget_widget(display))
+        screen_load_times.setdefault(self.filename, {})["build"] = time.monotonic() - start
+        return display
+
+    def _forget_widget(self, widget: QWidget) -> None:
+        """Forget a screen that was deleted."""
+        if self.widget is widget:
+            self.widget = None
+            self._widget_stat = None
+
+
+# Keep running threads alive until they finish, even if their placeholder tab is deleted
+_RUNNING_PREPARERS: set[ScreenPreparer] = set()
+
+
+class ScreenPreparer(QtCore.QThread):
+    """
+    Thread that calls DeferredScreen.prepare in the background.
+
+    Connect to the finished signal to build the screen afterwards.
+    """
+
+    def __init__(self, screen: DeferredScreen):
+        super().__init__()
+        self.screen = screen
+        _RUNNING_PREPARERS.add(self)
+        self.finished.connect(lambda: _RUNNING_PREPARERS.discard(self))
+
+    def run(self):
+        try:
+            self.screen.prepare()
+        except Exception:
+            # Building the screen will raise the same error in the GUI thread
+            logger.debug("Failed to prepare %s", self.screen.filename, exc_info=True)
+
+
+# Events that mean the user is interacting with the application
+USER_INPUT_EVENTS = (
+    QtCore.QEvent.KeyPress,
+    QtCore.QEvent.MouseButtonPress,
+    QtCore.QEvent.MouseButtonDblClick,
+    QtCore.QEvent.Wheel,
+)
+
+
+class ScreenPrewarmer(QtCore.QObject):
+    """
+    Compiles .ui files in the background while the user is idle.
+
+    Files are compiled one at a time in the given order, see DeferredScreen.prepare.
+    No widgets are created and no channels are connected.
+    We wait until there has been no user input for idle_ms before each file,
+    and we stop for good once any of the budgets is used up.
+
+    Parameters
+    ----------
+    filenames : list of str
+        The files to compile, most important first. Files that aren't loaded through the screen cache are skipped.
+    idle_ms : int, optional
+        How long the user must be idle before we compile the next file.
+    cpu_fraction : float, optional
+        The largest fraction of the time to spend compiling, e.g. 0.25 waits
+        three times as long as the last file took before compiling the next.
+    max_seconds : float, optional
+        The most time to spend compiling in total.
+    max_files : int, optional
+        The most files to compile, which should be below the size of the
+        screen cache (128) so that we don't push out files in use.
+    max_bytes : int, optional
+        The largest total size of the .ui files to compile, as a rough bound on memory use.
+    """
+
+    finished = QtCore.Signal()
+
+    def __init__(
+        self,
+        filenames: list[str],
+        idle_ms: int = 2000,
+        cpu_fraction: float = 0.25,
+        max_seconds: float = 30.0,
+        max_files: int = 64,
+        max_bytes: int = 10_000_000,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.idle_ms = idle_ms
+        self.cpu_fraction = cpu_fraction
+        self.max_seconds = max_seconds
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.prepared: list[str] = []
+        self.busy_seconds = 0.0
+        self.prepared_bytes = 0
+        self._queue = [filename for filename in dict.fromkeys(filenames) if uses_screen_cache(filename)]
+        self._preparer: ScreenPreparer | None = None
+        self._preparer_start = 0.0
+        self._last_input = time.monotonic()
+        self._timer = QtCore.QTimer(parent=self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._prepare_next)
+
+    def start(self) -> None:
+        """Start compiling once the user is idle."""
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.installEventFilter(self)
+        self._timer.start(self.idle_ms)
+
+    def stop(self) -> None:
+        """Stop compiling files. A file that is being compiled will still finish."""
+        self._timer.stop()
+        self._queue.clear()
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.removeEventFilter(self)
+
+    def pending(self) -> int:
+        """Return the number of files waiting to be compiled."""
+        return len(self._queue)
+
+    def eventFilter(self, obj: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        """Pause on any user input, without consuming the event."""
+        if event.type() in USER_INPUT_EVENTS:
+            self._last_input = time.monotonic()
+            if self._timer.isActive():
+                self._timer.start(self.idle_ms)
+        return False
+
+    def _over_budget(self) -> bool:
+        """Return True if we've done as much compiling as we are allowed to."""
+        return (
+            self.busy_seconds >= self.max_seconds
+            or len(self.prepared) >= self.max_files
+            or self.prepared_bytes >= self.max_bytes
+        )
+
+    def _prepare_next(self) -> None:
+        """Start compiling the next file in a background thread."""
+        if self._preparer is not None:
+            return
+        while self._queue and not self._over_budget():
+            filename = self._queue.pop(0)
+            try:
+                size = os.path.getsize(filename)
+            except OSError:
+                continue
+            self.prepared_bytes += size
+            self._preparer = ScreenPreparer(DeferredScreen(filename))
+            self._preparer.finished.connect(self._prepared)
+            self._preparer_start = time.monotonic()
+            self._preparer.start()
+            return
+        self.stop()
+        self.finished.emit()
+
+    def _prepared(self) -> None:
+        """Schedule the next file after one is compiled, within the CPU budget."""
+        elapsed = time.monotonic() - self._preparer_start
+        self.busy_seconds += elapsed
+        self.prepared.append(self._preparer.screen.filename)
+        self._preparer = None
+        if not self._queue:
+            self.stop()
+            self.finished.emit()
+            return
+        duty_delay = elapsed * (1 / self.cpu_fraction - 1)
+        idle_delay = self.idle_ms / 1000 - (time.monotonic() - self._last_input)
+        self._timer.start(int(1000 * max(duty_delay, idle_delay, 0)))
@@ -8,11 +8,16 @@ This was originally LucidDock from the lucid module,
 ported here to have lighter dependencies and to be more generic.
 """
 
+import json
+import logging
+import os
+import time
 from functools import partial
-from typing import Callable, ClassVar
+from pathlib import Path
+from typing import Any, Callable, ClassVar, cast
 
 from pydm.utilities import IconFont
-from qtpy.QtCore import QPoint, Qt
+from qtpy.QtCore import QPoint, Qt, QTimer
 from qtpy.QtGui import QCursor
 from qtpy.QtWidgets import (
     QApplication,
@@ -21,6 +26,7 @@ from qtpy.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QMenu,
+    QMessageBox,
     QPushButton,
     QSizePolicy,
     QSpinBox,
@@ -30,11 +36,19 @@ from qtpy.QtWidgets import (
     QWidget,
 )
 
+from .screen_cache import DeferredScreen, ScreenPreparer
+
 try:
     from qtpy.QtCore import pyqtSignal as Signal
 except ImportError:
     from qtpy.QtCore import Signal  # type: ignore
 
+try:
+    from qtpy.QtCore import Property  # type: ignore
+except ImportError:
+    from qtpy.QtCore import pyqtProperty as Property  # type: ignore
+
+logger = logging.getLogger(__name__)
 
 ifont = IconFont()
 
@@ -62,8 +76,16 @@ Screens that are already open will be moved instead of opening a second copy.
 For screens that are sourced from a TabDockButton, we will check the source
 file for updates when you try to open them in the dock again, otherwise
 the screens will be cached.
+
+Tabs that have not been looked at in a while may be closed to save resources.
+They will be reloaded when you select them again.
+
+Save Session remembers the screens that are open in the dock and in windows,
+and Restore Session opens them again. Restored tabs are loaded when you select them.
 """
 
+DOCK_SESSION_FILE = Path.home() / ".config" / "pcdswidgets" / "dock_session.json"
+
 # Type helpers: some functions here accept fully constructed widgets or functions that produce them later as-needed
 DeferredWidget = QWidget | Callable[[], QWidget]
 DeferredWidgetList = list[QWidget] | Callable[[], list[QWidget]]
@@ -83,6 +105,15 @@ class TabDock(QWidget):
     Most of the functionality is exposed as classmethods so that other code does not have
     to locate the dock singleton, instead you can reference the TabDock class directly.
 
+    Background tabs can be hibernated to save memory and PV connections:
+    the screen is deleted and replaced by a lightweight placeholder that
+    rebuilds it when the tab is selected again. This happens for tabs that
+    have not been selected for hibernateAfter seconds, and for the least
+    recently selected tabs while the open tabs contain more than
+    widgetBudget widgets in total. Both are disabled when set to 0.
+    Only tabs that were opened from a deferred widget, e.g. a function
+    that builds the screen, can be hibernated.
+
     You should usually populate the dock by calling TabDock.add_to_dock_user_keybinds,
     which will:
     - Replace the current tab if no modifiers are held
@@ -117,9 +148,20 @@ class TabDock(QWidget):
 
         self.fixed_tab_width = 850
         self.dock_cols = 1
+        self.dock_rows = 1
 
         self.attach_buttons: list[QToolButton] = []
 
+        # How to rebuild each widget opened from a deferred widget, for hibernation
+        self._recipes: dict[QWidget, tuple[Callable[[], QWidget], str]] = {}
+        self._last_active: dict[QWidget, float] = {}
+        self._hibernate_after = 0
+        self._widget_budget = 0
+        self._swapping_tabs = False
+        self._hibernate_timer = QTimer(parent=self)
+        self._hibernate_timer.setInterval(10_000)
+        self._hibernate_timer.timeout.connect(self.check_hibernation)
+
         self.settings_button = QToolButton()
         self.settings_button.setIcon(ifont.icon("anchor"))  # type: ignore
         self.settings_button.clicked.connect(self.show_settings)
@@ -137,6 +179,8 @@ class TabDock(QWidget):
         self.dock_columns_spinbox = QSpinBox()
         self.dock_rows_spinbox = QSpinBox()
         self.apply_settings_button = QPushButton("Apply")
+        self.save_session_button = QPushButton("Save Session")
+        self.restore_session_button = QPushButton("Restore Session")
 
     @classmethod
     def _get_instance(cls) -> "TabDock":
@@ -180,6 +224,7 @@ class TabDock(QWidget):
         tab_widget.setMovable(True)
         tab_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         tab_widget.currentChanged.connect(partial(self.show_correct_tab_buttons, tab_widget=tab_widget))
+        tab_widget.currentChanged.connect(partial(self._tab_selected, tab_widget=tab_widget))
 
         corner_widget = QWidget()
         corner_layout = QHBoxLayout()
@@ -231,11 +276,18 @@ class TabDock(QWidget):
         form_layout.addRow("Dock Rows", self.dock_rows_spinbox)
         form_layout.addRow("", self.apply_settings_button)
 
+        session_layout = QHBoxLayout()
+        session_layout.addWidget(self.save_session_button)
+        session_layout.addWidget(self.restore_session_button)
+        form_layout.addRow("", session_layout)
+
         self.dock_columns_spinbox.setMinimum(1)
         self.dock_columns_spinbox.setMaximum(10)
         self.dock_rows_spinbox.setMinimum(1)
         self.dock_rows_spinbox.setMaximum(10)
         self.apply_settings_button.clicked.connect(self.apply_settings)
+        self.save_session_button.clicked.connect(self._save_session_clicked)
+        self.restore_session_button.clicked.connect(self._restore_session_clicked)
 
         dock_controls_label = QLabel(DOCK_CONTROLS)
         outer_layout.addWidget(dock_controls_label)
@@ -243,11 +295,28 @@ class TabDock(QWidget):
         self.settings_widget = outer_widget
         return outer_widget
 
+    def _save_session_clicked(self):
+        """Save the session from the settings dialog, showing any error instead of raising it."""
+        try:
+            self.save_session(DOCK_SESSION_FILE)
+        except (OSError, ValueError, TypeError) as exc:
+            logger.error("Unable to save the dock session to %s: %s", DOCK_SESSION_FILE, exc)
+            QMessageBox.warning(self.settings_widget, "Save Session", f"Unable to save the session:\n{exc}")
+
+    def _restore_session_clicked(self):
+        """Restore the session from the settings dialog, showing any error instead of raising it."""
+        try:
+            self.restore_session(DOCK_SESSION_FILE)
+        except (OSError, ValueError, KeyError) as exc:
+            logger.error("Unable to restore the dock session from %s: %s", DOCK_SESSION_FILE, exc)
+            QMessageBox.warning(self.settings_widget, "Restore Session", f"Unable to restore the session:\n{exc}")
+
     def apply_settings(self):
         """Apply settings changes from the dock settings dialog."""
         cols = self.dock_columns_spinbox.value()
         self.dock_cols = cols
         rows = self.dock_rows_spinbox.value()
+        self.dock_rows = rows
         while len(self.tab_widgets) < rows:
             self.tab_widgets.append([])
         for row_idx, tab_row in enumerate(self.tab_widgets):
@@ -453,7 +522,15 @@ class TabDock(QWidget):
             idx = tab_widget.currentIndex()
             tab_widget.removeTab(idx)
 
+        recipe = None if isinstance(widget, QWidget) else widget
+        if isinstance(recipe, DeferredScreen) and not recipe.is_cached():
+            # Show a placeholder right away and load the screen in the background
+            widget = self._start_loading(LoadingTab(recipe=recipe, title=title))
+            title = widget.title
+            recipe = None
         widget, title = unpack_deferred_widget(widget=widget, title=title)
+        if recipe is not None:
+            self._remember_recipe(widget, recipe, title)
 
         # Some typhos screens crash (segfault) when added to the tabs if not shown first (???)
         widget.show()
@@ -463,6 +540,17 @@ class TabDock(QWidget):
         else:
             tab_widget.insertTab(idx, widget, title)
 
+        self._add_tab_buttons(tab_widget, idx)
+        tab_widget.setCurrentIndex(idx)
+        self._mark_active(widget)
+
+        try:
+            self.detached_widgets.remove(widget)
+        except KeyError:
+            ...
+
+    def _add_tab_buttons(self, tab_widget: QTabWidget, idx: int):
+        """Add the detach and close buttons to a tab."""
         button_row = QWidget()
 
         detach_button = QToolButton()
@@ -480,12 +568,6 @@ class TabDock(QWidget):
 
         tab_bar = tab_widget.tabBar()
         tab_bar.setTabButton(idx, tab_bar.ButtonPosition.RightSide, button_row)
-        tab_widget.setCurrentIndex(idx)
-
-        try:
-            self.detached_widgets.remove(widget)
-        except KeyError:
-            ...
 
     @classmethod
     def add_to_dock_many(cls, widget_list: DeferredWidgetList, title_list: DeferredTitleList | None = None):
@@ -518,7 +600,7 @@ class TabDock(QWidget):
         self.open_in_new_window(widget=widget, title=tab_widget.tabText(tab_widget.currentIndex()))
 
     @classmethod
-    def open_in_new_window(cls, widget: DeferredWidget, title: str = ""):
+    def open_in_new_window(cls, widget: DeferredWidget, title: str = "") -> QWidget:
         """
         Move a widget into a floating window and let it be tracked by the dock.
 
@@ -532,11 +614,19 @@ class TabDock(QWidget):
         title : str, optional
             The title of the tab and/or window.
             If omitted we'll use the widget's windowTitle.
+
+        Returns
+        -------
+        QWidget
+            The widget that was opened in the window.
         """
         self = cls._get_instance()
         self.clean_detached_widgets()
 
+        recipe = None if isinstance(widget, QWidget) else widget
         widget, title = unpack_deferred_widget(widget=widget, title=title)
+        if recipe is not None:
+            self._remember_recipe(widget, recipe, title)
 
         self.detached_widgets.add(widget)
         widget.setParent(self)
@@ -548,6 +638,7 @@ class TabDock(QWidget):
         widget.show()
         widget.activateWindow()
         self.update_attach_enabled()
+        return widget
 
     @classmethod
     def open_in_new_window_many(cls, widget_list: DeferredWidgetList, title_list: DeferredTitleList | None = None):
@@ -640,6 +731,436 @@ class TabDock(QWidget):
         """Remove the currently opened tab."""
         tab_widget.removeTab(tab_widget.currentIndex())
 
+    def _remember_recipe(self, widget: QWidget, recipe: Callable[[], QWidget], title: str):
+        """Keep the deferred widget that built a widget so we can rebuild it after hibernation."""
+        if widget not in self._recipes:
+            widget.destroyed.connect(partial(self._forget_widget, widget))
+        self._recipes[widget] = (recipe, title)
+
+    def _mark_active(self, widget: QWidget, now: float | None = None):
+        """Record when a tab was last selected, for the widgets that can be hibernated."""
+        if widget in self._recipes:
+            self._last_active[widget] = time.monotonic() if now is None else now
+
+    def _forget_widget(self, widget: QWidget, *args):
+        """Stop tracking a widget that was deleted."""
+        self._recipes.pop(widget, None)
+        self._last_active.pop(widget, None)
+
+    def get_hibernate_after(self) -> int:
+        """Return the number of seconds before an unselected tab is hibernated."""
+        return self._hibernate_after
+
+    def set_hibernate_after(self, seconds: int):
+        """Set the number of seconds before an unselected tab is hibernated, or 0 to disable."""
+        self._hibernate_after = seconds
+        self._update_hibernate_timer()
+
+    hibernateAfter = Property(int, get_hibernate_after, set_hibernate_after)
+
+    def get_widget_budget(self) -> int:
+        """Return the total number of widgets to allow in the open tabs."""
+        return self._widget_budget
+
+    def set_widget_budget(self, widget_count: int):
+        """Set the total number of widgets to allow in the open tabs, or 0 for no limit."""
+        self._widget_budget = widget_count
+        self._update_hibernate_timer()
+
+    widgetBudget = Property(int, get_widget_budget, set_widget_budget)
+
+    def _update_hibernate_timer(self):
+        """Only check for tabs to hibernate if hibernation is enabled."""
+        if self._hibernate_after or self._widget_budget:
+            self._hibernate_timer.start()
+        else:
+            self._hibernate_timer.stop()
+
+    def _tab_selected(self, idx: int, tab_widget: QTabWidget):
+        """When a tab is selected, mark it as active and wake it up if it was hibernated."""
+        if self._swapping_tabs or idx < 0:
+            return
+        widget = tab_widget.widget(idx)
+        if isinstance(widget, LoadingTab):
+            # Selecting a tab that failed to load tries again
+            self._retry_loading(widget)
+            return
+        if isinstance(widget, HibernatedTab):
+            recipe = widget.recipe
+            if isinstance(recipe, DeferredScreen) and not recipe.is_cached():
+                loading = LoadingTab(recipe=recipe, title=widget.title)
+                self._replace_tab(tab_widget, idx, loading)
+                widget.deleteLater()
+                self._start_loading(loading)
+            else:
+                self.wake_tab(tab_widget, idx)
+        else:
+            self._mark_active(widget)
+
+    def _start_loading(self, placeholder: "LoadingTab") -> "LoadingTab":
+        """Prepare a screen in a background thread, then build it in place of the placeholder."""
+        placeholder.ready.connect(self._finish_loading)
+        placeholder.retry_requested.connect(self._retry_loading)
+        self._prepare_in_background(placeholder)
+        return placeholder
+
+    def _prepare_in_background(self, placeholder: "LoadingTab"):
+        """Start the background thread that prepares a placeholder's screen."""
+        placeholder.show_loading()
+        preparer = ScreenPreparer(placeholder.recipe)
+        preparer.finished.connect(placeholder.prepared)
+        preparer.start()
+
+    def _retry_loading(self, placeholder: "LoadingTab"):
+        """Load a screen again after it failed to load, e.g. because the file was fixed."""
+        if placeholder.failed:
+            self._prepare_in_background(placeholder)
+
+    def _finish_loading(self, placeholder: "LoadingTab"):
+        """Build a screen that was prepared in the background and swap it into its tab."""
+        for tab_row in self.tab_widgets:
+            for tab_widget in tab_row:
+                idx = tab_widget.indexOf(placeholder)
+                if idx == -1:
+                    continue
+                try:
+                    self.wake_tab(tab_widget, idx)
+                except Exception as exc:
+                    logger.exception("Failed to load %s", placeholder.title)
+                    placeholder.show_error(exc)
+                    return
+                if placeholder.auto_title:
+                    tab_widget.setTabText(idx, tab_widget.widget(idx).windowTitle())
+                return
+        # The tab was closed while loading
+        placeholder.deleteLater()
+
+    def check_hibernation(self):
+        """
+        Hibernate background tabs that are idle or over the widget budget.
+
+        This runs periodically when hibernateAfter or widgetBudget are set.
+        """
+        now = time.monotonic()
+        candidates = []
+        widget_count = 0
+        for tab_row in self.tab_widgets:
+            for tab_widget in tab_row:
+                current = tab_widget.currentWidget()
+                if current is not None:
+                    self._mark_active(current, now)
+                for idx in range(tab_widget.count()):
+                    widget = tab_widget.widget(idx)
+                    if isinstance(widget, HibernatedTab):
+                        continue
+                    count = 1 + len(widget.findChildren(QWidget))
+                    widget_count += count
+                    if widget is not current and widget in self._recipes:
+                        candidates.append((self._last_active.get(widget, now), count, widget, tab_widget))
+        # Least recently selected first
+        candidates.sort(key=lambda candidate: candidate[0])
+        for last_active, count, widget, tab_widget in candidates:
+            idle = self._hibernate_after and now - last_active >= self._hibernate_after
+            over_budget = self._widget_budget and widget_count > self._widget_budget
+            if idle or over_budget:
+                self.hibernate_tab(tab_widget, tab_widget.indexOf(widget))
+                widget_count -= count
+
+    def hibernate_tab(self, tab_widget: QTabWidget, idx: int):
+        """
+        Replace a tab's widget with a placeholder that can rebuild it later, and delete the widget.
+
+        This only works for widgets that were opened from a deferred widget.
+        """
+        widget = tab_widget.widget(idx)
+        recipe, title = self._recipes[widget]
+        placeholder = HibernatedTab(recipe=recipe, title=title)
+        self._replace_tab(tab_widget, idx, placeholder)
+        widget.close()
+        widget.setParent(None)  # type: ignore
+        widget.deleteLater()
+
+    def wake_tab(self, tab_widget: QTabWidget, idx: int):
+        """Rebuild a hibernated tab's widget from its placeholder."""
+        placeholder = cast(HibernatedTab, tab_widget.widget(idx))
+        widget = placeholder.recipe()
+        self._remember_recipe(widget, placeholder.recipe, placeholder.title)
+        self._mark_active(widget)
+        # Some typhos screens crash (segfault) when added to the tabs if not shown first (???)
+        widget.show()
+        self._replace_tab(tab_widget, idx, widget)
+        placeholder.deleteLater()
+
+    def _replace_tab(self, tab_widget: QTabWidget, idx: int, widget: QWidget):
+        """Swap the widget in a tab without changing the tab's position, text, or selection."""
+        current_idx = tab_widget.currentIndex()
+        text = tab_widget.tabText(idx)
+        self._last_active.pop(tab_widget.widget(idx), None)
+        self._swapping_tabs = True
+        try:
+            tab_widget.removeTab(idx)
+            tab_widget.insertTab(idx, widget, text)
+            self._add_tab_buttons(tab_widget, idx)
+            tab_widget.setCurrentIndex(current_idx)
+        finally:
+            self._swapping_tabs = False
+        self.show_correct_tab_buttons(current_idx, tab_widget=tab_widget)
+
+    def _session_screen(self, widget: QWidget) -> dict[str, Any] | None:
+        """Return how to reopen the screen shown by a widget, or None if it was not loaded from a file."""
+        if isinstance(widget, HibernatedTab):
+            recipe, title = widget.recipe, widget.title
+        else:
+            recipe, title = self._recipes.get(widget, (None, ""))
+        if not isinstance(recipe, DeferredScreen):
+            return None
+        return {"filename": recipe.filename, "macros": recipe.macros, "title": title}
+
+    @classmethod
+    def get_session(cls) -> dict[str, Any]:
+        """
+        Return the screens open in the dock and in detached windows, to be saved as json.
+
+        Only screens that were loaded from files, e.g. by a TabDockButton, are included.
+        """
+        self = cls._get_instance()
+        self.clean_detached_widgets()
+        docks = []
+        for row_idx, tab_row in enumerate(self.tab_widgets[: self.dock_rows]):
+            for col_idx, tab_widget in enumerate(tab_row[: self.dock_cols]):
+                tabs = []
+                current = 0
+                for idx in range(tab_widget.count()):
+                    screen = self._session_screen(tab_widget.widget(idx))
+                    if screen is None:
+                        continue
+                    if idx == tab_widget.currentIndex():
+                        current = len(tabs)
+                    screen["title"] = tab_widget.tabText(idx)
+                    tabs.append(screen)
+                if tabs:
+                    docks.append({"row": row_idx, "col": col_idx, "current": current, "tabs": tabs})
+        windows = []
+        for widget in self.detached_widgets:
+            screen = self._session_screen(widget)
+            if screen is None:
+                continue
+            geometry = widget.geometry()
+            screen["title"] = widget.windowTitle()
+            screen["geometry"] = [geometry.x(), geometry.y(), geometry.width(), geometry.height()]
+            windows.append(screen)
+        return {"rows": self.dock_rows, "cols": self.dock_cols, "docks": docks, "windows": windows}
+
+    @classmethod
+    def save_session(cls, filename: str | Path = DOCK_SESSION_FILE) -> None:
+        """
+        Save the open screens to a file so that restore_session can open them again.
+
+        Parameters
+        ----------
+        filename : str or Path, optional
+            The json file to write. Defaults to DOCK_SESSION_FILE.
+        """
+        path = Path(filename)
+        session = cls.get_session()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(session, f, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def restore_session(cls, filename: str | Path = DOCK_SESSION_FILE) -> None:
+        """
+        Open the screens from a file written by save_session.
+
+        The dock tabs are restored as placeholders, and only the selected
+        tab in each dock area is loaded right away. The others are loaded
+        when they are selected, so restoring many tabs is about as fast
+        as opening one screen. Detached windows are shown immediately.
+
+        Parameters
+        ----------
+        filename : str or Path, optional
+            The json file to read. Defaults to DOCK_SESSION_FILE.
+
+        Raises
+        ------
+        OSError
+            If the file can't be read.
+        ValueError
+            If the file is not valid json or not a saved session.
+        """
+        with open(filename, "r") as f:
+            session = json.load(f)
+        cls.apply_session(session)
+
+    @classmethod
+    def apply_session(cls, session: dict[str, Any]) -> None:
+        """
+        Open the screens from the output of get_session, see restore_session.
+
+        Raises
+        ------
+        ValueError
+            If the session does not have the layout written by get_session.
+            Nothing is opened in that case.
+        """
+        validate_session(session)
+        self = cls._get_instance()
+        self.dock_rows_spinbox.setValue(session.get("rows", 1))
+        self.dock_columns_spinbox.setValue(session.get("cols", 1))
+        self.apply_settings()
+        for dock in session.get("docks", []):
+            tab_widget = self.tab_widgets[dock["row"]][dock["col"]]
+            self._swapping_tabs = True
+            try:
+                for screen in dock["tabs"]:
+                    recipe = DeferredScreen(screen["filename"], macros=screen.get("macros"))
+                    placeholder = HibernatedTab(recipe=recipe, title=screen.get("title", ""))
+                    idx = tab_widget.addTab(placeholder, placeholder.title)
+                    self._add_tab_buttons(tab_widget, idx)
+                first_idx = tab_widget.count() - len(dock["tabs"])
+                tab_widget.setCurrentIndex(first_idx + dock.get("current", 0))
+            finally:
+                self._swapping_tabs = False
+            self.show_correct_tab_buttons(tab_widget.currentIndex(), tab_widget=tab_widget)
+            self._tab_selected(tab_widget.currentIndex(), tab_widget=tab_widget)
+        for screen in session.get("windows", []):
+            recipe = DeferredScreen(screen["filename"], macros=screen.get("macros"))
+            try:
+                window = cls.open_in_new_window(widget=recipe, title=screen.get("title", ""))
+            except Exception:
+                logger.exception("Unable to restore %s", screen["filename"])
+                continue
+            if screen.get("geometry"):
+                window.setGeometry(*screen["geometry"])
+
+
+def validate_session(session: Any) -> None:
+    """
+    Check that a session has the layout written by TabDock.get_session.
+
+    Raises
+    ------
+    ValueError
+        For the first problem found.
+    """
+
+    def expect(condition: bool, message: str):
+        if not condition:
+            raise ValueError(f"Invalid dock session: {message}")
+
+    expect(isinstance(session, dict), "expected a json object")
+    rows, cols = session.get("rows", 1), session.get("cols", 1)
+    for name, value in (("rows", rows), ("cols", cols)):
+        expect(isinstance(value, int) and 1 <= value <= 10, f"{name} must be an integer from 1 to 10")
+    docks, windows = session.get("docks", []), session.get("windows", [])
+    expect(isinstance(docks, list) and isinstance(windows, list), "docks and windows must be lists")
+    for dock in docks:
+        expect(isinstance(dock, dict), "each dock must be a json object")
+        row, col = dock.get("row"), dock.get("col")
+        expect(isinstance(row, int) and 0 <= row < rows, f"dock row {row!r} is outside of the {rows} rows")
+        expect(isinstance(col, int) and 0 <= col < cols, f"dock col {col!r} is outside of the {cols} cols")
+        tabs = dock.get("tabs")
+        expect(isinstance(tabs, list) and bool(tabs), f"dock at row {row}, col {col} has no tabs")
+        expect(isinstance(dock.get("current", 0), int), f"dock at row {row}, col {col} has an invalid current tab")
+        for screen in tabs:
+            _validate_session_screen(screen, expect)
+    for screen in windows:
+        _validate_session_screen(screen, expect)
+        geometry = screen.get("geometry")
+        expect(
+            geometry is None
+            or (isinstance(geometry, list) and len(geometry) == 4 and all(isinstance(num, int) for num in geometry)),
+            f"window geometry {geometry!r} must be a list of 4 integers",
+        )
+
+
+def _validate_session_screen(screen: Any, expect: Callable[[bool, str], None]) -> None:
+    """Check one saved screen from a session."""
+    expect(isinstance(screen, dict), "each screen must be a json object")
+    expect(isinstance(screen.get("filename"), str), f"screen {screen!r} has no filename")
+    macros = screen.get("macros")
+    expect(macros is None or isinstance(macros, dict), f"screen {screen['filename']} has invalid macros")
+
+
+class HibernatedTab(QWidget):
+    """
+    Lightweight placeholder for a tab whose screen was deleted to save resources.
+
+    Parameters
+    ----------
+    recipe : callable
+        The deferred widget that rebuilds the screen.
+    title : str
+        The title of the screen.
+    """
+
+    def __init__(self, recipe: Callable[[], QWidget], title: str, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.recipe = recipe
+        self.title = title
+        self.setWindowTitle(title)
+        layout = QVBoxLayout()
+        self.label = QLabel(self.message())
+        self.label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.label)
+        self.setLayout(layout)
+
+    def message(self) -> str:
+        """The text to show in the placeholder."""
+        return f"{self.title} was closed to save resources.\nSelect this tab to reload it."
+
+
+class LoadingTab(HibernatedTab):
+    """
+    Placeholder for a tab whose screen is being prepared in a background thread.
+
+    If the screen fails to load, the error is shown along with a button
+    to try again. Selecting the tab again also tries again.
+
+    Parameters
+    ----------
+    recipe : DeferredScreen
+        The screen to load.
+    title : str, optional
+        The title of the screen. If omitted, we use the file name until the
+        screen is loaded and then the screen's window title.
+    """
+
+    ready = Signal(object)
+    retry_requested = Signal(object)
+
+    def __init__(self, recipe: DeferredScreen, title: str = "", parent: QWidget | None = None):
+        self.auto_title = not title
+        self.failed = False
+        title = title or recipe.title or os.path.basename(recipe.filename)
+        super().__init__(recipe=recipe, title=title, parent=parent)
+        self.retry_button = QPushButton("Retry")
+        self.retry_button.setVisible(False)
+        self.retry_button.clicked.connect(lambda: self.retry_requested.emit(self))
+        self.layout().addWidget(self.retry_button, alignment=Qt.AlignCenter)
+
+    def message(self) -> str:
+        return f"Loading {self.title}..."
+
+    def prepared(self):
+        """Called when the background preparation is done."""
+        self.ready.emit(self)
+
+    def show_loading(self):
+        """Show that the screen is being loaded."""
+        self.failed = False
+        self.label.setText(self.message())
+        self.retry_button.setVisible(False)
+
+    def show_error(self, exc: Exception):
+        """Show that the screen failed to load, and offer to try again."""
+        self.failed = True
+        self.label.setText(f"Failed to load {self.title}:\n{exc}")
+        self.retry_button.setVisible(True)
+
 
 def unpack_deferred_widget(widget: DeferredWidget, title: str = "") -> tuple[QWidget, str]:
     """
@@ -1,17 +1,17 @@
 """A simple push button to open pydm screens in the TabDock widget."""
 
+import os
 from typing import cast
 
-from pydm.display import ScreenTarget, clear_compiled_ui_file_cache, load_file
 from pydm.utilities import IconFont, find_file
 from pydm.utilities.macro import parse_macro_string
-from pydm.utilities.stylesheet import merge_widget_stylesheet
 from qtpy.QtGui import QContextMenuEvent, QCursor
 from qtpy.QtWidgets import (
     QPushButton,
     QWidget,
 )
 
+from .screen_cache import DeferredScreen
 from .tab_dock import TabDock
 
 try:
@@ -49,46 +49,63 @@ class TabDockButton(QPushButton):
         self.clicked.connect(self.open_in_dock)
         self._icon = ifont.icon("anchor")
         self.setCursor(QCursor(self._icon.pixmap(16, 16)))  # type: ignore
-        self.cached_ui_text = ""
-        self.cached_widget: QWidget | None = None
+        self._resolved_filename: str | None = None
+        self._screen: DeferredScreen | None = None
+
+    def resolve_filename(self) -> str:
+        """Find the full path to our file, only searching the first time."""
+        if self._resolved_filename is None:
+            fname = find_file(
+                self._filename,
+                raise_if_not_found=True,
+            )
+            self._resolved_filename = cast(str, fname)
+        return self._resolved_filename
+
+    def deferred_screen(self) -> DeferredScreen:
+        """
+        Return the deferred widget that the dock uses to load our screen.
+
+        This is the same object each time, so that it can re-use the screen it built.
+        """
+        fname = self.resolve_filename()
+        if not os.path.exists(fname):
+            # The file was moved or removed since we found it, search again
+            self._resolved_filename = None
+            fname = self.resolve_filename()
+        macros = parse_macro_string(self._macro)
+        if self._screen is None or self._screen.filename != fname or self._screen.macros != (macros or {}):
+            self._screen = DeferredScreen(fname, macros=macros)
+        return self._screen
+
+    @property
+    def cached_widget(self) -> QWidget | None:
+        """The screen this button built last, if it still exists."""
+        return None if self._screen is None else self._screen.widget
 
     def build_widget(self) -> QWidget:
-        """Create or re-use the widget defined by the pydm file."""
-        fname = find_file(
-            self._filename,
-            raise_if_not_found=True,
-        )
-        fname = cast(str, fname)
-        macros = parse_macro_string(self._macro)
-        with open(fname, "r") as fd:
-            ui_text = fd.read()
-
-        if ui_text != self.cached_ui_text or self.cached_widget is None:
-            if self.cached_widget is not None:
-                clear_compiled_ui_file_cache()
-                self.cached_widget.close()
-            display = cast(QWidget, load_file(fname, macros=macros, target=ScreenTarget.DIALOG))
-            display.hide()
-            merge_widget_stylesheet(widget=display)
-            self.cached_ui_text = ui_text
-            self.cached_widget = display
-        else:
-            display = self.cached_widget
-        return display
+        """
+        Create or re-use the widget defined by the pydm file.
+
+        The widget is re-used until the file is modified. The compiled file is
+        shared with other buttons that use the same file, see ScreenCache.
+        """
+        return self.deferred_screen().build()
 
     def open_in_dock(self):
         """Place the widget defined by this button into the dock based on the key modifiers."""
-        TabDock.add_to_dock_user_keybinds(widget=self.build_widget)
+        TabDock.add_to_dock_user_keybinds(widget=self.deferred_screen())
 
     def contextMenuEvent(self, event: QContextMenuEvent) -> None:  # type: ignore
         """On right-click, open a menu to decide where the widget should go."""
-        TabDock.add_to_dock_user_menu(widget=self.build_widget, pos=event.globalPos())
+        TabDock.add_to_dock_user_menu(widget=self.deferred_screen(), pos=event.globalPos())
 
     def readFilename(self) -> str:
         return self._filename
 
     def setFilename(self, val: str) -> None:
         self._filename = val
+        self._resolved_filename = None
 
     filename = Property("QString", readFilename, setFilename)
 
@@ -0,0 +1,217 @@
+"""
+Loading and validation of the lucid-style toolbar yaml files.
+
+The files are parsed with the yaml safe loader, using the LibYAML C
+implementation when it is available, and checked against the expected
+layout of tabs and buttons before any widgets are made.
+
+Parsing a large file is slow compared to everything else we do at startup,
+so validated configs are cached as json, keyed by a hash of the file's
+contents. The next display start with an unchanged file skips the yaml
+parser entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+TOOLBAR_CACHE_DIR = Path.home() / ".cache" / "pcdswidgets" / "toolbar"
+# Change this whenever the validation rules change, to ignore old cache entries
+CACHE_VERSION = 2
+
+BUTTON_TYPES = ("shell", "display", "dock")
+
+
+class ToolbarConfigError(ValueError):
+    """Raised when a toolbar yaml file does not have the expected layout."""
+
+
+def load_toolbar_config(filename: str, use_cache: bool = True) -> dict[str, dict[str, Any]]:
+    """
+    Load and validate a toolbar yaml file.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the yaml file.
+    use_cache : bool, optional
+        Whether to read and write the on-disk cache of validated configs.
+
+    Returns
+    -------
+    config : dict
+        Mapping from tab name to tab parameters, as written in the file.
+
+    Raises
+    ------
+    ToolbarConfigError
+        If the file is not valid yaml or not a valid toolbar config.
+        The message includes the file name and line number of the problem.
+    """
+    with open(filename, "rb") as f:
+        contents = f.read()
+    digest = hashlib.sha256(contents).hexdigest()
+    if use_cache:
+        cached = _load_cached_config(digest)
+        if cached is not None:
+            return cached
+    config = parse_toolbar_config(contents, filename=filename)
+    if use_cache:
+        _save_cached_config(digest, config)
+    return config
+
+
+def parse_toolbar_config(contents: str | bytes, filename: str = "<string>") -> dict[str, dict[str, Any]]:
+    """
+    Parse and validate the contents of a toolbar yaml file.
+
+    See load_toolbar_config.
+    """
+    loader = SafeLoader(contents)
+    try:
+        node = loader.get_single_node()
+        if node is None:
+            raise ToolbarConfigError(f"{filename}: the file is empty")
+        validate_toolbar_node(node, filename=filename)
+        return loader.construct_document(node)
+    except yaml.YAMLError as exc:
+        raise ToolbarConfigError(f"{filename}: invalid yaml: {exc}") from exc
+    finally:
+        loader.dispose()
+
+
+def validate_toolbar_node(node: yaml.Node, filename: str = "<string>") -> None:
+    """
+    Check that a composed yaml document has the layout of a toolbar config.
+
+    This works on the yaml nodes rather than the loaded values so that
+    the errors can point at the line with the problem.
+
+    Tab and button names are always loaded as the text written in the file,
+    e.g. ``1:`` is the tab "1" and ``yes:`` is the button "yes", rather than
+    as numbers or booleans. This is why the node is modified in place.
+
+    Raises
+    ------
+    ToolbarConfigError
+        For the first problem found.
+    """
+    _expect_mapping(node, "the toolbar", filename)
+    for tab_key, tab_node in node.value:
+        tab_name = _name(tab_key, "tab", filename)
+        _expect_mapping(tab_node, f"tab {tab_name!r}", filename)
+        for key_node, value_node in tab_node.value:
+            if key_node.value == "config":
+                _validate_tab_config(value_node, tab_name, filename)
+            elif key_node.value == "buttons":
+                _expect_mapping(value_node, f"the buttons of tab {tab_name!r}", filename)
+                for button_key, button_node in value_node.value:
+                    _validate_button(button_node, _name(button_key, "button", filename), filename)
+
+
+def _validate_tab_config(node: yaml.Node, tab_name: str, filename: str) -> None:
+    """Check the config section of a tab."""
+    _expect_mapping(node, f"the config of tab {tab_name!r}", filename)
+    for key_node, value_node in node.value:
+        if key_node.value != "cols":
+            continue
+        if value_node.tag != "tag:yaml.org,2002:int" or int(value_node.value) < 1:
+            raise _error(value_node, filename, f"cols for tab {tab_name!r} must be a positive integer")
+
+
+def _validate_button(node: yaml.Node, button_name: str, filename: str) -> None:
+    """Check the settings for one button."""
+    _expect_mapping(node, f"button {button_name!r}", filename)
+    for key_node, value_node in node.value:
+        if key_node.value == "type":
+            if value_node.value not in BUTTON_TYPES:
+                raise _error(
+                    value_node,
+                    filename,
+                    f"button {button_name!r} has type {value_node.value!r}, expected one of {', '.join(BUTTON_TYPES)}",
+                )
+            return
+    raise _error(node, filename, f"button {button_name!r} is missing a type")
+
+
+def _name(node: yaml.Node, description: str, filename: str) -> str:
+    """Make a tab or button name load as the text in the file, and return it."""
+    if not isinstance(node, yaml.ScalarNode):
+        raise _error(node, filename, f"expected the {description} name to be text")
+    node.tag = "tag:yaml.org,2002:str"
+    return node.value
+
+
+def _expect_mapping(node: yaml.Node, description: str, filename: str) -> None:
+    """Raise if a node is not a mapping."""
+    if not isinstance(node, yaml.MappingNode):
+        raise _error(node, filename, f"expected {description} to be a mapping")
+
+
+def _error(node: yaml.Node, filename: str, message: str) -> ToolbarConfigError:
+    """Make an error that points at a node's line in the file."""
+    return ToolbarConfigError(f"{filename}:{node.start_mark.line + 1}: {message}")
+
+
+def _cache_path(digest: str) -> Path:
+    """Return the cache file for a file hash."""
+    return TOOLBAR_CACHE_DIR / f"{digest}.json"
+
+
+def _load_cached_config(digest: str) -> dict[str, dict[str, Any]] | None:
+    """Return the cached validated config for a file hash, or None."""
+    path = _cache_path(digest)
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.debug("Unable to read toolbar cache %s", path, exc_info=True)
+        return None
+    if cache.get("version") != CACHE_VERSION:
+        return None
+    return cache["config"]
+
+
+def _save_cached_config(digest: str, config: dict[str, dict[str, Any]]) -> None:
+    """
+    Cache a validated config for the next load_toolbar_config.
+
+    Configs that json can't represent exactly, e.g. with dates or with
+    numbers as keys, are not cached, so a cached load always returns the
+    same config as parsing the file.
+    Errors are logged rather than raised because the cache is optional.
+    """
+    try:
+        text = json.dumps({"version": CACHE_VERSION, "config": config})
+    except (TypeError, ValueError):
+        logger.debug("Not caching toolbar config %s, it can't be saved as json", digest, exc_info=True)
+        return
+    if json.loads(text)["config"] != config:
+        logger.debug("Not caching toolbar config %s, it changes when saved as json", digest)
+        return
+    path = _cache_path(digest)
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except Exception:
+        logger.debug("Unable to save toolbar cache to %s", path, exc_info=True)
+        try:
+            tmp_path.unlink()
+        except OSError:
+            ...
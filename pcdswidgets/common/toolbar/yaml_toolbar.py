@@ -7,16 +7,18 @@ the lucid launcher, of which it has no real dependencies.
 
 import logging
 import os
-from typing import Any
+from typing import Any, cast
 
-import yaml
 from pydm.widgets import PyDMRelatedDisplayButton, PyDMShellCommand
 from qtpy import QtCore, QtWidgets
 from qtpy.QtCore import Qt
 from qtpy.QtWidgets import QGridLayout, QPushButton, QWidget
 
+from pcdswidgets.common.dock.screen_cache import ScreenPrewarmer
 from pcdswidgets.common.dock.tab_dock_button import TabDockButton
 
+from .yaml_config import ToolbarConfigError, load_toolbar_config
+
 try:
     from qtpy.QtCore import Property  # type: ignore
 except ImportError:
@@ -32,6 +34,15 @@ class YamlToolbar(QtWidgets.QWidget):
     This uses the legacy yaml format from lucid, which defines which buttons go in which tab.
 
     See https://pcdshub.github.io/lucid/master/toolbar.html for more information.
+
+    Only the first tab, and the tab with the default dock button, are built
+    when the config file is loaded. The buttons in other tabs are created the
+    first time their tab is selected, or one tab at a time while the
+    application is idle if buildInBackground is set.
+
+    If prewarmScreens is set, the .ui files of the dock buttons are compiled
+    in the background while the user is idle, so that the first click on each
+    dock button only needs to create the screen's widgets. See ScreenPrewarmer.
     """
 
     _qt_designer_ = {
@@ -45,11 +56,20 @@ class YamlToolbar(QtWidgets.QWidget):
         self._config_file = ""
         self._default_config = {"cols": 4}
         self.default_dock_button = None
+        self._tab_configs: list[dict[str, Any]] = []
+        self._unbuilt_tabs: set[int] = set()
+        self._build_in_background = False
+        self._background_timer = QtCore.QTimer(parent=self)
+        self._background_timer.setInterval(50)
+        self._background_timer.timeout.connect(self._build_next_tab)
+        self._prewarm_screens = False
+        self.prewarmer: ScreenPrewarmer | None = None
 
         self.setSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
         main_layout = QtWidgets.QVBoxLayout()
         self.setLayout(main_layout)
         self.tab = QtWidgets.QTabWidget()
+        self.tab.currentChanged.connect(self.build_tab)
         main_layout.addWidget(self.tab)
 
     def get_config_file(self) -> str:
@@ -60,6 +80,8 @@ class YamlToolbar(QtWidgets.QWidget):
         """
         Set the path to the toolbar config yaml file and create the necessary tabs and buttons.
 
+        The file is validated first, see load_toolbar_config, and problems are logged.
+
         Parameters
         ----------
         file : str
@@ -70,15 +92,88 @@ class YamlToolbar(QtWidgets.QWidget):
             return
         if not os.path.isfile(file):
             return
-        with open(file) as tf:
-            full_config = yaml.full_load(tf)
+        try:
+            full_config = load_toolbar_config(file)
+        except ToolbarConfigError as exc:
+            logger.error(f"Invalid toolbar config: {exc}")
+            return
         self._assemble_tabs(full_config)
+        if self._prewarm_screens:
+            self.start_prewarm()
 
     filename = Property("QString", get_config_file, set_config_file)
 
+    def get_build_in_background(self) -> bool:
+        """Return True if unbuilt tabs are built while the application is idle."""
+        return self._build_in_background
+
+    def set_build_in_background(self, value: bool):
+        """
+        Set whether to build the unbuilt tabs while the application is idle.
+
+        Otherwise, each tab is built the first time it is selected.
+        """
+        self._build_in_background = bool(value)
+        if self._build_in_background and self._unbuilt_tabs:
+            self._background_timer.start()
+        else:
+            self._background_timer.stop()
+
+    buildInBackground = Property(bool, get_build_in_background, set_build_in_background)
+
+    def get_prewarm_screens(self) -> bool:
+        """Return True if the dock button screens are compiled ahead of time."""
+        return self._prewarm_screens
+
+    def set_prewarm_screens(self, value: bool):
+        """Set whether to compile the dock button screens while the user is idle."""
+        self._prewarm_screens = bool(value)
+        if self._prewarm_screens:
+            self.start_prewarm()
+        elif self.prewarmer is not None:
+            self.prewarmer.stop()
+
+    prewarmScreens = Property(bool, get_prewarm_screens, set_prewarm_screens)
+
+    def dock_screen_files(self) -> list[str]:
+        """
+        Return the files that the dock buttons open, in the order to prewarm them.
+
+        This is the default dock button's file, then the files for the current tab,
+        then the files for the other tabs in order. Tabs don't need to be built.
+        """
+        filenames = []
+        if self.default_dock_button is not None:
+            filenames.append(self.default_dock_button.filename)
+        current = self.tab.currentIndex()
+        order = [current] + [idx for idx in range(len(self._tab_configs)) if idx != current]
+        for idx in order:
+            if idx < 0:
+                continue
+            for button_config in self._tab_configs[idx].get("buttons", {}).values():
+                if button_config.get("type") == "dock" and button_config.get("filename"):
+                    filenames.append(self._config_path(button_config["filename"]))
+        return list(dict.fromkeys(filenames))
+
+    def start_prewarm(self):
+        """Start compiling the dock button screens once the user is idle, replacing any earlier prewarm."""
+        if self.prewarmer is not None:
+            self.prewarmer.stop()
+        self.prewarmer = ScreenPrewarmer(self.dock_screen_files(), parent=self)
+        self.prewarmer.start()
+
+    def _config_path(self, filename: str) -> str:
+        """Return the path to a file named in the config, which may be relative to the config file."""
+        if not os.path.isabs(filename):
+            filename = os.path.join(os.path.dirname(self._config_file), filename)
+        return filename
+
     def _assemble_tabs(self, full_config: dict[str, dict[str, Any]]):
         """
-        Build the tabs from the user's yaml config.
+        Create the tabs from the user's yaml config.
+
+        Only the first tab and the tab with the default dock button are
+        filled with buttons here, see build_tab.
 
         Parameters
         ----------
@@ -86,35 +181,85 @@ class YamlToolbar(QtWidgets.QWidget):
             The serialized configuration from the user's yaml file.
             Contains configuration information for all tabs.
         """
-        self.tab.clear()
-        for tab_name, tab_params in full_config.items():
-            page = QtWidgets.QWidget()
-
-            config = dict(self._default_config)
-            config.update(tab_params.get("config", {}))
-
-            cols = config.get("cols", 4)
-            page.setLayout(YamlTabLayout(cols))
-
-            buttons = tab_params.get("buttons", {})
-            for button_text, button_config in buttons.items():
-                try:
-                    button_widget = self._button_factory(button_text, button_config)
-                except Exception as exc:
-                    logger.error(f"Error creating {button_text} button with exception {exc}, skipping.")
-                    logger.debug(exc, exc_info=True)
-                    continue
-                page.layout().addWidget(button_widget)
+        self.tab.blockSignals(True)
+        try:
+            self.tab.clear()
+        finally:
+            self.tab.blockSignals(False)
+        self.default_dock_button = None
+        self._tab_configs = []
+        self._unbuilt_tabs = set()
 
-            def min_scroll_size_hint(*args, **kwargs):
-                return QtCore.QSize(40, 40)
+        def min_scroll_size_hint(*args, **kwargs):
+            return QtCore.QSize(40, 40)
 
+        for tab_name, tab_params in full_config.items():
             scroll_area = QtWidgets.QScrollArea()
             scroll_area.setWidgetResizable(True)
-            scroll_area.setWidget(page)
             scroll_area.minimumSizeHint = min_scroll_size_hint
+            self._unbuilt_tabs.add(len(self._tab_configs))
+            self._tab_configs.append(tab_params)
             self.tab.addTab(scroll_area, tab_name)
 
+        self.build_tab(0)
+        default_tab = self._find_default_dock_tab()
+        if default_tab is not None:
+            self.build_tab(default_tab)
+        self.set_build_in_background(self._build_in_background)
+
+    def _find_default_dock_tab(self) -> int | None:
+        """Return the index of the tab that will contain the default dock button, without building it."""
+        default_tab = None
+        for idx, tab_params in enumerate(self._tab_configs):
+            for button_config in tab_params.get("buttons", {}).values():
+                if button_config.get("type") != "dock":
+                    continue
+                if default_tab is None or button_config.get("default", False):
+                    default_tab = idx
+        return default_tab
+
+    def build_tab(self, idx: int):
+        """
+        Create the buttons for a tab if they haven't been created yet.
+
+        Parameters
+        ----------
+        idx : int
+            The index of the tab.
+        """
+        if idx not in self._unbuilt_tabs:
+            return
+        self._unbuilt_tabs.remove(idx)
+        if not self._unbuilt_tabs:
+            self._background_timer.stop()
+        tab_params = self._tab_configs[idx]
+
+        page = QtWidgets.QWidget()
+        config = dict(self._default_config)
+        config.update(tab_params.get("config", {}))
+
+        cols = config.get("cols", 4)
+        page.setLayout(YamlTabLayout(cols))
+
+        buttons = tab_params.get("buttons", {})
+        for button_text, button_config in buttons.items():
+            try:
+                button_widget = self._button_factory(button_text, dict(button_config))
+            except Exception as exc:
+                logger.error(f"Error creating {button_text} button with exception {exc}, skipping.")
+                logger.debug(exc, exc_info=True)
+                continue
+            page.layout().addWidget(button_widget)
+
+        cast(QtWidgets.QScrollArea, self.tab.widget(idx)).setWidget(page)
+
+    def _build_next_tab(self):
+        """Build one unbuilt tab, for building in the background."""
+        if self._unbuilt_tabs:
+            self.build_tab(min(self._unbuilt_tabs))
+        else:
+            self._background_timer.stop()
+
     def _button_factory(self, text: str, config: dict[str, Any]) -> QPushButton:
         """
         Create and return a single button for the grid.
@@ -153,8 +298,7 @@ class YamlToolbar(QtWidgets.QWidget):
 
         for prop, val in config.items():
             if prop == "filename":
-                if not os.path.isabs(val):
-                    val = os.path.join(os.path.dirname(self._config_file), val)
+                val = self._config_path(val)
             try:
                 setattr(btn, prop, val)
             except Exception as ex:
@@ -6,23 +6,24 @@ This file can be safely edited to change the runtime behavior of the widget.
 
 from __future__ import annotations
 
-import json
+import collections
+import dataclasses
+import functools
 import logging
 import operator
-import os
+import time
 from datetime import datetime
 from math import inf
 from pathlib import Path
 from string import Template
 from sys import float_info
 
-import numpy as np
-from epics import caput
 from pydm import PyDMChannel
 from pydm.widgets import PyDMLabel, PyDMLineEdit, PyDMPushButton
-from pyqtgraph import InfiniteLine, mkPen
-from qtpy.QtCore import QTimer, Slot
+from pyqtgraph import InfiniteLine, SignalProxy, TextItem, mkPen
+from qtpy.QtCore import Property, QTimer, Slot
 from qtpy.QtWidgets import (
+    QAction,
     QDialog,
     QDialogButtonBox,
     QDoubleSpinBox,
@@ -33,12 +34,54 @@ from qtpy.QtWidgets import (
 )
 
 from pcdswidgets.builder.designer_options import DesignerOptions
+from pcdswidgets.common.tools.scan_buffer import POSITION, VALUE, ScanBuffer
+from pcdswidgets.common.tools.scan_features import FIT_TYPES, ScanFeatures
+from pcdswidgets.common.tools.scan_log import (
+    SCAN_LOG_DIR,
+    ScanRecorder,
+    find_incomplete_scan,
+    new_scan_log_path,
+    prune_scan_logs,
+)
+from pcdswidgets.common.tools.settings_store import SettingsStore
+from pcdswidgets.common.tools.write_queue import PVWriteQueue, WriteRequest
 from pcdswidgets.generated.common.tools.feature_finder_base import FeatureFinderBase
 from pcdswidgets.motion.common.svg_multi_state_led import SvgMultiStateLED
 
 logger = logging.getLogger(__name__)
 
 
+@dataclasses.dataclass
+class StepTiming:
+    """
+    When each stage of one scan step happened, from time.monotonic.
+
+    The stages are: the motor write is queued, the write is sent,
+    DMOV goes to 0 and back to 1, and the detector is read.
+    """
+
+    target: float
+    requested: float = dataclasses.field(default_factory=time.monotonic)
+    written: float | None = None
+    move_started: float | None = None
+    move_done: float | None = None
+    read_started: float | None = None
+    read_done: float | None = None
+
+    def breakdown(self) -> dict[str, float | None]:
+        """Return the seconds spent writing, moving, settling and reading, or None for stages not reached."""
+
+        def elapsed(start: float | None, end: float | None) -> float | None:
+            return None if start is None or end is None else end - start
+
+        return {
+            "write": elapsed(self.requested, self.written),
+            "move": elapsed(self.written, self.move_done),
+            "settle": elapsed(self.move_done, self.read_started),
+            "read": elapsed(self.read_started, self.read_done),
+        }
+
+
 class FeatureFinder(FeatureFinderBase):
     designer_options = DesignerOptions(
         group="ECS Common Tools",
@@ -62,8 +105,10 @@ class FeatureFinder(FeatureFinderBase):
         self._motor_egu_ch = None
 
         # Data arrays for plotting
-        self._motor_positions = []
-        self._detector_values = []
+        self._scan_data = ScanBuffer()
+        # Peak and edge estimates, updated with each point
+        self._features = ScanFeatures()
+        self._feature_lines: dict[str, InfiniteLine] = {}
         # detector
         self._detector_pv = ""
         self._detector_egu = ""
@@ -71,6 +116,11 @@ class FeatureFinder(FeatureFinderBase):
 
         # Config file for caching
         self._config_file = Path.home() / ".config" / "feature_finder_settings.json"
+        self._settings = SettingsStore(self._config_file, parent=self)
+
+        # Every scan point is also streamed to a file, so scans survive crashes
+        self._scan_log_dir = SCAN_LOG_DIR
+        self._scan_recorder: ScanRecorder | None = None
 
         # Add the optional inversion for the x-axis with associated signal
         self._invert = False
@@ -82,14 +132,22 @@ class FeatureFinder(FeatureFinderBase):
         self._running = False
         self._run_direction = None
 
+        # Motor writes are sent from a background thread so the GUI never waits on the network
+        self._write_queue = PVWriteQueue(parent=self)
+        # Timing for the most recent steps, see StepTiming
+        self.step_timings: collections.deque[StepTiming] = collections.deque(maxlen=1000)
+        self._current_step: StepTiming | None = None
+
         # Timer for run mode
         self._run_timer = QTimer()
         self._run_timer.timeout.connect(self._continue_run)
 
-        # Cross-hairs
-        self._crosshair_timer = QTimer()
+        # Cross-hairs follow the motor and detector values, at most once per screen refresh
+        self._crosshair_channels: dict[str, PyDMChannel] = {}
+        self._crosshair_timer = QTimer(parent=self)
+        self._crosshair_timer.setSingleShot(True)
+        self._crosshair_timer.setInterval(16)
         self._crosshair_timer.timeout.connect(self._update_crosshair)
-        self._crosshair_timer.start(100)  # Update every 100ms
 
         # Some stylization and housekeeping on QLabels
         ## Step size
@@ -145,6 +203,8 @@ class FeatureFinder(FeatureFinderBase):
         if macro_name == "detector":
             self.connect_detector()
 
+        self.connect_crosshair()
+
         # Start the post-init timer
         self._macros_timer.start()
 
@@ -162,6 +222,46 @@ class FeatureFinder(FeatureFinderBase):
         # Set-up the graph
         self.setup_plot()
 
+        # Pick up where we left off if the last scan was interrupted
+        if self._scan_recorder is None and not len(self._scan_data):
+            self.recover_scan()
+
+    def recover_scan(self) -> None:
+        """
+        Reload the last scan of this motor/detector pair if it was interrupted, and keep recording to it.
+        """
+        try:
+            scan = find_incomplete_scan(self._motor_pv, self._detector_pv, directory=self._scan_log_dir)
+        except Exception as e:
+            logger.warning(f"Failed to look for an interrupted scan: {e}")
+            return
+        if scan is None:
+            return
+        logger.info(f"Recovered {len(scan.points)} points from interrupted scan {scan.filename}")
+        for position, value, timestamp in scan.points:
+            self._scan_data.append(position, value, timestamp)
+            self._features.add(position, value)
+        self._scan_recorder = ScanRecorder(scan.filename, parent=self)
+        self._redraw_scan()
+        self._update_feature_lines()
+
+    def _record_point(self, position: float, value: float, timestamp: float) -> None:
+        """Stream a scan point to the scan file, starting a new file for the first point."""
+        if self._scan_recorder is None:
+            header = {
+                "motor_pv": self._motor_pv,
+                "detector_pv": self._detector_pv,
+                "motor_egu": self._motor_egu,
+                "detector_egu": self._detector_egu,
+                "step_size": self._step_size,
+                "lower_limit": self._lower_limit,
+                "upper_limit": self._upper_limit,
+                "started": datetime.now().isoformat(),
+            }
+            path = new_scan_log_path(self._motor_pv, self._detector_pv, directory=self._scan_log_dir)
+            self._scan_recorder = ScanRecorder(path, header=header, parent=self)
+        self._scan_recorder.record(position, value, timestamp)
+
     def _get_config_key(self) -> str:
         """
         Generate a unique key for this motor/detector pairing.
@@ -173,84 +273,89 @@ class FeatureFinder(FeatureFinderBase):
         """
         return f"{self._motor_pv}::{self._detector_pv}"
 
+    def _current_settings(self) -> dict:
+        """Return the scan settings shown in the widget."""
+        return {
+            "step_size": self.step_size_set.value(),
+            "lower_limit": self.lower_limit_set.value(),
+            "upper_limit": self.upper_limit_set.value(),
+        }
+
     def save_settings(self) -> None:
         """
         Save current settings to the config file for this motor/detector pair.
-        """
-        try:
-            # Load existing configs
-            if self._config_file.exists():
-                with open(self._config_file, "r") as f:
-                    all_configs = json.load(f)
-            else:
-                all_configs = {}
 
-            # Update config for this motor/detector pair
-            key = self._get_config_key()
-            if key == "::":
-                # Means we tried to save before macros loaded, ignore
-                return
-            all_configs[key] = {
-                "step_size": self.step_size_set.value(),
-                "lower_limit": self.lower_limit_set.value(),
-                "upper_limit": self.upper_limit_set.value(),
+        The file is written shortly after the last change, see SettingsStore.
+        """
+        key = self._get_config_key()
+        if key == "::":
+            # Means we tried to save before macros loaded, ignore
+            return
+        self._settings.set(
+            key,
+            {
+                **self._current_settings(),
                 "motor_pv": self._motor_pv,
                 "detector_pv": self._detector_pv,
                 "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            }
-
-            # Save back to file
-            with open(f"{self._config_file}.tmp", "w") as f:
-                json.dump(all_configs, f, indent=2)
-
-            logger.debug(f"Settings saved for {key}")
-
-            os.replace(f"{self._config_file}.tmp", f"{self._config_file}")
-
-        except Exception as e:
-            logger.warning(f"Failed to save settings: {e}")
+            },
+        )
+        logger.debug(f"Settings saved for {key}")
 
     def load_settings(self) -> None:
         """
         Load saved settings from the config file for this motor/detector pair.
         """
-        setter: QDoubleSpinBox
-
         # Wait for the macros to actually finish connecting
         if not self._motor_pv or not self._detector_pv:
             QTimer.singleShot(100, self.load_settings)
             return
 
-        try:
-            if self._config_file.exists():
-                with open(self._config_file, "r") as f:
-                    all_configs = json.load(f)
-
-                key = self._get_config_key()
-                if key in all_configs:
-                    config = all_configs[key]
-
-                    properties = ["step_size", "lower_limit", "upper_limit"]
-
-                    for prop in properties:
-                        if prop in config:
-                            setattr(self, f"_{prop}", config[prop])
-                            setter = getattr(self, f"{prop}_set")
-                            setter.setValue(config[prop])
-                            logger.info(f"Loaded {prop.replace('_', ' ')}: " + str(getattr(self, f"_{prop}")))
-                            # Manually call the update method to sync the attr
-                            update_method = getattr(self, f"update_{prop}")
-                            update_method()
-                else:
-                    logger.info(f"No saved settings for {key}")
-            else:
-                logger.info("No config file found, using defaults")
-                self._lower_limit = 0
-                self._upper_limit = 0
+        key = self._get_config_key()
+        config = self._settings.get(key)
+        if config is None:
+            logger.info(f"No saved settings for {key}")
+            return
+        self._apply_settings(config)
+
+    def _apply_settings(self, config: dict) -> None:
+        """Show and use the scan settings from a saved config or preset."""
+        setter: QDoubleSpinBox
 
+        try:
+            for prop in ["step_size", "lower_limit", "upper_limit"]:
+                if prop in config:
+                    setattr(self, f"_{prop}", config[prop])
+                    setter = getattr(self, f"{prop}_set")
+                    setter.setValue(config[prop])
+                    logger.info(f"Loaded {prop.replace('_', ' ')}: " + str(getattr(self, f"_{prop}")))
+                    # Manually call the update method to sync the attr
+                    update_method = getattr(self, f"update_{prop}")
+                    update_method()
         except Exception as e:
             logger.warning(f"Failed to load settings: {e}")
 
+    def preset_names(self) -> list[str]:
+        """Return the names of the saved setting presets."""
+        return self._settings.preset_names()
+
+    def save_preset(self, name: str) -> None:
+        """
+        Save the current step size and limits as a named preset.
+
+        Presets are shared by every motor/detector pair and every FeatureFinder.
+        """
+        self._settings.save_preset(name, self._current_settings())
+
+    def load_preset(self, name: str) -> None:
+        """Use the step size and limits from a named preset."""
+        config = self._settings.get_preset(name)
+        if config is None:
+            logger.warning(f"No preset named {name}")
+            return
+        self._apply_settings(config)
+        self.save_settings()
+
     def connect_motor(self) -> None:
         """
         Once the motor macro is available, connect all relevant attr, widgets, etc.
@@ -458,6 +563,8 @@ class FeatureFinder(FeatureFinderBase):
 
         # Detect transition from moving to done
         if self._motor_moving and done:
+            if self._current_step is not None:
+                self._current_step.move_done = time.monotonic()
             self.update_plot_data()
 
             # If we're in continuous run mode, schedule the next step
@@ -466,6 +573,8 @@ class FeatureFinder(FeatureFinderBase):
                 self._run_timer.start(100)
         elif not done:
             self._motor_moving = True
+            if self._current_step is not None and self._current_step.move_started is None:
+                self._current_step.move_started = time.monotonic()
 
     @Slot()
     def update_invert(self) -> None:
@@ -526,10 +635,29 @@ class FeatureFinder(FeatureFinderBase):
         lim = "lower" if self._step_size > 0 else "upper"
         target = self.check_limit(target, limit=lim)
 
+        self._move_to(target)
+
+    def _move_to(self, target: float) -> None:
+        """
+        Queue a motor move for one step, without waiting for it.
+
+        The step completes when DMOV goes back to 1, see on_motor_done_moving.
+        """
         logger.info(f"Stepping to {target:.6f} {self._motor_egu}")
         self._step_called = True
-
-        caput(pvname=f"{self._motor_pv}.VAL", value=target)
+        self._current_step = StepTiming(target=target)
+        self.step_timings.append(self._current_step)
+        self._write_queue.put(f"{self._motor_pv}.VAL", target, callback=self._on_move_written)
+
+    def _on_move_written(self, request: WriteRequest) -> None:
+        """Called in the GUI thread once a motor write has been sent or has failed."""
+        step = self._current_step
+        if step is not None and step.target == request.value:
+            step.written = request.finished
+        if not request.ok:
+            # The motor won't move, so don't wait for DMOV
+            self._step_called = False
+            self._stop_run()
 
     @Slot()
     def _bwd_run(self) -> None:
@@ -572,10 +700,7 @@ class FeatureFinder(FeatureFinderBase):
         lim = "upper" if self._step_size > 0 else "lower"
         target = self.check_limit(target, limit=lim)
 
-        logger.info(f"Stepping to {target:.6f} {self._motor_egu}")
-        self._step_called = True
-
-        caput(pvname=f"{self._motor_pv}.VAL", value=target)
+        self._move_to(target)
 
     @Slot()
     def _fwd_run(self) -> None:
@@ -700,6 +825,30 @@ class FeatureFinder(FeatureFinderBase):
             self._hline = InfiniteLine(angle=0, movable=False, pen=mkPen("r", width=1, style=2))
             plot.plotItem.addItem(self._vline, ignoreBounds=True)
             plot.plotItem.addItem(self._hline, ignoreBounds=True)
+            self.schedule_crosshair()
+
+        if not hasattr(self, "_cursor_label"):
+            # Readout of the scan point nearest the mouse, limited to the screen refresh rate
+            self._cursor_label = TextItem(anchor=(0, 1), color="k")
+            self._cursor_label.setVisible(False)
+            plot.plotItem.addItem(self._cursor_label, ignoreBounds=True)
+            self._mouse_proxy = SignalProxy(plot.scene().sigMouseMoved, rateLimit=60, slot=self._on_mouse_moved)
+
+        if not self._feature_lines:
+            for name, color in (("peak", "b"), ("centroid", "g"), ("edge", "m"), ("fit", "c")):
+                line = InfiniteLine(
+                    angle=90,
+                    movable=False,
+                    pen=mkPen(color, width=1, style=3),
+                    label=name,
+                    labelOpts={"position": 0.95, "color": color},
+                )
+                line.setVisible(False)
+                plot.plotItem.addItem(line, ignoreBounds=True)
+                self._feature_lines[name] = line
+            # Offer the estimates as targets in the plot's right-click menu
+            self._feature_menu = plot.plotItem.vb.menu.addMenu("Move to feature")
+            self._feature_menu.aboutToShow.connect(self._fill_feature_menu)
 
         plot.plotItem.enableAutoRange()
 
@@ -710,8 +859,18 @@ class FeatureFinder(FeatureFinderBase):
         """
         logger.debug("Resetting curve and plot data.")
 
-        self._motor_positions = []
-        self._detector_values = []
+        self._scan_data.clear()
+        self._features.reset()
+        self._update_feature_lines()
+
+        # The scan is over, so it shouldn't be recovered
+        if self._scan_recorder is not None:
+            self._scan_recorder.finish()
+            self._scan_recorder = None
+            try:
+                prune_scan_logs(self._scan_log_dir)
+            except OSError as e:
+                logger.debug(f"Failed to delete old scan files: {e}")
 
         # Clear the curve data directly
         if hasattr(self, "_scan_curve"):
@@ -728,14 +887,16 @@ class FeatureFinder(FeatureFinderBase):
         """
 
         if axis == "y":
-            values = np.array(self._detector_values)
+            bounds = self._scan_data.bounds(VALUE)
             crosshair = self.detector_get.value
             range_setter = self.plot.plotItem.setYRange
 
         elif axis == "x":
             # Need to be aware of optional inversion
             invert = -1 if self._invert else 1
-            values = invert * np.array(self._motor_positions)
+            bounds = self._scan_data.bounds(POSITION)
+            if bounds is not None and self._invert:
+                bounds = (-bounds[1], -bounds[0])
             crosshair = invert * self.position_get.value
             range_setter = self.plot.plotItem.setXRange
 
@@ -744,11 +905,12 @@ class FeatureFinder(FeatureFinderBase):
             logger.warning(f"Invalid axis option: {axis}")
             return
 
-        values = np.append(values, crosshair)
+        # Include the crosshair without copying the scan data
+        values = [crosshair] if bounds is None else [*bounds, crosshair]
 
         if len(values) > 0:
-            _min = float(values.min())
-            _max = float(values.max())
+            _min = float(min(values))
+            _max = float(max(values))
             _range = _max - _min
 
             min_padding = 0.01 if axis == "x" else 1e-9
@@ -770,16 +932,121 @@ class FeatureFinder(FeatureFinderBase):
 
         logger.debug("Inverting the x-axis, updating plot")
 
-        invert = -1 if self._invert else 1
-
-        # Invert the array
-        x_values = invert * np.array(self._motor_positions)
-        y_values = np.array(self._detector_values)
-
         # Send the update to the plot data
-        self._scan_curve.setData(x=x_values, y=y_values)
+        self._redraw_scan()
 
         self._update_axis_range("x")
+        self._update_feature_lines()
+        self.schedule_crosshair()
+
+    def _redraw_scan(self) -> None:
+        """
+        Send the filled part of the scan buffer to the curve.
+
+        The y values are a view of the buffer, so only the optional
+        x inversion makes a copy.
+        """
+        x_values = self._scan_data.positions
+        if self._invert:
+            x_values = -x_values
+        self._scan_curve.setData(x=x_values, y=self._scan_data.values)
+
+    def get_max_scan_points(self) -> int:
+        """Return the most scan points to keep, or 0 to keep every point."""
+        return self._scan_data.max_points
+
+    def set_max_scan_points(self, value: int) -> None:
+        """
+        Set the most scan points to keep.
+
+        With a limit, the oldest points are dropped as new points arrive,
+        which is useful for continuous monitoring. 0 keeps every point.
+        """
+        self._scan_data.max_points = value
+        if hasattr(self, "_scan_curve"):
+            self._redraw_scan()
+
+    maxScanPoints = Property(int, get_max_scan_points, set_max_scan_points)
+
+    def get_feature_fit(self) -> str:
+        """Return the kind of fit used to refine the peak or edge estimate."""
+        return self._features.fit_type
+
+    def set_feature_fit(self, value: str) -> None:
+        """
+        Set the kind of fit used to refine the peak or edge estimate.
+
+        One of "none", "gaussian" or "erf". The fit is shown on the plot
+        along with the running peak, centroid and edge estimates.
+        """
+        if value not in FIT_TYPES:
+            logger.warning(f"Invalid feature fit {value!r}, expected one of {', '.join(FIT_TYPES)}")
+            return
+        self._features.fit_type = value
+        self._update_feature_lines()
+
+    featureFit = Property(str, get_feature_fit, set_feature_fit)
+
+    def feature_targets(self) -> dict[str, float]:
+        """
+        Return the current peak and edge estimates for this scan, by name.
+
+        These are the motor positions offered by move_to_feature. They include
+        every point since the graph was reset, even points dropped by maxScanPoints.
+        """
+        return self._features.targets()
+
+    def move_to_feature(self, name: str) -> None:
+        """
+        Move the motor to one of the feature_targets, within the scan limits.
+
+        This stops a continuous run, and the detector value at the feature
+        is added to the scan like any other step.
+        """
+        target = self.feature_targets().get(name)
+        if target is None:
+            logger.warning(f"No {name} estimate to move to")
+            return
+        self._stop_run()
+        target = self.check_limit(self.check_limit(target, limit="lower"), limit="upper")
+        self._move_to(target)
+
+    def _fill_feature_menu(self) -> None:
+        """List the current feature_targets in the plot's right-click menu."""
+        self._feature_menu.clear()
+        targets = self.feature_targets()
+        if not targets:
+            action = self._feature_menu.addAction("No scan data")
+            action.setEnabled(False)
+            return
+        for name, position in targets.items():
+            action = QAction(f"{name}: {position:.6g} {self._motor_egu}", self._feature_menu)
+            action.triggered.connect(functools.partial(self.move_to_feature, name))
+            self._feature_menu.addAction(action)
+
+    def _update_feature_lines(self) -> None:
+        """Move the feature markers on the plot to the current estimates."""
+        if not self._feature_lines:
+            return
+        invert = -1 if self._invert else 1
+        fit = self._features.fit
+        positions = {
+            "peak": self._features.peak,
+            "centroid": self._features.centroid,
+            "edge": self._features.edge,
+            "fit": None if fit is None else fit.center,
+        }
+        for name, position in positions.items():
+            line = self._feature_lines[name]
+            if position is None:
+                line.setVisible(False)
+                continue
+            line.setPos(invert * position)
+            if name == "centroid":
+                line.label.setFormat(f"centroid (fwhm {self._features.fwhm:.3g})")
+            elif name == "fit":
+                line.label.setFormat(f"{self._features.fit_type} fit (fwhm {fit.fwhm:.3g})")
+            line.setVisible(True)
 
     def update_plot_data(self) -> None:
         """
@@ -792,25 +1059,31 @@ class FeatureFinder(FeatureFinderBase):
             return
 
         try:
+            step = self._current_step
+            if step is not None:
+                step.read_started = time.monotonic()
+
             # Read current motor position and detector value
             motor_position = self.position_get.value
             detector_value = self.detector_get.value
 
-            # Append to arrays
-            self._motor_positions.append(motor_position)
-            self._detector_values.append(detector_value)
-
-            invert = -1 if self._invert else 1
-            x_values = invert * np.array(self._motor_positions)
-            y_values = np.array(self._detector_values)
+            # Append to the preallocated buffers and the scan file
+            timestamp = time.time()
+            self._scan_data.append(motor_position, detector_value, timestamp)
+            self._record_point(motor_position, detector_value, timestamp)
+            self._features.add(motor_position, detector_value)
 
             # Update the curve data
-            self._scan_curve.setData(x=x_values, y=y_values)
+            self._redraw_scan()
+            self._update_feature_lines()
 
             self._update_axis_range("x")
             self._update_axis_range("y")
 
             logger.debug(f"Plot updated: motor={motor_position:.4f},detector={detector_value:.5e}")
+            if step is not None:
+                step.read_done = time.monotonic()
+                logger.debug(f"Step timing: {step.breakdown()}")
 
         except Exception as e:
             logger.error(f"Failed to update plot: {e}")
@@ -819,6 +1092,51 @@ class FeatureFinder(FeatureFinderBase):
         finally:
             self._step_called = False
 
+    def connect_crosshair(self) -> None:
+        """
+        Watch the motor position and detector value channels to move the crosshair.
+
+        These use the same channels as the position and detector labels.
+        """
+        for widget_name in ("position_get", "detector_get"):
+            address = getattr(self, widget_name).channel
+            old_channel = self._crosshair_channels.get(widget_name)
+            if old_channel is not None:
+                if old_channel.address == address:
+                    continue
+                old_channel.disconnect(destroying=True)
+            if not address:
+                continue
+            channel = PyDMChannel(address=address, value_slot=self.schedule_crosshair)
+            channel.connect()
+            self._crosshair_channels[widget_name] = channel
+
+    def schedule_crosshair(self, *args) -> None:
+        """Move the crosshair at the next screen refresh, if the widget is shown."""
+        if self.isVisible() and not self._crosshair_timer.isActive():
+            self._crosshair_timer.start()
+
+    def showEvent(self, event) -> None:
+        """Catch up on the crosshair position that we skipped while hidden."""
+        super().showEvent(event)
+        self.schedule_crosshair()
+
+    def _on_mouse_moved(self, event: tuple) -> None:
+        """Show the scan point nearest to the mouse, or hide the readout when the mouse leaves the plot."""
+        (scene_pos,) = event
+        view_box = self.plot.plotItem.vb
+        if not len(self._scan_data) or not view_box.sceneBoundingRect().contains(scene_pos):
+            self._cursor_label.setVisible(False)
+            return
+        invert = -1 if self._invert else 1
+        mouse_position = invert * view_box.mapSceneToView(scene_pos).x()
+        index = self._scan_data.nearest(mouse_position)
+        position = self._scan_data.positions[index]
+        value = self._scan_data.values[index]
+        self._cursor_label.setText(f"{position:.6g} {self._motor_egu}\n{value:.5e} {self._detector_egu}")
+        self._cursor_label.setPos(invert * position, value)
+        self._cursor_label.setVisible(True)
+
     @Slot()
     def _update_crosshair(self) -> None:
         """
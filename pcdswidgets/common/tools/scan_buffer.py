@@ -0,0 +1,168 @@
+"""Preallocated numpy storage for the points of a 1D scan."""
+
+from __future__ import annotations
+
+import numpy as np
+
+# Columns of the storage array
+POSITION = 0
+VALUE = 1
+TIMESTAMP = 2
+
+
+class ScanBuffer:
+    """
+    Growable or fixed-size storage of (position, value, timestamp) points.
+
+    Points are appended in O(1) amortized time and the filled region is
+    available as numpy views, in the order the points were added, without
+    copying. This lets plots be redrawn on every point without rebuilding
+    arrays from lists.
+
+    Without a cap, the storage doubles in size whenever it fills up.
+    With a cap, only the most recent max_points points are kept, as in a
+    ring buffer. Each point is then written twice, max_points apart, so that
+    the most recent points are always one contiguous slice.
+
+    Parameters
+    ----------
+    max_points : int, optional
+        The most points to keep. 0, the default, keeps every point.
+    initial_capacity : int, optional
+        The number of points to allocate room for when there is no cap.
+    """
+
+    def __init__(self, max_points: int = 0, initial_capacity: int = 256):
+        self._max_points = max(int(max_points), 0)
+        self._initial_capacity = max(int(initial_capacity), 1)
+        self.clear()
+
+    def clear(self) -> None:
+        """Remove every point."""
+        if self._max_points:
+            self._data = np.empty((3, 2 * self._max_points))
+        else:
+            self._data = np.empty((3, self._initial_capacity))
+        self._start = 0
+        self._count = 0
+        self._sorted = None
+        # Running bounds of the positions and values, only used without a cap
+        self._mins = np.full(2, np.inf)
+        self._maxs = np.full(2, -np.inf)
+
+    @property
+    def max_points(self) -> int:
+        """The most points to keep, or 0 for no limit."""
+        return self._max_points
+
+    @max_points.setter
+    def max_points(self, max_points: int) -> None:
+        """Change the cap, keeping as many of the most recent points as fit."""
+        data = self._filled()[:, -max_points:] if max_points else self._filled()
+        data = data.copy()
+        self._max_points = max(int(max_points), 0)
+        self.clear()
+        for position, value, timestamp in data.T:
+            self.append(position, value, timestamp)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, position: float, value: float, timestamp: float = np.nan) -> None:
+        """Add a point, dropping the oldest point if we are at the cap."""
+        point = (position, value, timestamp)
+        self._sorted = None
+        if self._max_points:
+            self._append_ring(point)
+            return
+        if self._count == self._data.shape[1]:
+            grown = np.empty((3, 2 * self._data.shape[1]))
+            grown[:, : self._count] = self._data
+            self._data = grown
+        self._data[:, self._count] = point
+        self._count += 1
+        # fmin/fmax ignore nan values
+        self._mins = np.fmin(self._mins, point[:2])
+        self._maxs = np.fmax(self._maxs, point[:2])
+
+    def _append_ring(self, point: tuple[float, float, float]) -> None:
+        """Add a point to the capped storage."""
+        cap = self._max_points
+        if self._count < cap:
+            index = self._count
+            self._count += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % cap
+        self._data[:, index] = point
+        self._data[:, index + cap] = point
+
+    def _filled(self) -> np.ndarray:
+        """A view of the filled region of every column, oldest point first."""
+        return self._data[:, self._start : self._start + self._count]
+
+    @property
+    def positions(self) -> np.ndarray:
+        """A view of the positions, oldest first. This changes as points are added."""
+        return self._filled()[POSITION]
+
+    @property
+    def values(self) -> np.ndarray:
+        """A view of the values, oldest first. This changes as points are added."""
+        return self._filled()[VALUE]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """A view of the timestamps, oldest first. This changes as points are added."""
+        return self._filled()[TIMESTAMP]
+
+    def nearest(self, position: float) -> int | None:
+        """
+        Return the index of the point whose position is closest to a position.
+
+        The positions are sorted once after they change, then each lookup is a
+        binary search, so repeated lookups, e.g. while moving the mouse, are cheap.
+
+        Returns
+        -------
+        index : int or None
+            An index into positions, values and timestamps, or None if there are no points.
+        """
+        if not self._count:
+            return None
+        if self._sorted is None:
+            order = np.argsort(self.positions, kind="stable")
+            self._sorted = (order, self.positions[order])
+        order, sorted_positions = self._sorted
+        right = int(np.searchsorted(sorted_positions, position))
+        left = max(right - 1, 0)
+        right = min(right, self._count - 1)
+        if abs(sorted_positions[right] - position) < abs(sorted_positions[left] - position):
+            return int(order[right])
+        return int(order[left])
+
+    def bounds(self, column: int) -> tuple[float, float] | None:
+        """
+        Return the smallest and largest positions or values, ignoring nan.
+
+        This is O(1) without a cap and O(max_points) with one.
+
+        Parameters
+        ----------
+        column : int
+            POSITION or VALUE.
+
+        Returns
+        -------
+        bounds : tuple of float or None
+            The min and max, or None if there are no non-nan points.
+        """
+        if self._max_points:
+            data = self._filled()[column]
+            if np.all(np.isnan(data)):
+                return None
+            return float(np.nanmin(data)), float(np.nanmax(data))
+        low, high = self._mins[column], self._maxs[column]
+        if low > high:
+            return None
+        return float(low), float(high)
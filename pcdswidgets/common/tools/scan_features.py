@@ -0,0 +1,244 @@
+"""
+Estimates of the peak or edge in a 1D scan that update with every point.
+
+The running estimates never look at the scan data again. They only keep
+the running max and min, the steepest slope between consecutive points,
+and a few running sums, so each new point costs the same no matter how
+long the scan is:
+
+- peak: the position of the largest value
+- edge: the middle of the steepest step between consecutive points
+- centroid: the mean position, weighted by the values above the lowest value
+- fwhm: the full width at half max of a gaussian with the weighted
+  standard deviation of the positions
+
+The optional fit refines these using a fixed-size sample of the scan.
+Every point is kept until the sample is full, then every other point is
+dropped and only every other new point is kept, and so on. The fit is
+done on demand, at most once per point, and costs the same for any
+scan length:
+
+- gaussian: a parabola fit to the log of the values above the lowest value,
+  weighted to favor the points near the top
+- erf: the same fit to the slope between neighbouring sample points, which
+  is a gaussian for an edge shaped like an error function
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import math
+
+import numpy as np
+
+GAUSSIAN_FWHM = 2 * math.sqrt(2 * math.log(2))
+
+FIT_TYPES = ("none", "gaussian", "erf")
+
+
+@dataclasses.dataclass
+class FitResult:
+    """The parameters of a fitted gaussian peak or error function edge."""
+
+    center: float
+    sigma: float
+    # The height of the peak, or of the step for an edge
+    amplitude: float
+
+    @property
+    def fwhm(self) -> float:
+        """The full width at half max of the peak, or the 12%-88% width of the edge."""
+        return GAUSSIAN_FWHM * self.sigma
+
+
+class ScanFeatures:
+    """
+    Running estimates of the peak or edge in a scan. See the module docstring.
+
+    Parameters
+    ----------
+    fit : str, optional
+        One of FIT_TYPES.
+    fit_points : int, optional
+        The most points to keep for the fit.
+    """
+
+    def __init__(self, fit: str = "none", fit_points: int = 64):
+        self.fit_type = fit
+        self._fit_points = max(int(fit_points), 4)
+        self.reset()
+
+    @property
+    def fit_type(self) -> str:
+        """The kind of fit to do, one of FIT_TYPES."""
+        return self._fit_type
+
+    @fit_type.setter
+    def fit_type(self, fit: str) -> None:
+        if fit not in FIT_TYPES:
+            raise ValueError(f"Invalid fit type {fit!r}, expected one of {', '.join(FIT_TYPES)}")
+        self._fit_type = fit
+        self._fit = None
+        self._fit_done = False
+
+    def reset(self) -> None:
+        """Forget every point."""
+        self.count = 0
+        # Positions are offset by the first one so the sums don't lose precision far from 0
+        self._origin = 0.0
+        # Sums of 1, x, x**2, y, x*y and x**2*y
+        self._sums = np.zeros(6)
+        self._max = (np.nan, -np.inf)
+        self._min = np.inf
+        self._last: tuple[float, float] | None = None
+        self._steepest = (np.nan, 0.0)
+        self._sample = np.empty((2, self._fit_points))
+        self._sample_count = 0
+        self._stride = 1
+        self._skipped = 0
+        self._fit: FitResult | None = None
+        self._fit_done = False
+
+    def add(self, position: float, value: float) -> None:
+        """Update the estimates with a new point. Points with nan values are ignored."""
+        if not (math.isfinite(position) and math.isfinite(value)):
+            return
+        position, value = float(position), float(value)
+        if not self.count:
+            self._origin = position
+        self.count += 1
+        x = position - self._origin
+        self._sums += (1.0, x, x * x, value, x * value, x * x * value)
+        if value > self._max[1]:
+            self._max = (position, value)
+        self._min = min(self._min, value)
+        if self._last is not None:
+            last_position, last_value = self._last
+            if position != last_position:
+                slope = (value - last_value) / (position - last_position)
+                if abs(slope) > abs(self._steepest[1]):
+                    self._steepest = ((position + last_position) / 2, slope)
+        self._last = (position, value)
+        self._add_sample(position, value)
+        self._fit_done = False
+
+    def _add_sample(self, position: float, value: float) -> None:
+        """Keep every stride-th point for the fit, halving the sample when it fills up."""
+        if self._skipped:
+            self._skipped = (self._skipped + 1) % self._stride
+            return
+        if self._sample_count == self._fit_points:
+            kept = self._sample[:, ::2].copy()
+            self._sample_count = kept.shape[1]
+            self._sample[:, : self._sample_count] = kept
+            self._stride *= 2
+        self._sample[:, self._sample_count] = (position, value)
+        self._sample_count += 1
+        self._skipped = 1 % self._stride
+
+    @property
+    def peak(self) -> float | None:
+        """The position of the largest value."""
+        return self._max[0] if self.count else None
+
+    @property
+    def edge(self) -> float | None:
+        """The middle of the steepest step between consecutive points."""
+        return self._steepest[0] if self._steepest[1] else None
+
+    def _moments(self) -> tuple[float, float] | None:
+        """Return the weighted mean and variance of the positions, relative to the origin."""
+        if not self.count:
+            return None
+        n, sx, sxx, sy, sxy, sxxy = self._sums.tolist()
+        baseline = self._min
+        # Weight each point by its value above the lowest value
+        weight = sy - baseline * n
+        if weight <= 0:
+            return None
+        mean = (sxy - baseline * sx) / weight
+        variance = (sxxy - baseline * sxx) / weight - mean * mean
+        return mean, max(variance, 0.0)
+
+    @property
+    def centroid(self) -> float | None:
+        """The mean position, weighted by the values above the lowest value."""
+        moments = self._moments()
+        return None if moments is None else self._origin + moments[0]
+
+    @property
+    def fwhm(self) -> float | None:
+        """The full width at half max, assuming a gaussian peak."""
+        moments = self._moments()
+        return None if moments is None else GAUSSIAN_FWHM * math.sqrt(moments[1])
+
+    @property
+    def fit(self) -> FitResult | None:
+        """The result of the optional fit, or None if there is no fit or it failed."""
+        if not self._fit_done:
+            self._fit = self._do_fit()
+            self._fit_done = True
+        return self._fit
+
+    def _do_fit(self) -> FitResult | None:
+        """Fit the sample according to fit_type."""
+        if self._fit_type == "none" or self._sample_count < 3:
+            return None
+        positions, values = self._sample[:, : self._sample_count]
+        order = np.argsort(positions, kind="stable")
+        positions, values = positions[order], values[order]
+        if self._fit_type == "gaussian":
+            return _fit_gaussian(positions, values - values.min())
+        # The slope of an error function edge is a gaussian
+        keep = np.diff(positions) != 0
+        slopes = np.diff(values)[keep] / np.diff(positions)[keep]
+        if not slopes.size:
+            return None
+        sign = 1.0 if slopes[np.argmax(np.abs(slopes))] > 0 else -1.0
+        midpoints = ((positions[1:] + positions[:-1]) / 2)[keep]
+        result = _fit_gaussian(midpoints, np.clip(sign * slopes, 0, None))
+        if result is not None:
+            # Integrate the fitted slope to get the height of the step
+            result.amplitude *= float(sign * result.sigma * math.sqrt(2 * math.pi))
+        return result
+
+    def targets(self) -> dict[str, float]:
+        """Return the positions of every estimate that is available, by name."""
+        targets = {"peak": self.peak, "centroid": self.centroid, "edge": self.edge}
+        fit = self.fit
+        if fit is not None:
+            targets[f"{self._fit_type} fit"] = fit.center
+        return {name: position for name, position in targets.items() if position is not None}
+
+
+def _fit_gaussian(positions: np.ndarray, heights: np.ndarray) -> FitResult | None:
+    """
+    Fit a gaussian to non-negative heights by fitting a parabola to their log.
+
+    Points below a tenth of the max are left out, because their log is dominated
+    by noise, and the rest are weighted by their heights squared.
+    """
+    if not heights.size or heights.max() <= 0:
+        return None
+    keep = heights > 0.1 * heights.max()
+    if np.count_nonzero(keep) < 3:
+        return None
+    # Center and scale the positions so the fit is well conditioned
+    offset = positions[keep].mean()
+    scale = np.ptp(positions[keep])
+    if scale == 0:
+        return None
+    x = (positions[keep] - offset) / scale
+    try:
+        c2, c1, c0 = np.polyfit(x, np.log(heights[keep]), 2, w=heights[keep])
+    except (np.linalg.LinAlgError, ValueError):
+        return None
+    if not c2 < 0:
+        # Curves up, so this isn't a peak
+        return None
+    center = -c1 / (2 * c2)
+    return FitResult(
+        center=float(offset + scale * center),
+        sigma=float(scale * math.sqrt(-1 / (2 * c2))),
+        amplitude=float(math.exp(c0 - c1 * c1 / (4 * c2))),
+    )
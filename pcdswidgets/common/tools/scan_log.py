@@ -0,0 +1,230 @@
+"""
+Append-only files that keep FeatureFinder scans safe from crashes.
+
+Each scan is written to its own file with one json value per line:
+
+- The first line is the header with the scan parameters: ``{"header": {...}}``
+- Each point is a list: ``[position, value, timestamp]``
+- The last line marks a scan that was finished normally: ``{"end": timestamp}``
+
+A file without an end line is a scan that was interrupted, e.g. by a crash
+or by closing the window, and can be recovered on the next start.
+A partially written last line is ignored when reading.
+
+Points are collected in a list and handed to a background thread in
+batches, which appends them to the file and syncs it to disk.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import json
+import logging
+import os
+import queue
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from qtpy import QtCore
+
+logger = logging.getLogger(__name__)
+
+SCAN_LOG_DIR = Path.home() / ".local" / "share" / "pcdswidgets" / "feature_finder_scans"
+
+
+def scan_log_prefix(motor_pv: str, detector_pv: str) -> str:
+    """Return the file name prefix used for every scan of a motor/detector pair."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{motor_pv}__{detector_pv}")
+
+
+def new_scan_log_path(motor_pv: str, detector_pv: str, directory: Path = SCAN_LOG_DIR) -> Path:
+    """Return a new file name for a scan of a motor/detector pair."""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return Path(directory) / f"{scan_log_prefix(motor_pv, detector_pv)}__{stamp}.jsonl"
+
+
+@dataclasses.dataclass
+class ScanLog:
+    """The contents of a scan file."""
+
+    filename: Path
+    header: dict[str, Any]
+    # One row per point: position, value, timestamp
+    points: np.ndarray
+    complete: bool
+
+
+def read_scan_log(filename: str | Path) -> ScanLog:
+    """
+    Read a scan file, skipping a partially written last line.
+
+    Raises
+    ------
+    OSError
+        If the file can't be read.
+    """
+    header = {}
+    points = []
+    complete = False
+    with open(filename, "r") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            try:
+                value = json.loads(line)
+            except ValueError:
+                logger.debug("Skipping bad scan log line %r", line)
+                continue
+            if isinstance(value, list):
+                points.append(value)
+            elif "header" in value:
+                header = value["header"]
+            elif "end" in value:
+                complete = True
+    return ScanLog(
+        filename=Path(filename),
+        header=header,
+        points=np.array(points, dtype=float).reshape(-1, 3),
+        complete=complete,
+    )
+
+
+def find_incomplete_scan(motor_pv: str, detector_pv: str, directory: Path = SCAN_LOG_DIR) -> ScanLog | None:
+    """Return the most recent interrupted scan of a motor/detector pair, if any."""
+    prefix = scan_log_prefix(motor_pv, detector_pv)
+    for path in sorted(Path(directory).glob(f"{prefix}__*.jsonl"), reverse=True):
+        try:
+            scan = read_scan_log(path)
+        except OSError:
+            continue
+        # Only the newest scan can be resumed, older ones were already superseded
+        return None if scan.complete else scan
+    return None
+
+
+def prune_scan_logs(directory: Path = SCAN_LOG_DIR, keep: int = 100) -> None:
+    """Delete all but the most recent scan files."""
+    paths = sorted(Path(directory).glob("*.jsonl"), key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in paths[keep:]:
+        try:
+            path.unlink()
+        except OSError:
+            logger.debug("Unable to delete old scan log %s", path, exc_info=True)
+
+
+# Keep running writers alive until they finish, even if their recorder is deleted
+_RUNNING_WRITERS: set[ScanLogWriter] = set()
+
+
+class ScanLogWriter(QtCore.QThread):
+    """
+    Thread that appends batches of lines to a scan file and syncs them to disk.
+
+    Parameters
+    ----------
+    filename : str or Path
+        The file to append to. It is created if it doesn't exist.
+    """
+
+    def __init__(self, filename: str | Path):
+        super().__init__()
+        self.filename = Path(filename)
+        self._queue: queue.Queue[list[str] | None] = queue.Queue()
+        _RUNNING_WRITERS.add(self)
+        self.finished.connect(functools.partial(_RUNNING_WRITERS.discard, self))
+
+    def write(self, lines: list[str]) -> None:
+        """Queue lines to be written. This returns immediately."""
+        self._queue.put(lines)
+
+    def stop(self) -> None:
+        """Write everything that is queued and then end the thread."""
+        if self.isRunning():
+            self._queue.put(None)
+            self.wait()
+
+    def run(self):
+        """Write each batch of lines as it arrives."""
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.filename, "a") as f:
+            while True:
+                lines = self._queue.get()
+                if lines is None:
+                    return
+                try:
+                    f.write("".join(lines))
+                    f.flush()
+                    os.fsync(f.fileno())
+                except Exception:
+                    logger.error("Failed to write scan data to %s", self.filename)
+                    logger.debug("Failed to write scan data to %s", self.filename, exc_info=True)
+
+
+class ScanRecorder(QtCore.QObject):
+    """
+    Streams the points of one scan to an append-only file.
+
+    Call record from the GUI thread for every point. Points reach the disk
+    in batches, at most flush_interval_ms after they are recorded.
+
+    Parameters
+    ----------
+    filename : str or Path
+        The scan file. If it already exists, e.g. for a recovered scan,
+        new points are appended to it and the header is not written again.
+    header : dict, optional
+        The scan parameters to write at the start of a new file.
+    flush_interval_ms : int, optional
+        How often to hand the recorded points to the writer thread.
+    """
+
+    def __init__(
+        self,
+        filename: str | Path,
+        header: dict[str, Any] | None = None,
+        flush_interval_ms: int = 500,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.filename = Path(filename)
+        self._pending: list[str] = []
+        if not self.filename.exists():
+            self._pending.append(json.dumps({"header": header or {}}) + "\n")
+        self._writer = ScanLogWriter(self.filename)
+        self._writer.start()
+        # Don't leave the thread running after the widget that owns us is deleted
+        self.destroyed.connect(self._writer.stop)
+        self._timer = QtCore.QTimer(parent=self)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start(flush_interval_ms)
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.close)
+
+    def record(self, position: float, value: float, timestamp: float | None = None) -> None:
+        """Record one scan point."""
+        if timestamp is None:
+            timestamp = time.time()
+        self._pending.append(json.dumps([position, value, timestamp]) + "\n")
+
+    def flush(self) -> None:
+        """Send the recorded points to the writer thread."""
+        if self._pending:
+            self._writer.write(self._pending)
+            self._pending = []
+
+    def finish(self) -> None:
+        """Mark the scan as complete so that it won't be recovered, and stop recording."""
+        self._pending.append(json.dumps({"end": time.time()}) + "\n")
+        self.close()
+
+    def close(self) -> None:
+        """Write everything and stop recording, leaving the scan recoverable."""
+        self._timer.stop()
+        self.flush()
+        self._writer.stop()
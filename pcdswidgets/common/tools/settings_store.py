@@ -0,0 +1,166 @@
+"""
+A json settings file that several widgets and processes can share.
+
+Settings are stored per key, e.g. per motor/detector pair, and each named
+preset is stored under its own key starting with PRESET_PREFIX. Changes are kept in
+memory and written after a short delay, so that a burst of edits costs one
+write. Each write locks the file, re-reads it, and replaces only the keys
+that changed here, so instances don't overwrite each other's settings.
+The new contents are written to a temporary file and renamed into place,
+so readers never see a partially written file.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Iterator
+
+from qtpy import QtCore
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, where we skip locking and rely on merging
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PRESET_PREFIX = "__preset__/"
+
+# Marks a key that should be removed on the next write
+_DELETED = object()
+
+
+class SettingsStore(QtCore.QObject):
+    """
+    Keyed json settings with debounced, merged, atomic writes.
+
+    Parameters
+    ----------
+    filename : str or Path
+        The json file. It is created on the first write.
+    debounce_ms : int, optional
+        How long to wait after the last change before writing.
+    """
+
+    def __init__(self, filename: str | Path, debounce_ms: int = 500, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.filename = Path(filename)
+        self._pending: dict[str, Any] = {}
+        self._cache: dict[str, Any] = {}
+        self._cache_stat: tuple[int, int] | None = None
+        self._timer = QtCore.QTimer(parent=self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.flush)
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the settings for a key, including changes that aren't written yet."""
+        if key in self._pending:
+            value = self._pending[key]
+            return None if value is _DELETED else value
+        return self._read().get(key)
+
+    def _all_keys(self) -> list[str]:
+        """Return every key with settings, including the presets."""
+        keys = dict.fromkeys(self._read())
+        keys.update(dict.fromkeys(self._pending))
+        return [key for key in keys if self.get(key) is not None]
+
+    def keys(self) -> list[str]:
+        """Return every key with settings, excluding the presets."""
+        return [key for key in self._all_keys() if not key.startswith(PRESET_PREFIX)]
+
+    def set(self, key: str, values: dict[str, Any]) -> None:
+        """Replace the settings for a key. They are written after the debounce delay."""
+        self._pending[key] = dict(values)
+        self._timer.start()
+
+    def delete(self, key: str) -> None:
+        """Remove the settings for a key."""
+        self._pending[key] = _DELETED
+        self._timer.start()
+
+    def preset_names(self) -> list[str]:
+        """Return the names of the saved presets."""
+        return sorted(key[len(PRESET_PREFIX) :] for key in self._all_keys() if key.startswith(PRESET_PREFIX))
+
+    def get_preset(self, name: str) -> dict[str, Any] | None:
+        """Return the settings saved as a named preset, or None."""
+        return self.get(PRESET_PREFIX + name)
+
+    def save_preset(self, name: str, values: dict[str, Any]) -> None:
+        """Save settings as a named preset, replacing any preset with the same name."""
+        self.set(PRESET_PREFIX + name, values)
+
+    def delete_preset(self, name: str) -> None:
+        """Remove a named preset."""
+        self.delete(PRESET_PREFIX + name)
+
+    def flush(self) -> None:
+        """
+        Write the pending changes now, merged with the current contents of the file.
+
+        Errors are logged rather than raised, and the changes are kept for the next try.
+        """
+        self._timer.stop()
+        if not self._pending:
+            return
+        try:
+            self.filename.parent.mkdir(parents=True, exist_ok=True)
+            with self._locked():
+                contents = self._read()
+                for key, value in self._pending.items():
+                    if value is _DELETED:
+                        contents.pop(key, None)
+                    else:
+                        contents[key] = value
+                tmp_path = self.filename.with_name(f"{self.filename.name}.{os.getpid()}.tmp")
+                with open(tmp_path, "w") as f:
+                    json.dump(contents, f, indent=2)
+                os.replace(tmp_path, self.filename)
+                stat = os.stat(self.filename)
+                self._cache = contents
+                self._cache_stat = (stat.st_mtime_ns, stat.st_size)
+        except Exception as e:
+            logger.warning(f"Failed to save settings to {self.filename}: {e}")
+            return
+        self._pending = {}
+        logger.debug(f"Settings saved to {self.filename}")
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold an exclusive lock on the settings file, so other processes wait to write."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.filename.with_name(f"{self.filename.name}.lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> dict[str, Any]:
+        """Return the contents of the file, only reading it again if it changed."""
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return {}
+        file_stat = (stat.st_mtime_ns, stat.st_size)
+        if file_stat != self._cache_stat:
+            try:
+                with open(self.filename, "r") as f:
+                    self._cache = json.load(f)
+            except Exception as e:
+                logger.warning(f"Failed to read settings from {self.filename}: {e}")
+                return {}
+            self._cache_stat = file_stat
+        return dict(self._cache)
@@ -0,0 +1,171 @@
+"""Channel access writes that don't block the GUI thread."""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import logging
+import queue
+import time
+from typing import Any, Callable
+
+from epics import ca, caput
+from qtpy.QtCore import QCoreApplication, QObject, QThread, Signal
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class WriteRequest:
+    """
+    One queued write and its outcome.
+
+    Times are from time.monotonic. The status is the return value of
+    epics.caput: 1 for success, None if the PV didn't connect in time,
+    or a negative number if the put failed.
+    """
+
+    pvname: str
+    value: Any
+    timeout: float
+    callback: Callable[[WriteRequest], None] | None = None
+    queued: float = dataclasses.field(default_factory=time.monotonic)
+    started: float | None = None
+    finished: float | None = None
+    status: int | None = None
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        """True if the write was sent successfully."""
+        return self.status == 1 and not self.error
+
+    @property
+    def latency(self) -> float | None:
+        """The seconds from queueing the write until it was sent, if it finished."""
+        if self.finished is None:
+            return None
+        return self.finished - self.queued
+
+
+# Keep running threads alive until they finish, even if their queue is deleted
+_RUNNING_WORKERS: set[_PVWriteWorker] = set()
+
+
+class _PVWriteWorker(QThread):
+    """Thread that sends queued writes one at a time, in order."""
+
+    write_done = Signal(object)
+
+    def __init__(self):
+        super().__init__()
+        self._queue: queue.Queue[WriteRequest | None] = queue.Queue()
+        _RUNNING_WORKERS.add(self)
+        self.finished.connect(functools.partial(_RUNNING_WORKERS.discard, self))
+
+    def put(self, request: WriteRequest) -> None:
+        self._queue.put(request)
+
+    def stop(self) -> None:
+        """Send everything that is queued and then end the thread."""
+        if self.isRunning():
+            self._queue.put(None)
+            self.wait()
+
+    def run(self):
+        ca.use_initial_context()
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            request.started = time.monotonic()
+            try:
+                request.status = caput(request.pvname, request.value, wait=False, connection_timeout=request.timeout)
+            except Exception as exc:
+                request.error = str(exc) or type(exc).__name__
+            else:
+                if request.status is None:
+                    request.error = f"Timed out after {request.timeout} s connecting to {request.pvname}"
+                elif request.status != 1:
+                    request.error = f"Put to {request.pvname} failed with status {request.status}"
+            request.finished = time.monotonic()
+            self.write_done.emit(request)
+
+
+class PVWriteQueue(QObject):
+    """
+    Sends channel access writes from a background thread, in the order they were queued.
+
+    Completion callbacks are run and write_finished is emitted in the thread
+    that owns the queue, normally the GUI thread, so they can safely update widgets.
+    Failed writes are logged as errors.
+
+    Parameters
+    ----------
+    timeout : float, optional
+        The default number of seconds to wait for a PV to connect.
+    """
+
+    write_finished = Signal(object)
+
+    def __init__(self, timeout: float = 5.0, parent: QObject | None = None):
+        super().__init__(parent)
+        self.timeout = timeout
+        self._worker = _PVWriteWorker()
+        self._worker.write_done.connect(self._write_done)
+        self._worker.start()
+        # Don't leave the thread running after the widget that owns us is deleted
+        self.destroyed.connect(self._worker.stop)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def put(
+        self,
+        pvname: str,
+        value: Any,
+        callback: Callable[[WriteRequest], None] | None = None,
+        timeout: float | None = None,
+    ) -> WriteRequest:
+        """
+        Queue a write. This returns immediately.
+
+        Parameters
+        ----------
+        pvname : str
+            The PV to write to, without a protocol prefix.
+        value : any
+            The value to write.
+        callback : callable, optional
+            Called with the finished WriteRequest, whether or not it succeeded.
+        timeout : float, optional
+            The seconds to wait for the PV to connect, instead of the queue's default.
+
+        Returns
+        -------
+        request : WriteRequest
+            The request, which is filled in when the write finishes.
+        """
+        request = WriteRequest(
+            pvname=pvname,
+            value=value,
+            timeout=self.timeout if timeout is None else timeout,
+            callback=callback,
+        )
+        self._worker.put(request)
+        return request
+
+    def stop(self) -> None:
+        """Send the queued writes and stop the background thread."""
+        self._worker.stop()
+
+    def _write_done(self, request: WriteRequest) -> None:
+        """Report a finished write in our own thread."""
+        if not request.ok:
+            logger.error(f"Failed to write {request.value} to {request.pvname}: {request.error}")
+        if request.callback is not None:
+            try:
+                request.callback(request)
+            except Exception:
+                logger.exception(f"Error in write callback for {request.pvname}")
+        self.write_finished.emit(request)
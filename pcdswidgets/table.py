@@ -1,18 +1,33 @@
 from __future__ import annotations
 
+import collections
+import csv
 import dataclasses
 import functools
+import heapq
+import itertools
 import json
 import logging
+import math
+import numbers
+import os
+import time
 from typing import Any, Callable
 
+import numpy as np
 from pydm.utilities import is_qt_designer
 from pydm.widgets import PyDMEmbeddedDisplay
 from pydm.widgets.channel import PyDMChannel
 from qtpy import QtCore, QtGui, QtWidgets
 
+from .table_aggregate import GroupAggregator, GroupSummary
+from .table_expression import FilterExpression, FilterExpressionError
+
 logger = logging.getLogger(__name__)
 
+# Item data role that is updated when a channel connects or disconnects
+CONNECTED_ROLE = QtCore.Qt.UserRole + 1
+
 
 class FilterSortWidgetTable(QtWidgets.QTableWidget):
     """
@@ -27,12 +42,37 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
         "is_container": False,
     }
 
+    # Emitted with (rows added, total rows) as rows are added incrementally
+    population_progress = QtCore.Signal(int, int)
+    # Emitted when incremental row population is done
+    population_finished = QtCore.Signal()
+    # Emitted with the filename when a snapshot export is written
+    export_finished = QtCore.Signal(str)
+    # Emitted when the group aggregates change after the last summary refresh
+    groups_changed = QtCore.Signal()
+
     # Public instance variables
     template_widget: PyDMEmbeddedDisplay
 
     # Private instance variables
     _ui_filename: str | None
     _macros_filename: str | None
+    _column_config_filename: str | None
+    _column_config: dict[str, ColumnConfig]
+    _default_column_config: ColumnConfig
+    _coalescer: UpdateCoalescer
+    _columns: ColumnStore
+    _row_order: np.ndarray | None
+    _macros_loader: MacrosLoader | None
+    _pending_macros: collections.deque[dict[str, str]]
+    _populate_timer: QtCore.QTimer
+    _populate_chunk_size: int
+    _last_sort: tuple[str, bool] | None
+    _suspend_hidden_rows: bool
+    _snapshot_writers: set[SnapshotWriter]
+    _group_by_header: str
+    _aggregator: GroupAggregator | None
+    _group_summary: GroupSummaryTable | None
     _macros: list[dict[str, str]]
     _channel_headers: list[str]
     _macro_headers: list[str]
@@ -42,6 +82,7 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
     _initial_sort_header: str
     _initial_sort_ascend: bool
     _hide_headers: list[str]
+    _filter_expressions: list[str]
     _configurable: bool
     _watching_cells: bool
 
@@ -49,6 +90,24 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
         super().__init__(*args, **kwargs)
         self._ui_filename = None
         self._macros_filename = None
+        self._column_config_filename = None
+        self._column_config = {}
+        self._default_column_config = ColumnConfig()
+        self._coalescer = UpdateCoalescer(parent=self)
+        self._columns = ColumnStore()
+        self._row_order = None
+        self._macros_loader = None
+        self._pending_macros = collections.deque()
+        self._populate_timer = QtCore.QTimer(parent=self)
+        self._populate_timer.setInterval(0)
+        self._populate_timer.timeout.connect(self._populate_chunk)
+        self._populate_chunk_size = 50
+        self._last_sort = None
+        self._suspend_hidden_rows = False
+        self._snapshot_writers = set()
+        self._group_by_header = ""
+        self._aggregator = None
+        self._group_summary = None
         self.template_widget = PyDMEmbeddedDisplay(parent=self)
         self.template_widget.hide()
         self.template_widget.loadWhenShown = False
@@ -61,6 +120,7 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
         self._initial_sort_header = "index"
         self._initial_sort_ascend = True
         self._hide_headers = []
+        self._filter_expressions = []
 
         # Table settings
         self.setShowGrid(True)
@@ -72,6 +132,10 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
         self.configurable = False
 
         self._watching_cells = False
+        # Sorting or adding rows changes which row id is in each row
+        model = self.model()
+        for signal in (model.layoutChanged, model.rowsInserted, model.rowsRemoved, model.rowsMoved, model.modelReset):
+            signal.connect(self._forget_row_order)
 
     def channels(self) -> list[PyDMChannel]:
         """
@@ -124,8 +188,13 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
         Json file defining PyDM macros. Optional.
 
         This follows the same format as used for the PyDM Template Repeater.
+        JSON Lines files (.jsonl, one dict per line) and CSV files (.csv,
+        with a header row of macro names) are also supported.
         If omitted, you should pass in macros using the set_macros method
         instead.
+
+        The file is read in a background thread and the rows are added
+        incrementally, see populate_chunk_size.
         """
         return self._macros_filename
 
@@ -136,19 +205,180 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
 
     def reload_macros_file(self) -> None:
         """
-        Load the macros_filename and call set_macros.
+        Load the macros_filename in a background thread and call set_macros.
         """
         if not self.macros_filename:
             return
+        loader = MacrosLoader(filename=self.macros_filename, parent=self)
+        loader.macros_loaded.connect(self._macros_file_loaded)
+        loader.finished.connect(loader.deleteLater)
+        self._macros_loader = loader
+        loader.start()
+
+    def _macros_file_loaded(self, filename: str, macros: list[dict[str, str]]) -> None:
+        """
+        Slot for the MacrosLoader, populate the table with the new macros.
+        """
+        if filename != self.macros_filename:
+            # Stale result from a previous macros_filename
+            return
+        self.set_macros(macros, incremental=True)
+
+    @QtCore.Property(int)
+    def populate_chunk_size(self) -> int:
+        """
+        Maximum number of rows to add per event loop iteration.
+
+        When rows are added incrementally, e.g. from the macros_filename,
+        we add at most this many rows at a time so that the display stays
+        responsive while a large table fills in.
+        """
+        return self._populate_chunk_size
+
+    @populate_chunk_size.setter
+    def populate_chunk_size(self, size: int):
+        self._populate_chunk_size = max(1, size)
+
+    @QtCore.Property(str)
+    def column_config_filename(self) -> str:
+        """
+        Json file defining per-column channel update settings. Optional.
+
+        This is a mapping from channel header to settings, for example
+        ``{"readback": {"deadband": 0.01, "max_update_rate": 2.0}}``.
+        See set_column_config for the meaning of each setting.
+        Columns that are not included use default_deadband and
+        default_max_update_rate.
+        """
+        return self._column_config_filename
+
+    @column_config_filename.setter
+    def column_config_filename(self, filename: str):
+        self._column_config_filename = filename
+        self.reload_column_config_file()
+
+    def reload_column_config_file(self) -> None:
+        """
+        Load the column_config_filename and call set_column_config for each column.
+        """
+        if not self.column_config_filename:
+            return
         try:
-            with open(self.macros_filename) as fd:
-                macros = json.load(fd)
-            self.set_macros(macros)
+            with open(self.column_config_filename) as fd:
+                config = json.load(fd)
+            for header, settings in config.items():
+                self.set_column_config(header, **settings)
         except Exception:
-            logger.exception("")
+            logger.exception("Loading the column config file %s failed", self.column_config_filename)
             return
 
-    def set_macros(self, macros_list: list[dict[str, str]]) -> None:
+    @QtCore.Property(float)
+    def default_deadband(self) -> float:
+        """
+        Deadband to use for channel columns without their own setting.
+
+        Value updates smaller than this are not shown in the table.
+        """
+        return self._default_column_config.deadband
+
+    @default_deadband.setter
+    def default_deadband(self, deadband: float):
+        self._default_column_config.deadband = deadband
+        self.apply_column_config()
+
+    @QtCore.Property(float)
+    def default_max_update_rate(self) -> float:
+        """
+        Maximum updates per second for channel columns without their own setting.
+
+        Faster updates are coalesced so that only the latest value is shown.
+        Zero, the default, means no limit.
+        """
+        return self._default_column_config.max_update_rate
+
+    @default_max_update_rate.setter
+    def default_max_update_rate(self, rate: float):
+        self._default_column_config.max_update_rate = rate
+        self.apply_column_config()
+
+    def set_column_config(
+        self,
+        header: str,
+        deadband: float | None = None,
+        max_update_rate: float | None = None,
+    ) -> None:
+        """
+        Change the update settings for one channel column.
+
+        Parameters
+        ----------
+        header : str
+            The name of the channel widget in the template.
+        deadband : float, optional
+            Only update the cell if the value changes by more than this.
+            If omitted, keep the current setting.
+        max_update_rate : float, optional
+            Maximum number of times per second to update each cell in this
+            column. Faster updates are coalesced so that the latest value
+            is shown at most once per interval. Zero means no limit.
+            If omitted, keep the current setting.
+        """
+        config = self._column_config.setdefault(header, dataclasses.replace(self._default_column_config))
+        if deadband is not None:
+            config.deadband = float(deadband)
+        if max_update_rate is not None:
+            config.max_update_rate = float(max_update_rate)
+        self.apply_column_config()
+
+    def get_column_config(self, header: str) -> ColumnConfig:
+        """
+        Return the update settings in use for one channel column.
+        """
+        return self._column_config.get(header, self._default_column_config)
+
+    def apply_column_config(self) -> None:
+        """
+        Push the current column update settings to the existing channel cells.
+        """
+        for header in self._channel_headers:
+            col = self._header_map.get(header)
+            if col is None:
+                continue
+            config = self.get_column_config(header)
+            for row in range(self.rowCount()):
+                item = self.item(row, col)
+                if item is not None:
+                    item.deadband = config.deadband
+                    item.max_update_rate = config.max_update_rate
+
+    def get_update_counts(self) -> dict[str, tuple[int, int]]:
+        """
+        Count the channel value updates for each channel column.
+
+        Returns
+        -------
+        counts : dict
+            A mapping from channel header to a tuple of the number of
+            updates received from the channel and the number of updates
+            that were applied to the table, summed over all rows.
+            The difference is the updates skipped by the deadband or
+            coalesced by the rate limit.
+        """
+        counts = {}
+        for header in self._channel_headers:
+            col = self._header_map.get(header)
+            if col is None:
+                continue
+            received = 0
+            applied = 0
+            for row in range(self.rowCount()):
+                item = self.item(row, col)
+                received += item.updates_received
+                applied += item.updates_applied
+            counts[header] = (received, applied)
+        return counts
+
+    def set_macros(self, macros_list: list[dict[str, str]], incremental: bool = False) -> None:
         """
         Change the PyDM macros we use to load the table widgets.
 
@@ -160,25 +390,43 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
             A list where each element is a dictionary that defines the macros
             to pass in to one instance of the repeated widget. All dicts must
             have the same keys or this will not work properly.
+        incremental : bool, optional
+            If True, return immediately and add the rows populate_chunk_size
+            at a time from the event loop. Defaults to False.
         """
         self._macros = macros_list
         self._macro_headers = list(self._macros[0].keys()) if self._macros else []
-        self.reinit_table()
+        self.reinit_table(incremental=incremental)
 
-    def reinit_table(self) -> None:
+    def reinit_table(self, incremental: bool = False) -> None:
         """
         Rebuild the table based on the ui_filename and the newest macros.
+
+        Parameters
+        ----------
+        incremental : bool, optional
+            If True, return immediately and add the rows populate_chunk_size
+            at a time from the event loop. Filters and the most recent sort
+            are applied to each chunk as it is added, and population_progress
+            is emitted after each chunk. Defaults to False.
         """
+        self._populate_timer.stop()
+        self._pending_macros.clear()
         if self._watching_cells:
             self.cellChanged.disconnect(self.handle_item_changed)
             self._watching_cells = False
         for channel in self._channels:
             channel.disconnect()
         self._channels = []
+        self._coalescer.clear()
+        self._columns.clear()
         self.clear()
         self.clearContents()
         self.setRowCount(0)
         self._header_map = {}
+        if self._group_by_header:
+            self._aggregator = GroupAggregator(value_headers=self._channel_headers, on_change=self.groups_changed.emit)
+            self.groups_changed.emit()
         if not self._macros and self._channel_headers:
             return
         # Column 1 displays widget, 2 is index, the rest hold values
@@ -186,12 +434,44 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
         self.setColumnCount(ncols)
         for col in range(1, ncols):
             self.hideColumn(col)
-        for macros in self._macros:
-            self.add_row(macros)
+        if incremental:
+            self._pending_macros.extend(self._macros)
+        else:
+            for macros in self._macros:
+                self.add_row(macros)
 
         self._watching_cells = True
         self.cellChanged.connect(self.handle_item_changed)
+        self.check_filter_expressions()
         self.update_all_filters()
+        if incremental:
+            self._populate_timer.start()
+
+    def _populate_chunk(self) -> None:
+        """
+        Add the next chunk of pending rows to the table.
+        """
+        # Don't let qt move rows around while we're adding them
+        sorting = self.isSortingEnabled()
+        self.setSortingEnabled(False)
+        first_new_row = self.rowCount()
+        for _ in range(min(self.populate_chunk_size, len(self._pending_macros))):
+            self.add_row(self._pending_macros.popleft())
+        for row in range(first_new_row, self.rowCount()):
+            self.update_filter(row)
+        self.setSortingEnabled(sorting)
+        if self._last_sort is not None and not sorting:
+            self.sort_table(*self._last_sort)
+        self.population_progress.emit(self.rowCount(), len(self._macros))
+        if not self._pending_macros:
+            self._populate_timer.stop()
+            self.population_finished.emit()
+
+    def is_populating(self) -> bool:
+        """
+        Return True if rows are still being added incrementally.
+        """
+        return bool(self._pending_macros)
 
     def add_row(self, macros: dict[str, str]) -> None:
         """
@@ -216,6 +496,7 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
         self.add_context_menu_to_children(widget.embedded_widget)
 
         row_position = self.rowCount()
+        row_id = self._columns.add_row()
         self.insertRow(row_position)
 
         # Put the widget into the table
@@ -226,7 +507,9 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
         # Put the index into the table
         item = ChannelTableWidgetItem(
             header="index",
-            default=row_position,
+            default=row_id,
+            store=self._columns,
+            row_id=row_id,
         )
         self.setItem(row_position, 1, item)
         self._header_map["index"] = 1
@@ -236,6 +519,8 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
             item = ChannelTableWidgetItem(
                 header=key,
                 default=value,
+                store=self._columns,
+                row_id=row_id,
             )
             self.setItem(row_position, index, item)
             self._header_map[key] = index
@@ -243,15 +528,23 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
         # Set up the data columns and the channels
         for header in self._channel_headers:
             source = widget.findChild(QtCore.QObject, header)
+            config = self.get_column_config(header)
             item = ChannelTableWidgetItem(
                 header=header,
                 channel=source.channel,
+                deadband=config.deadband,
+                max_update_rate=config.max_update_rate,
+                coalescer=self._coalescer,
+                store=self._columns,
+                row_id=row_id,
             )
             self.setItem(row_position, index, item)
             self._header_map[header] = index
             if item.pydm_channel is not None:
                 self._channels.append(item.pydm_channel)
             index += 1
+        if self._aggregator is not None:
+            self._aggregate_row(row_position)
 
     def add_context_menu_to_children(self, widget: QtWidgets.QWidget) -> None:
         """
@@ -276,6 +569,10 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
         active_sort_action.setCheckable(True)
         active_sort_action.setChecked(self.isSortingEnabled())
         active_sort_action.toggled.connect(self.setSortingEnabled)
+        suspend_action = menu.addAction("Pause Hidden Rows")
+        suspend_action.setCheckable(True)
+        suspend_action.setChecked(self.suspend_hidden_rows)
+        suspend_action.toggled.connect(self.request_suspend_hidden_rows)
         sort_menu = menu.addMenu("Sorting")
         for header_name in self._header_map.keys():
             if header_name == "widget":
@@ -310,6 +607,15 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
                     filter_name=filter_name,
                 )
             )
+        if self.group_by_header:
+            summary_action = menu.addAction("Group Summary")
+            summary_action.triggered.connect(self.show_group_summary)
+        export_action = menu.addAction("Export Snapshot...")
+        export_action.triggered.connect(self.request_export_snapshot)
+        counts_menu = menu.addMenu("Update Counts")
+        for header, (received, applied) in self.get_update_counts().items():
+            counts_action = counts_menu.addAction(f"{header}: {applied} applied / {received} received")
+            counts_action.setEnabled(False)
         menu.exec_(QtGui.QCursor.pos())
 
     def get_row_values(self, row: int) -> dict[str, Any]:
@@ -337,6 +643,93 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
                 values["connected"] = False
         return values
 
+    def get_column_values(self) -> dict[str, np.ndarray]:
+        """
+        Get the current values for every row of the table, one array per column.
+
+        This is the columnar counterpart to get_row_values, used to evaluate
+        filter expressions on all rows at once. The cells keep their values
+        in a ColumnStore as they change, so this only needs to put the
+        stored arrays in the current row order.
+
+        Returns
+        -------
+        columns : dict
+            A mapping from str to a numpy array with one element per row,
+            in the current row order. Columns that hold only integers are
+            int arrays, columns that hold only numbers are float arrays,
+            columns that hold only strings are str arrays, and all other
+            columns are object arrays.
+            The special 'connected' column is True for each row where all
+            channels are connected.
+        """
+        return self._columns.get_columns(self._get_row_order())
+
+    def _get_row_order(self) -> np.ndarray:
+        """
+        Return the row id in each row of the table, from the top.
+
+        This is only looked up again after the rows were sorted or changed.
+        """
+        if self._row_order is None or len(self._row_order) != self.rowCount():
+            nrows = self.rowCount()
+            self._row_order = np.fromiter((self._row_id(row) for row in range(nrows)), dtype=np.intp, count=nrows)
+        return self._row_order
+
+    def _forget_row_order(self, *args) -> None:
+        self._row_order = None
+
+    def export_snapshot(self, filename: str, fmt: str | None = None) -> SnapshotWriter:
+        """
+        Write the current values of the whole table to a file.
+
+        The values are copied from the table in one columnar snapshot,
+        as in get_column_values, and the file is written from a background
+        thread so that the table keeps updating. export_finished is emitted
+        when the file is done.
+
+        Parameters
+        ----------
+        filename : str
+            The path to write to.
+        fmt : str, optional
+            One of "csv", "jsonl", or "parquet". If omitted, this is picked
+            from the filename's extension. Parquet requires pyarrow.
+
+        Returns
+        -------
+        writer : SnapshotWriter
+            The thread that is writing the file.
+        """
+        if fmt is None:
+            fmt = os.path.splitext(filename)[1].lstrip(".").lower()
+        if fmt not in SNAPSHOT_FORMATS:
+            raise ValueError(f"Unsupported snapshot format {fmt!r}, expected one of {', '.join(SNAPSHOT_FORMATS)}")
+        writer = SnapshotWriter(filename=filename, columns=self.get_column_values(), fmt=fmt, parent=self)
+        writer.snapshot_written.connect(self.export_finished)
+        writer.finished.connect(functools.partial(self._snapshot_writers.discard, writer))
+        writer.finished.connect(writer.deleteLater)
+        self._snapshot_writers.add(writer)
+        writer.start()
+        return writer
+
+    def request_export_snapshot(self, *args) -> None:
+        """
+        Ask the user for a filename and export a snapshot of the table there.
+        """
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self,
+            "Export Snapshot",
+            "",
+            "CSV (*.csv);;JSON Lines (*.jsonl);;Parquet (*.parquet)",
+        )
+        if not filename:
+            return
+        try:
+            self.export_snapshot(filename)
+        except Exception as exc:
+            logger.error("Failed to export table snapshot: %s", exc)
+
     def add_filter(self, filter_name: str, filter_func: Callable[[dict[str, Any]], bool], active: bool = True) -> None:
         """
         Add a new visibility filter to the table.
@@ -368,6 +761,87 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
         )
         self.update_all_filters()
 
+    def add_filter_expression(self, filter_name: str, expression: str, active: bool = True) -> None:
+        """
+        Add a new visibility filter to the table from a filter expression.
+
+        Expressions are written in a small subset of python, for example
+        ``readback >= 0 and row_name != ""``, where names refer to the same
+        headers as the keys from get_row_values. See
+        :mod:`pcdswidgets.table_expression` for the supported syntax.
+
+        Unlike filters added with add_filter, expression filters are
+        evaluated on all rows at once when the whole table is refreshed.
+
+        Parameters
+        ----------
+        filter_name : str
+            A name assigned to the filter to help us keep track of it.
+        expression : str
+            The filter expression. Rows are shown when this is True.
+        active : bool, optional.
+            True if we want the filter to start as active. Defaults to True.
+
+        Raises
+        ------
+        FilterExpressionError
+            If the expression cannot be parsed.
+        """
+        compiled = FilterExpression(expression)
+        self._filters[filter_name] = FilterInfo(
+            filter_func=compiled.evaluate_row,
+            active=active,
+            name=filter_name,
+            expression=compiled,
+        )
+        self.check_filter_expressions()
+        self.update_all_filters()
+
+    @QtCore.Property("QStringList")
+    def filter_expressions(self) -> list[str]:
+        """
+        Filter expressions to apply to the table, one filter per entry.
+
+        Each expression is added as an active filter named after its text.
+        Expressions that fail to parse are reported in the log and skipped.
+        See add_filter_expression for details.
+        """
+        return self._filter_expressions
+
+    @filter_expressions.setter
+    def filter_expressions(self, expressions: list[str]):
+        for expression in self._filter_expressions:
+            self._filters.pop(expression, None)
+        self._filter_expressions = []
+        for expression in expressions:
+            if not expression.strip():
+                continue
+            try:
+                self.add_filter_expression(expression, expression)
+            except FilterExpressionError as exc:
+                logger.error("%s", exc)
+                continue
+            self._filter_expressions.append(expression)
+        self.update_all_filters()
+
+    def check_filter_expressions(self) -> None:
+        """
+        Warn about filter expressions that use names that aren't table headers.
+        """
+        if not self._header_map:
+            return
+        headers = set(self._header_map) | {"connected"}
+        for filt_info in self._filters.values():
+            if filt_info.expression is None:
+                continue
+            unknown = filt_info.expression.names - headers
+            if unknown:
+                logger.warning(
+                    "Filter expression %r uses unknown headers %s",
+                    filt_info.expression.text,
+                    ", ".join(sorted(unknown)),
+                )
+
     def remove_filter(self, filter_name: str) -> None:
         """
         Remove a specific named visibility filter from the table.
@@ -380,21 +854,73 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
             A name assigned to the filter to help us keep track of it.
         """
         del self._filters[filter_name]
+        if self._aggregator is not None:
+            self._aggregator.forget_filter(filter_name)
         self.update_all_filters()
 
     def clear_filters(self) -> None:
         """
         Remove all visbility filters from the table.
         """
+        if self._aggregator is not None:
+            for filter_name in self._filters:
+                self._aggregator.forget_filter(filter_name)
         self._filters = {}
         self.update_all_filters()
 
     def update_all_filters(self) -> None:
         """
         Apply all filters to all rows of the table.
+
+        Expression filters are evaluated on all rows at once using
+        get_column_values, and filter functions are called once per row.
         """
-        for row in range(self.rowCount()):
-            self.update_filter(row)
+        nrows = self.rowCount()
+        show = np.ones(nrows, dtype=bool)
+        columns = None
+        row_values = None
+        for filt_info in self._filters.values():
+            if not filt_info.active:
+                continue
+            if filt_info.expression is not None:
+                if columns is None:
+                    columns = self.get_column_values()
+                results = filt_info.expression.evaluate_columns(columns, nrows)
+            else:
+                if row_values is None:
+                    row_values = [self.get_row_values(row) for row in range(nrows)]
+                # Rows that are already hidden only matter for the group counts
+                rows = range(nrows) if self._aggregator is not None else np.flatnonzero(show)
+                results = np.zeros(nrows, dtype=bool)
+                for row in rows:
+                    results[row] = self._apply_filter(filt_info, row_values[row])
+            show &= results
+            self._record_filter_results(filt_info.name, results)
+        for row in range(nrows):
+            self.set_row_shown(row, bool(show[row]))
+
+    def _record_filter_results(self, filter_name: str, results: np.ndarray) -> None:
+        """
+        Pass the per-row results of one filter to the group aggregates.
+        """
+        if self._aggregator is None:
+            return
+        for row in range(len(results)):
+            self._aggregator.update_filter(self._row_id(row), filter_name, bool(results[row]))
+
+    def _apply_filter(self, filt_info: FilterInfo, values: dict[str, Any]) -> bool:
+        """
+        Run one filter on one row's values, treating errors as "show".
+        """
+        try:
+            return bool(filt_info.filter_func(values))
+        except Exception:
+            logger.debug(
+                "Error in filter function %s",
+                filt_info.name,
+                exc_info=True,
+            )
+            return True
 
     def update_filter(self, row: int) -> None:
         """
@@ -410,25 +936,67 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
             show_row = []
             for filt_info in self._filters.values():
                 if filt_info.active:
-                    try:
-                        should_show = filt_info.filter_func(values)
-                    except Exception:
-                        logger.debug(
-                            "Error in filter function %s",
-                            filt_info.name,
-                            exc_info=True,
-                        )
-                        should_show = True
-                    show_row.append(should_show)
+                    passed = self._apply_filter(filt_info, values)
+                    show_row.append(passed)
+                    if self._aggregator is not None:
+                        self._aggregator.update_filter(self._row_id(row), filt_info.name, passed)
                 else:
                     # If inactive, record it as unfiltered/shown
                     show_row.append(True)
-            if all(show_row):
-                self.showRow(row)
-            else:
-                self.hideRow(row)
+            self.set_row_shown(row, all(show_row))
         else:
-            self.showRow(row)
+            self.set_row_shown(row, True)
+
+    def set_row_shown(self, row: int, shown: bool) -> None:
+        """
+        Show or hide one row of the table as the result of filtering.
+
+        If suspend_hidden_rows is set, this also disconnects the channels
+        of a hidden row's embedded widget, and reconnects them when the row
+        is shown again. The row's value cells stay connected so that
+        filtering and sorting keep working.
+
+        Parameters
+        ----------
+        row : int
+            The row index to change. 0 is the current top row.
+        shown : bool
+            True to show the row, False to hide it.
+        """
+        self.setRowHidden(row, not shown)
+        if not self._suspend_hidden_rows:
+            return
+        widget = self.cellWidget(row, 0)
+        if widget is None:
+            return
+        if shown:
+            widget.connect()
+        else:
+            widget.disconnect()
+
+    @QtCore.Property(bool)
+    def suspend_hidden_rows(self) -> bool:
+        """
+        Whether to pause the embedded widgets of rows hidden by filters.
+
+        If True, rows hidden by filters disconnect the channels of their
+        embedded widget until they are shown again, so a heavily filtered
+        table costs about as much as its visible rows. The value cells used
+        for filtering and sorting stay connected either way.
+        """
+        return self._suspend_hidden_rows
+
+    @suspend_hidden_rows.setter
+    def suspend_hidden_rows(self, suspend: bool):
+        self._suspend_hidden_rows = suspend
+        for row in range(self.rowCount()):
+            widget = self.cellWidget(row, 0)
+            if widget is None:
+                continue
+            if suspend and self.isRowHidden(row):
+                widget.disconnect()
+            else:
+                widget.connect()
 
     def activate_filter(self, active: bool, filter_name: str) -> None:
         """
@@ -444,16 +1012,98 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
             to the table.
         """
         self._filters[filter_name].active = active
+        if not active and self._aggregator is not None:
+            self._aggregator.forget_filter(filter_name)
         self.update_all_filters()
 
     def handle_item_changed(self, row: int, col: int) -> None:
         """
         Slot that is run when any element in the table changes.
 
-        Currently, this updates the filters for the row that changed.
+        This updates the group aggregates for the cell that changed,
+        and the filters for the row that changed.
         """
+        if self._aggregator is not None:
+            item = self.item(row, col)
+            if item is not None:
+                row_id = self._row_id(row)
+                self._aggregator.update_value(row_id, item.header, item.get_value())
+                self._aggregator.update_connected(row_id, item.header, item.connected)
         self.update_filter(row)
 
+    def _row_id(self, row: int) -> int:
+        """
+        Return the original index of a row, which doesn't change when sorting.
+        """
+        return self.item(row, self._header_map["index"]).get_value()
+
+    @QtCore.Property(str)
+    def group_by_header(self) -> str:
+        """
+        Macro header to group rows by for the group summary. Optional.
+
+        If set, we keep running aggregates for each group of rows that share
+        the same value for this header: the number of connected rows,
+        the min/max/mean of each numeric channel column, and the number
+        of rows that pass each active filter. These are updated as cells
+        change and can be shown with show_group_summary or from the
+        context menu.
+        """
+        return self._group_by_header
+
+    @group_by_header.setter
+    def group_by_header(self, header: str):
+        self._group_by_header = header
+        if not header:
+            self._aggregator = None
+            self.groups_changed.emit()
+            return
+        self._aggregator = GroupAggregator(value_headers=self._channel_headers, on_change=self.groups_changed.emit)
+        for row in range(self.rowCount()):
+            self._aggregate_row(row)
+        self.update_all_filters()
+
+    def _aggregate_row(self, row: int) -> None:
+        """
+        Add the current contents of one row to the group aggregates.
+        """
+        values = {}
+        connected = {}
+        for col in range(1, self.columnCount()):
+            item = self.item(row, col)
+            if item is None:
+                continue
+            values[item.header] = item.get_value()
+            connected[item.header] = item.connected
+        self._aggregator.add_row(
+            row_id=self._row_id(row),
+            group=str(values.get(self._group_by_header)),
+            values=values,
+            connected=connected,
+        )
+
+    def get_group_summaries(self) -> list[GroupSummary]:
+        """
+        Return the current aggregates for each group of rows.
+
+        This is empty unless group_by_header is set.
+        """
+        if self._aggregator is None:
+            return []
+        return [self._aggregator.summary(group) for group in self._aggregator.groups()]
+
+    def show_group_summary(self, *args) -> GroupSummaryTable:
+        """
+        Open a window with one aggregate row per group.
+        """
+        if self._group_summary is None:
+            self._group_summary = GroupSummaryTable(source=self)
+            self._group_summary.setWindowTitle(f"Group Summary by {self.group_by_header}")
+        self._group_summary.refresh(force=True)
+        self._group_summary.show()
+        self._group_summary.raise_()
+        return self._group_summary
+
     @QtCore.Property(str)
     def initial_sort_header(self) -> str:
         """
@@ -521,6 +1171,7 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
             If True, we'll sort in ascending order. If False, we'll sort in
             descending order.
         """
+        self._last_sort = (header, ascending)
         self.reset_manual_sort()
         if ascending:
             order = QtCore.Qt.AscendingOrder
@@ -574,6 +1225,13 @@ class FilterSortWidgetTable(QtWidgets.QTableWidget):
         """
         self.configurable = conf
 
+    @QtCore.Slot(bool)
+    def request_suspend_hidden_rows(self, suspend: bool):
+        """
+        Designable slot for toggling suspend_hidden_rows.
+        """
+        self.suspend_hidden_rows = suspend
+
 
 class ChannelTableWidgetItem(QtWidgets.QTableWidgetItem):
     """
@@ -590,12 +1248,28 @@ class ChannelTableWidgetItem(QtWidgets.QTableWidgetItem):
     deadband : float, optional
         Only update the table if the change is more than the deadband.
         This can help make large tables less resource-hungry.
+    max_update_rate : float, optional
+        Only update the table this many times per second.
+        Faster updates are held back and only the latest one is shown.
+        Zero, the default, means no limit. This requires a coalescer.
+    coalescer : UpdateCoalescer, optional
+        Shared helper that applies held back updates when they are due.
+    store : ColumnStore, optional
+        Where to keep the shown value and connection state for the whole table.
+    row_id : int, optional
+        The row's original index, which identifies the row in the store.
     """
 
     header: str
     channel: str | None
     deadband: float
+    max_update_rate: float
+    coalescer: UpdateCoalescer | None
+    store: ColumnStore | None
+    row_id: int
     pydm_channel: PyDMChannel | None
+    updates_received: int
+    updates_applied: int
 
     def __init__(
         self,
@@ -603,13 +1277,29 @@ class ChannelTableWidgetItem(QtWidgets.QTableWidgetItem):
         default: Any | None = None,
         channel: str | None = None,
         deadband: float = 0.0,
+        max_update_rate: float = 0.0,
+        coalescer: UpdateCoalescer | None = None,
+        store: ColumnStore | None = None,
+        row_id: int = 0,
         parent: QtWidgets.QWidget | None = None,
     ):
         super().__init__(parent)
         self.header = header
-        self.update_value(default)
         self.channel = channel
         self.deadband = deadband
+        self.max_update_rate = max_update_rate
+        self.coalescer = coalescer
+        self.store = store
+        self.row_id = row_id
+        self.updates_received = 0
+        self.updates_applied = 0
+        self._last_applied = 0.0
+        self._pending = False
+        self._pending_value = None
+        self._value = default
+        if store is not None:
+            store.set_value(row_id, header, default)
+        self.setText(str(default))
         if channel is None:
             self.update_connection(True)
             self.pydm_channel = None
@@ -622,11 +1312,39 @@ class ChannelTableWidgetItem(QtWidgets.QTableWidgetItem):
             )
             self.pydm_channel.connect()
 
-    def update_value(self, value: Any) -> str:
+    def update_value(self, value: Any) -> None:
         """
         Store the value for sorting and display in the table if visible.
 
         By setting the text, we also notify the table that a cell has updated.
+        If we're updating faster than max_update_rate, hold the value back
+        and let the coalescer apply the latest value when it is due.
+        """
+        self.updates_received += 1
+        if self.max_update_rate > 0 and self.coalescer is not None:
+            due = self._last_applied + 1 / self.max_update_rate
+            if self._pending or time.monotonic() < due:
+                self._pending_value = value
+                if not self._pending:
+                    self._pending = True
+                    self.coalescer.defer(self, due)
+                return
+        self._apply_value(value)
+
+    def apply_pending(self) -> None:
+        """
+        Apply the latest held back value. Called by the coalescer.
+        """
+        if not self._pending:
+            return
+        self._pending = False
+        value = self._pending_value
+        self._pending_value = None
+        self._apply_value(value)
+
+    def _apply_value(self, value: Any) -> None:
+        """
+        Show a value in the table unless it is inside the deadband.
         """
         try:
             if abs(self._value - value) < self.deadband:
@@ -634,13 +1352,22 @@ class ChannelTableWidgetItem(QtWidgets.QTableWidgetItem):
         except Exception:
             pass
         self._value = value
+        if self.store is not None:
+            self.store.set_value(self.row_id, self.header, value)
+        self._last_applied = time.monotonic()
+        self.updates_applied += 1
         self.setText(str(value))
 
     def update_connection(self, connected: bool) -> None:
         """
         When our PV connects or disconnects, store the state as an attribute.
+
+        The state is also stored as item data so that the table is notified.
         """
         self.connected = connected
+        if self.store is not None:
+            self.store.set_connected(self.row_id, self.header, connected)
+        self.setData(CONNECTED_ROLE, connected)
 
     def get_value(self) -> Any:
         return self._value
@@ -667,8 +1394,424 @@ class ChannelTableWidgetItem(QtWidgets.QTableWidgetItem):
         return self.get_value() < other.get_value()
 
 
+class GroupSummaryTable(QtWidgets.QTableWidget):
+    """
+    Shows one row of aggregates per group of a FilterSortWidgetTable.
+
+    The aggregates are kept up to date by the source table, this widget
+    only redraws the groups that changed. Refreshes are started by the
+    source's groups_changed signal and happen at most once per refresh
+    interval. While hidden, nothing is redrawn until the widget is shown again.
+
+    Parameters
+    ----------
+    source : FilterSortWidgetTable
+        The table to summarize. Its group_by_header must be set.
+    interval_ms : int, optional
+        The shortest time between refreshes. Defaults to 500.
+    """
+
+    def __init__(
+        self,
+        source: FilterSortWidgetTable,
+        interval_ms: int = 500,
+        parent: QtWidgets.QWidget | None = None,
+    ):
+        super().__init__(parent)
+        self.source = source
+        self._groups: list[str] = []
+        self._headers: list[str] = []
+        self._aggregator: GroupAggregator | None = None
+        self.setEditTriggers(self.NoEditTriggers)
+        self.verticalHeader().hide()
+        self._timer = QtCore.QTimer(parent=self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._refresh_if_visible)
+        source.groups_changed.connect(self.schedule_refresh)
+
+    def schedule_refresh(self) -> None:
+        """
+        Refresh once the interval is up, unless the widget is hidden.
+        """
+        if self.isVisible() and not self._timer.isActive():
+            self._timer.start()
+
+    def showEvent(self, event: QtGui.QShowEvent) -> None:
+        """
+        Catch up on the changes made while the widget was hidden.
+        """
+        super().showEvent(event)
+        self.refresh()
+
+    def _refresh_if_visible(self) -> None:
+        if self.isVisible():
+            self.refresh()
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Redraw the groups that changed since the last refresh.
+        """
+        aggregator = self.source._aggregator
+        # The source makes a new aggregator when its rows are rebuilt
+        force = force or aggregator is not self._aggregator
+        self._aggregator = aggregator
+        if aggregator is None:
+            self.setRowCount(0)
+            self._groups = []
+            return
+        changed = aggregator.pop_changed()
+        if not (changed or force):
+            return
+        groups = aggregator.groups()
+        filter_names = [name for name, info in self.source._filters.items() if info.active]
+        headers = ["group", "rows", "connected"]
+        for header in aggregator.value_headers:
+            headers += [f"{header} min", f"{header} max", f"{header} mean"]
+        headers += [f"{name} count" for name in filter_names]
+        if force or groups != self._groups or headers != self._headers:
+            self._groups = groups
+            self._headers = headers
+            self.setColumnCount(len(headers))
+            self.setHorizontalHeaderLabels(headers)
+            self.setRowCount(len(groups))
+            changed = set(groups)
+        for row, group in enumerate(groups):
+            if group not in changed:
+                continue
+            summary = aggregator.summary(group)
+            cells = [summary.group, summary.rows, summary.connected]
+            for header in aggregator.value_headers:
+                column = summary.columns[header]
+                cells += [column.min, column.max, column.mean]
+            cells += [summary.filters.get(name, 0) for name in filter_names]
+            for col, value in enumerate(cells):
+                text = "" if value is None else f"{value:.6g}" if isinstance(value, float) else str(value)
+                self.setItem(row, col, QtWidgets.QTableWidgetItem(text))
+
+
+SNAPSHOT_FORMATS = ("csv", "jsonl", "parquet")
+
+
+class SnapshotWriter(QtCore.QThread):
+    """
+    Thread for writing a table snapshot to a file in the background.
+
+    Emits snapshot_written with the filename when done.
+    Errors are logged and nothing is emitted.
+    """
+
+    snapshot_written = QtCore.Signal(str)
+
+    def __init__(
+        self,
+        filename: str,
+        columns: dict[str, np.ndarray],
+        fmt: str,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.filename = filename
+        self.columns = columns
+        self.fmt = fmt
+
+    def run(self):
+        try:
+            write_snapshot(self.filename, self.columns, self.fmt)
+        except Exception:
+            logger.exception("Writing the table snapshot %s failed", self.filename)
+            return
+        self.snapshot_written.emit(self.filename)
+
+
+def write_snapshot(filename: str, columns: dict[str, np.ndarray], fmt: str) -> None:
+    """
+    Write columns of table values to a file.
+
+    Parameters
+    ----------
+    filename : str
+        The path to write to.
+    columns : dict
+        Mapping from header to one array of values per column,
+        as returned by FilterSortWidgetTable.get_column_values.
+    fmt : str
+        One of "csv", "jsonl", or "parquet".
+    """
+    headers = list(columns)
+    values = [columns[header].tolist() for header in headers]
+    if fmt == "csv":
+        with open(filename, "w", newline="") as fd:
+            writer = csv.writer(fd)
+            writer.writerow(headers)
+            writer.writerows(zip(*values, strict=True))
+    elif fmt == "jsonl":
+        with open(filename, "w") as fd:
+            for row in zip(*values, strict=True):
+                fd.write(json.dumps(dict(zip(headers, row, strict=True)), default=_json_default))
+                fd.write("\n")
+    elif fmt == "parquet":
+        # Embed optional dependency imports in function call
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as exc:
+            raise RuntimeError("Sorry, pyarrow is required for parquet export.") from exc
+
+        arrays = []
+        for column in values:
+            try:
+                arrays.append(pyarrow.array(column))
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+                arrays.append(pyarrow.array([None if value is None else str(value) for value in column]))
+        pyarrow.parquet.write_table(pyarrow.table(arrays, names=headers), filename)
+    else:
+        raise ValueError(f"Unsupported snapshot format {fmt!r}")
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Serialize array and numpy values that json can't handle directly.
+    """
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+class MacrosLoader(QtCore.QThread):
+    """
+    Thread for reading a macros file in the background.
+
+    Emits macros_loaded with the filename and the list of macro dicts
+    when done. Errors are logged and nothing is emitted.
+    """
+
+    macros_loaded = QtCore.Signal(str, object)
+
+    def __init__(self, filename: str, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.filename = filename
+
+    def run(self):
+        try:
+            macros = load_macros_file(self.filename)
+        except Exception:
+            logger.exception("Loading the macros file %s failed", self.filename)
+            return
+        self.macros_loaded.emit(self.filename, macros)
+
+
+def load_macros_file(filename: str) -> list[dict[str, str]]:
+    """
+    Read a list of macro dicts from a file.
+
+    The format is chosen by file extension:
+
+    - .jsonl or .ndjson: one json dict per line, blank lines are skipped.
+    - .csv: a header row of macro names, then one row of values per entry.
+    - anything else: a json list of dicts, as in the PyDM Template Repeater.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the macros file.
+
+    Returns
+    -------
+    macros : list of dict
+        One dict of macros per table row.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    with open(filename, newline="") as fd:
+        if extension in (".jsonl", ".ndjson"):
+            return [json.loads(line) for line in fd if line.strip()]
+        if extension == ".csv":
+            return [dict(row) for row in csv.DictReader(fd)]
+        return json.load(fd)
+
+
+class UpdateCoalescer(QtCore.QObject):
+    """
+    Applies rate-limited ChannelTableWidgetItem updates when they are due.
+
+    Items that receive values faster than their max_update_rate register
+    here once, and a single timer applies the latest value of every due
+    item, so each cell updates at most once per interval no matter how
+    quickly its channel changes.
+    """
+
+    def __init__(self, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        # A heap of (due, order, item), the order breaks ties since items don't compare.
+        # Items only defer again after they were applied, so each is in here at most once.
+        self._deferred: list[tuple[float, int, ChannelTableWidgetItem]] = []
+        self._order = itertools.count()
+        self._deadline = math.inf
+        self._timer = QtCore.QTimer(parent=self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def defer(self, item: ChannelTableWidgetItem, due: float) -> None:
+        """
+        Schedule an item to apply its pending value at the monotonic time "due".
+        """
+        heapq.heappush(self._deferred, (due, next(self._order), item))
+        # The timer only needs to move if this item is due before everything else
+        if due < self._deadline:
+            self._schedule()
+
+    def flush(self) -> None:
+        """
+        Apply the pending values for all items that are due.
+        """
+        now = time.monotonic()
+        while self._deferred and self._deferred[0][0] <= now:
+            _, _, item = heapq.heappop(self._deferred)
+            item.apply_pending()
+        self._schedule()
+
+    def clear(self) -> None:
+        """
+        Forget all pending items, for example when the table is rebuilt.
+        """
+        self._deferred = []
+        self._deadline = math.inf
+        self._timer.stop()
+
+    def _schedule(self) -> None:
+        """
+        Start the timer for the next item that will be due.
+        """
+        if not self._deferred:
+            self._deadline = math.inf
+            self._timer.stop()
+            return
+        self._deadline = self._deferred[0][0]
+        wait = self._deadline - time.monotonic()
+        self._timer.start(max(0, int(wait * 1000)))
+
+
+@dataclasses.dataclass
+class ColumnConfig:
+    deadband: float = 0.0
+    max_update_rate: float = 0.0
+
+
 @dataclasses.dataclass
 class FilterInfo:
     filter_func: Callable[[dict[str, Any]], bool]
     active: bool
     name: str
+    expression: FilterExpression | None = None
+
+
+# The kinds of value that decide the dtype of a column, see ColumnStore.get_columns
+_BOOL, _INT, _REAL, _STR, _OTHER = range(5)
+
+
+def _value_kind(value: Any) -> int:
+    if isinstance(value, bool):
+        return _BOOL
+    if isinstance(value, numbers.Integral):
+        return _INT
+    if isinstance(value, numbers.Real):
+        return _REAL
+    if isinstance(value, str):
+        return _STR
+    return _OTHER
+
+
+class ColumnStore:
+    """
+    The value and connection state of every table cell, one array per column.
+
+    ChannelTableWidgetItem writes here whenever it shows a new value, so the
+    whole table is available as numpy arrays without visiting every cell.
+    Rows are stored by row id, the original row index, which doesn't change
+    when the table is sorted. For each column we also count how many values
+    are of each kind, so picking the column's dtype doesn't need to look at
+    the values.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every row."""
+        self.size = 0
+        self._values: dict[str, np.ndarray] = {}
+        self._kinds: dict[str, np.ndarray] = {}
+        self._kind_counts: dict[str, list[int]] = {}
+        self._connected: dict[str, np.ndarray] = {}
+        # The number of disconnected cells in each row
+        self._disconnected = np.zeros(16, dtype=int)
+
+    def add_row(self) -> int:
+        """Make room for a new row of empty cells and return its row id."""
+        row_id = self.size
+        if row_id == len(self._disconnected):
+            self._grow(2 * row_id)
+        self.size += 1
+        for counts in self._kind_counts.values():
+            counts[_OTHER] += 1
+        return row_id
+
+    def _grow(self, capacity: int) -> None:
+        """Make the arrays longer, filling the new rows with empty cells."""
+        extra = capacity - len(self._disconnected)
+        self._disconnected = np.concatenate([self._disconnected, np.zeros(extra, dtype=int)])
+        for header in self._values:
+            self._values[header] = np.concatenate([self._values[header], np.full(extra, None, dtype=object)])
+            self._kinds[header] = np.concatenate([self._kinds[header], np.full(extra, _OTHER, dtype=np.int8)])
+            self._connected[header] = np.concatenate([self._connected[header], np.ones(extra, dtype=bool)])
+
+    def _add_column(self, header: str) -> None:
+        capacity = len(self._disconnected)
+        self._values[header] = np.full(capacity, None, dtype=object)
+        self._kinds[header] = np.full(capacity, _OTHER, dtype=np.int8)
+        self._kind_counts[header] = [0, 0, 0, 0, self.size]
+        self._connected[header] = np.ones(capacity, dtype=bool)
+
+    def set_value(self, row_id: int, header: str, value: Any) -> None:
+        """Record the value shown in one cell."""
+        if header not in self._values:
+            self._add_column(header)
+        kind = _value_kind(value)
+        kinds = self._kinds[header]
+        counts = self._kind_counts[header]
+        counts[kinds[row_id]] -= 1
+        counts[kind] += 1
+        kinds[row_id] = kind
+        self._values[header][row_id] = value
+
+    def set_connected(self, row_id: int, header: str, connected: bool) -> None:
+        """Record the connection state of one cell."""
+        if header not in self._values:
+            self._add_column(header)
+        column = self._connected[header]
+        if column[row_id] != connected:
+            column[row_id] = connected
+            self._disconnected[row_id] += -1 if connected else 1
+
+    def get_columns(self, order: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Return every column, and the special 'connected' column, with the rows in the given order.
+
+        See FilterSortWidgetTable.get_column_values.
+        """
+        nrows = len(order)
+        columns = {}
+        for header, values in self._values.items():
+            values = values[order]
+            bools, ints, reals, strs, _ = self._kind_counts[header]
+            if nrows and bools + ints == nrows:
+                # As np.asarray would, e.g. bool only if there are no other integers
+                columns[header] = np.asarray(values.tolist())
+            elif nrows and bools + ints + reals == nrows:
+                columns[header] = values.astype(float)
+            elif nrows and strs == nrows:
+                columns[header] = values.astype(str)
+            else:
+                columns[header] = values
+        columns["connected"] = self._disconnected[order] == 0
+        return columns
@@ -0,0 +1,284 @@
+"""
+Incremental per-group aggregation for the FilterSortWidgetTable.
+
+Rows are grouped by the value of one macro header, e.g. "area".
+For each group we keep running statistics that are updated in constant
+time when a single table cell changes, rather than rescanning the table:
+
+- The number of rows and the number of fully connected rows.
+- Count, sum, min, and max of every numeric value column.
+- The number of rows passing each filter.
+
+Min and max are only recomputed from the group's rows when the current
+extreme value is replaced by a less extreme one.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import numbers
+from typing import Any, Callable, Hashable
+
+
+def is_numeric(value: Any) -> bool:
+    """Return True for values that can be included in min/max/mean."""
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+class RunningStats:
+    """
+    Count, sum, min, and max of the numeric values in one column of one group.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self._min = None
+        self._max = None
+        self._stale = False
+
+    def add(self, value: Any) -> None:
+        """Include a new value."""
+        if not is_numeric(value):
+            return
+        self.count += 1
+        self.total += value
+        if self._stale:
+            return
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+
+    def remove(self, value: Any) -> None:
+        """Exclude a value that was previously added."""
+        if not is_numeric(value):
+            return
+        self.count -= 1
+        self.total -= value
+        if self.count == 0:
+            self.total = 0.0
+            self._min = None
+            self._max = None
+            self._stale = False
+        elif value == self._min or value == self._max:
+            self._stale = True
+
+    @property
+    def mean(self) -> float | None:
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    @property
+    def stale(self) -> bool:
+        """True if min and max must be recomputed with refresh_extremes."""
+        return self._stale
+
+    def refresh_extremes(self, values: list[Any]) -> None:
+        """Recompute min and max from all current values in the group."""
+        numeric = [value for value in values if is_numeric(value)]
+        self._min = min(numeric, default=None)
+        self._max = max(numeric, default=None)
+        self._stale = False
+
+    @property
+    def min(self) -> Any:
+        return self._min
+
+    @property
+    def max(self) -> Any:
+        return self._max
+
+
+@dataclasses.dataclass
+class ColumnSummary:
+    count: int
+    min: Any
+    max: Any
+    mean: float | None
+
+
+@dataclasses.dataclass
+class GroupSummary:
+    group: str
+    rows: int
+    connected: int
+    columns: dict[str, ColumnSummary]
+    filters: dict[str, int]
+
+
+@dataclasses.dataclass
+class _RowState:
+    group: str
+    values: dict[str, Any]
+    disconnected: set[str]
+    filters: dict[str, bool]
+
+
+class _GroupState:
+    def __init__(self):
+        self.rows: set[Hashable] = set()
+        self.connected = 0
+        self.stats: dict[str, RunningStats] = {}
+        self.filters: dict[str, int] = {}
+
+
+class GroupAggregator:
+    """
+    Keeps per-group aggregates of table rows up to date incrementally.
+
+    Parameters
+    ----------
+    value_headers : list of str
+        The headers of the columns to compute statistics for.
+    on_change : callable, optional
+        Called with no arguments when a group changes for the first time
+        since the last pop_changed, so readers can wait for this instead
+        of polling.
+    """
+
+    def __init__(self, value_headers: list[str], on_change: Callable[[], None] | None = None):
+        self.value_headers = list(value_headers)
+        self.on_change = on_change
+        self._rows: dict[Hashable, _RowState] = {}
+        self._groups: dict[str, _GroupState] = {}
+        self._changed: set[str] = set()
+
+    def add_row(self, row_id: Hashable, group: str, values: dict[str, Any], connected: dict[str, bool]) -> None:
+        """
+        Include a new row.
+
+        Parameters
+        ----------
+        row_id : hashable
+            A key that identifies the row for later updates.
+        group : str
+            The group the row belongs to.
+        values : dict
+            Mapping from header to the row's current value.
+        connected : dict
+            Mapping from header to the connection state of that cell.
+        """
+        if row_id in self._rows:
+            self.remove_row(row_id)
+        state = _RowState(
+            group=group,
+            values={header: values.get(header) for header in self.value_headers},
+            disconnected={header for header, conn in connected.items() if not conn},
+            filters={},
+        )
+        self._rows[row_id] = state
+        group_state = self._groups.setdefault(group, _GroupState())
+        group_state.rows.add(row_id)
+        if not state.disconnected:
+            group_state.connected += 1
+        for header, value in state.values.items():
+            group_state.stats.setdefault(header, RunningStats()).add(value)
+        self._mark_changed(group)
+
+    def remove_row(self, row_id: Hashable) -> None:
+        """Exclude a row that was previously added."""
+        state = self._rows.pop(row_id)
+        group_state = self._groups[state.group]
+        group_state.rows.discard(row_id)
+        if not state.disconnected:
+            group_state.connected -= 1
+        for header, value in state.values.items():
+            group_state.stats[header].remove(value)
+        for name, passed in state.filters.items():
+            if passed:
+                group_state.filters[name] -= 1
+        if not group_state.rows:
+            del self._groups[state.group]
+        self._mark_changed(state.group)
+
+    def clear(self) -> None:
+        """Exclude all rows."""
+        for group in self._groups:
+            self._mark_changed(group)
+        self._rows = {}
+        self._groups = {}
+
+    def update_value(self, row_id: Hashable, header: str, value: Any) -> None:
+        """Record a new value for one cell."""
+        state = self._rows.get(row_id)
+        if state is None or header not in state.values:
+            return
+        old = state.values[header]
+        if old is value or old == value:
+            return
+        stats = self._groups[state.group].stats[header]
+        stats.remove(old)
+        stats.add(value)
+        state.values[header] = value
+        self._mark_changed(state.group)
+
+    def update_connected(self, row_id: Hashable, header: str, connected: bool) -> None:
+        """Record a new connection state for one cell."""
+        state = self._rows.get(row_id)
+        if state is None:
+            return
+        was_connected = not state.disconnected
+        if connected:
+            state.disconnected.discard(header)
+        else:
+            state.disconnected.add(header)
+        is_connected = not state.disconnected
+        if was_connected != is_connected:
+            self._groups[state.group].connected += 1 if is_connected else -1
+            self._mark_changed(state.group)
+
+    def update_filter(self, row_id: Hashable, filter_name: str, passed: bool) -> None:
+        """Record whether one row passes one filter."""
+        state = self._rows.get(row_id)
+        if state is None:
+            return
+        old = state.filters.get(filter_name)
+        if old == passed:
+            return
+        state.filters[filter_name] = passed
+        counts = self._groups[state.group].filters
+        counts[filter_name] = counts.get(filter_name, 0) + int(passed) - int(bool(old))
+        self._mark_changed(state.group)
+
+    def forget_filter(self, filter_name: str) -> None:
+        """Stop counting a filter, e.g. because it was removed or deactivated."""
+        for state in self._rows.values():
+            state.filters.pop(filter_name, None)
+        for group, group_state in self._groups.items():
+            if group_state.filters.pop(filter_name, None) is not None:
+                self._mark_changed(group)
+
+    def _mark_changed(self, group: str) -> None:
+        """Remember that a group changed, and notify on_change if it is the first."""
+        notify = not self._changed
+        self._changed.add(group)
+        if notify and self.on_change is not None:
+            self.on_change()
+
+    def groups(self) -> list[str]:
+        """Return the group names, sorted."""
+        return sorted(self._groups)
+
+    def pop_changed(self) -> set[str]:
+        """Return and reset the set of groups that changed since the last call."""
+        changed = self._changed
+        self._changed = set()
+        return changed
+
+    def summary(self, group: str) -> GroupSummary:
+        """Return the current aggregates for one group."""
+        group_state = self._groups[group]
+        columns = {}
+        for header, stats in group_state.stats.items():
+            if stats.stale:
+                stats.refresh_extremes([self._rows[row_id].values[header] for row_id in group_state.rows])
+            columns[header] = ColumnSummary(count=stats.count, min=stats.min, max=stats.max, mean=stats.mean)
+        return GroupSummary(
+            group=group,
+            rows=len(group_state.rows),
+            connected=group_state.connected,
+            columns=columns,
+            filters=dict(group_state.filters),
+        )
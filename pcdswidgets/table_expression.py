@@ -0,0 +1,269 @@
+"""
+Small filter expression language for the FilterSortWidgetTable.
+
+Expressions use a restricted subset of python syntax, for example::
+
+    readback >= 0 and row_name != ""
+    state in ("IN", "OUT") or not connected
+
+Names refer to the table's value headers: "index", the macro keys,
+the channel widget names, and the special "connected" name.
+
+Expressions are compiled once into a predicate that can either be
+evaluated per row, on a dict of values from ``get_row_values``,
+or all at once on a dict of numpy columns from ``get_column_values``.
+"""
+
+from __future__ import annotations
+
+import ast
+import logging
+import operator
+from typing import Any, Callable, Mapping
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Compiled node: takes a mapping of name to value or column, returns a value or column
+_Evaluator = Callable[[Mapping[str, Any]], Any]
+
+
+class FilterExpressionError(ValueError):
+    """Raised when a filter expression cannot be parsed or compiled."""
+
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+}
+
+_COMPARE_OPS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+
+class FilterExpression:
+    """
+    A compiled filter expression.
+
+    Parameters
+    ----------
+    text : str
+        The expression source text.
+
+    Raises
+    ------
+    FilterExpressionError
+        If the text is not a valid filter expression.
+    """
+
+    text: str
+    names: frozenset[str]
+
+    def __init__(self, text: str):
+        self.text = text
+        try:
+            tree = ast.parse(text.strip(), mode="eval")
+        except SyntaxError as exc:
+            raise FilterExpressionError(f"Invalid filter expression {text!r}: {exc.msg}") from exc
+        names = set()
+        self._row_func = _compile(tree.body, vectorized=False, names=names, text=text)
+        self._column_func = _compile(tree.body, vectorized=True, names=set(), text=text)
+        self.names = frozenset(names)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.text!r})"
+
+    def evaluate_row(self, values: Mapping[str, Any]) -> bool:
+        """
+        Evaluate the expression for a single row.
+
+        Parameters
+        ----------
+        values : dict
+            Mapping from header to value, as returned by get_row_values.
+
+        Returns
+        -------
+        show : bool
+            True if the row passes the filter.
+        """
+        return bool(self._row_func(values))
+
+    def evaluate_columns(self, columns: Mapping[str, np.ndarray], nrows: int) -> np.ndarray:
+        """
+        Evaluate the expression for every row at once.
+
+        This uses vectorized numpy operations over the columns.
+        If that is not possible, for example because a column mixes
+        numbers with None, we fall back to evaluating each row separately.
+        Rows where evaluation fails are treated as shown.
+
+        Parameters
+        ----------
+        columns : dict
+            Mapping from header to a numpy array with one element per row,
+            as returned by get_column_values.
+        nrows : int
+            The number of rows in the table.
+
+        Returns
+        -------
+        show : np.ndarray
+            Boolean array, True for each row that passes the filter.
+        """
+        if nrows == 0:
+            return np.ones(0, dtype=bool)
+        try:
+            result = np.asarray(self._column_func(columns), dtype=bool)
+            return np.broadcast_to(result, (nrows,)).copy()
+        except Exception:
+            logger.debug("Falling back to row-by-row evaluation for %r", self.text, exc_info=True)
+        show = np.ones(nrows, dtype=bool)
+        for row in range(nrows):
+            values = {key: column[row] for key, column in columns.items()}
+            try:
+                show[row] = self.evaluate_row(values)
+            except Exception:
+                logger.debug("Error in filter expression %r for row %d", self.text, row, exc_info=True)
+        return show
+
+
+def _compile(node: ast.AST, vectorized: bool, names: set[str], text: str) -> _Evaluator:
+    """Recursively convert an expression ast node into nested closures."""
+    try:
+        compiler = _COMPILERS[type(node)]
+    except KeyError:
+        raise FilterExpressionError(f"Unsupported syntax {type(node).__name__} in filter expression {text!r}") from None
+    return compiler(node, vectorized, names, text)
+
+
+def _compile_constant(node: ast.Constant, vectorized: bool, names: set[str], text: str) -> _Evaluator:
+    if not isinstance(node.value, (str, int, float, bool, type(None))):
+        raise FilterExpressionError(f"Unsupported constant {node.value!r} in filter expression {text!r}")
+    value = node.value
+    return lambda env: value
+
+
+def _compile_name(node: ast.Name, vectorized: bool, names: set[str], text: str) -> _Evaluator:
+    name = node.id
+    names.add(name)
+    return lambda env: env[name]
+
+
+def _compile_sequence(node: ast.Tuple | ast.List, vectorized: bool, names: set[str], text: str) -> _Evaluator:
+    items = []
+    for elt in node.elts:
+        if not isinstance(elt, ast.Constant):
+            raise FilterExpressionError(f"Only constants are allowed in sequences in filter expression {text!r}")
+        items.append(elt.value)
+    seq = tuple(items)
+    return lambda env: seq
+
+
+def _compile_bool_op(node: ast.BoolOp, vectorized: bool, names: set[str], text: str) -> _Evaluator:
+    parts = [_compile(value, vectorized, names, text) for value in node.values]
+    is_and = isinstance(node.op, ast.And)
+    if vectorized:
+        reduce = np.logical_and if is_and else np.logical_or
+
+        def bool_op(env):
+            result = np.asarray(parts[0](env), dtype=bool)
+            for part in parts[1:]:
+                result = reduce(result, np.asarray(part(env), dtype=bool))
+            return result
+
+    elif is_and:
+
+        def bool_op(env):
+            return all(part(env) for part in parts)
+
+    else:
+
+        def bool_op(env):
+            return any(part(env) for part in parts)
+
+    return bool_op
+
+
+def _compile_unary_op(node: ast.UnaryOp, vectorized: bool, names: set[str], text: str) -> _Evaluator:
+    operand = _compile(node.operand, vectorized, names, text)
+    if isinstance(node.op, ast.Not):
+        if vectorized:
+            return lambda env: np.logical_not(operand(env))
+        return lambda env: not operand(env)
+    if isinstance(node.op, ast.USub):
+        return lambda env: -operand(env)
+    if isinstance(node.op, ast.UAdd):
+        return lambda env: +operand(env)
+    raise FilterExpressionError(f"Unsupported operator {type(node.op).__name__} in filter expression {text!r}")
+
+
+def _compile_bin_op(node: ast.BinOp, vectorized: bool, names: set[str], text: str) -> _Evaluator:
+    try:
+        binary = _BINARY_OPS[type(node.op)]
+    except KeyError:
+        raise FilterExpressionError(
+            f"Unsupported operator {type(node.op).__name__} in filter expression {text!r}"
+        ) from None
+    left = _compile(node.left, vectorized, names, text)
+    right = _compile(node.right, vectorized, names, text)
+    return lambda env: binary(left(env), right(env))
+
+
+def _compile_compare(node: ast.Compare, vectorized: bool, names: set[str], text: str) -> _Evaluator:
+    operands = [_compile(node.left, vectorized, names, text)]
+    operands += [_compile(comp, vectorized, names, text) for comp in node.comparators]
+    compares = [_compare_func(op, vectorized, text) for op in node.ops]
+    combine = np.logical_and if vectorized else (lambda left, right: left and right)
+
+    def compare(env):
+        values = [operand(env) for operand in operands]
+        result = compares[0](values[0], values[1])
+        for func, left, right in zip(compares[1:], values[1:-1], values[2:], strict=True):
+            result = combine(result, func(left, right))
+        return result
+
+    return compare
+
+
+_COMPILERS = {
+    ast.Constant: _compile_constant,
+    ast.Name: _compile_name,
+    ast.Tuple: _compile_sequence,
+    ast.List: _compile_sequence,
+    ast.BoolOp: _compile_bool_op,
+    ast.UnaryOp: _compile_unary_op,
+    ast.BinOp: _compile_bin_op,
+    ast.Compare: _compile_compare,
+}
+
+
+def _compare_func(op: ast.cmpop, vectorized: bool, text: str) -> Callable[[Any, Any], Any]:
+    """Pick the comparison function to use for one comparison operator."""
+    if type(op) in _COMPARE_OPS:
+        return _COMPARE_OPS[type(op)]
+    if isinstance(op, (ast.In, ast.NotIn)):
+        negate = isinstance(op, ast.NotIn)
+        if vectorized:
+
+            def contains(left, right):
+                result = np.isin(left, list(right))
+                return np.logical_not(result) if negate else result
+
+        else:
+
+            def contains(left, right):
+                return (left not in right) if negate else (left in right)
+
+        return contains
+    raise FilterExpressionError(f"Unsupported comparison {type(op).__name__} in filter expression {text!r}")
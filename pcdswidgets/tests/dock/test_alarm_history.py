@@ -0,0 +1,51 @@
+import json
+import time
+
+from pytestqt.qtbot import QtBot
+
+from pcdswidgets.common.dock.alarm_history import AlarmHistory, AlarmRecorder
+
+
+def test_alarm_history_roundtrip(qtbot: QtBot, tmp_path):
+    filename = str(tmp_path / "alarms.jsonl")
+    start = time.time() - 100
+    recorder = AlarmRecorder(filename, keyframe_interval=0)
+    recorder.record("dev_a", 0, timestamp=start)
+    recorder.record("dev_b", 4, timestamp=start)
+    recorder.flush()
+    recorder.record("dev_a", 2, timestamp=start + 10)
+    # Repeated levels are not recorded again
+    recorder.record("dev_a", 2, timestamp=start + 11)
+    recorder.record("dev_b", 0, timestamp=start + 20)
+    recorder.stop()
+
+    lines = [json.loads(line) for line in open(filename)]
+    assert [line for line in lines if isinstance(line, list)] == [
+        [round(start, 3), "dev_a", 0],
+        [round(start, 3), "dev_b", 4],
+        [round(start + 10, 3), "dev_a", 2],
+        [round(start + 20, 3), "dev_b", 0],
+    ]
+    assert sum(isinstance(line, dict) for line in lines) == 2
+
+    history = AlarmHistory(filename)
+    assert history.state_at(start - 1) == {}
+    assert history.state_at(start + 5) == {"dev_a": 0, "dev_b": 4}
+    assert history.state_at(start + 15) == {"dev_a": 2, "dev_b": 4}
+    assert history.state_at(start + 25) == {"dev_a": 2, "dev_b": 0}
+    assert history.state_at(time.time() + 1) == {"dev_a": 2, "dev_b": 0}
+    assert history.start_time == round(start, 3)
+
+
+def test_alarm_history_incremental_update(qtbot: QtBot, tmp_path):
+    path = tmp_path / "alarms.jsonl"
+    path.write_text('{"t": 1.0, "keyframe": {"dev": 4}}\n[2.0, "dev", 0]\n[3.0, "dev"')
+    history = AlarmHistory(str(path))
+    assert history.state_at(2.5) == {"dev": 0}
+    assert history.end_time == 2.0
+    # Finish the partially written line
+    with open(path, "a") as f:
+        f.write(', 1]\n{"t": 4.0, "keyframe": {"other": 2}}\n')
+    history.update()
+    assert history.state_at(3.5) == {"dev": 1}
+    assert history.state_at(4.0) == {"other": 2}
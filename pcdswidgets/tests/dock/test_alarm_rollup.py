@@ -0,0 +1,43 @@
+import pytest
+from pytestqt.qtbot import QtBot
+
+from pcdswidgets.common.dock.alarm_rollup import DISCONNECTED, AlarmRollup, format_alarm_counts
+
+
+@pytest.fixture(scope="function")
+def rollup(qtbot: QtBot) -> AlarmRollup:
+    rollup = AlarmRollup(interval_ms=10)
+    for i in range(4):
+        rollup.add_device(f"dev_{i}", groups=("cell", f"row_{i % 2}"), level=0)
+    rollup.flush()
+    return rollup
+
+
+def test_alarm_rollup_counts(rollup: AlarmRollup):
+    assert rollup.counts("cell") == (4, 0, 0, 0, 0)
+    assert rollup.worst("cell") == 0
+    rollup.update_device("dev_1", 2)
+    rollup.update_device("dev_3", DISCONNECTED)
+    assert rollup.counts("cell") == (2, 0, 1, 0, 1)
+    assert rollup.worst("cell") == DISCONNECTED
+    assert rollup.worst("row_1") == DISCONNECTED
+    assert rollup.worst("row_0") == 0
+    rollup.remove_device("dev_3")
+    assert rollup.worst("cell") == 2
+    assert rollup.counts("missing") == (0, 0, 0, 0, 0)
+    assert format_alarm_counts(rollup.counts("cell")) == "NO_ALARM: 2\nMAJOR: 1"
+    rollup.remove_group("row_1")
+    assert rollup.counts("row_1") == (0, 0, 0, 0, 0)
+
+
+def test_alarm_rollup_coalesces(rollup: AlarmRollup, qtbot: QtBot):
+    emitted = []
+    rollup.rollup_changed.connect(emitted.append)
+    for _ in range(100):
+        rollup.update_device("dev_0", 1)
+        rollup.update_device("dev_0", 0)
+    rollup.update_device("dev_2", 1)
+    qtbot.waitUntil(lambda: len(emitted) == 1)
+    qtbot.wait(50)
+    assert emitted == [{"cell", "row_0"}]
+    assert rollup.counts("row_0") == (1, 1, 0, 0, 0)
@@ -0,0 +1,90 @@
+from pytestqt.qtbot import QtBot
+from qtpy.QtCore import Qt
+from qtpy.QtWidgets import QLabel, QTabWidget, QVBoxLayout, QWidget
+
+from pcdswidgets.common.dock.display_cache import DeviceDisplayCache, DisplayPrewarmer
+
+
+def make_display(children: int = 0) -> QWidget:
+    display = QWidget()
+    layout = QVBoxLayout()
+    display.setLayout(layout)
+    for i in range(children):
+        layout.addWidget(QLabel(str(i)))
+    return display
+
+
+def test_display_cache_lru(qtbot: QtBot):
+    cache = DeviceDisplayCache(max_displays=2)
+    displays = {name: make_display() for name in ("a", "b", "c")}
+    cache.add("a", displays["a"], build_time=1.0)
+    cache.add("b", displays["b"], build_time=3.0)
+    assert cache["a"] is displays["a"]
+    cache.add("c", displays["c"])
+    # b is the least recently used
+    assert "b" not in cache
+    assert "a" in cache
+    assert "c" in cache
+    stats = cache.stats()
+    assert (stats["hits"], stats["evictions"], stats["builds"], stats["mean_build_time"]) == (1, 1, 2, 2.0)
+    # Deleted displays are forgotten
+    with qtbot.waitSignal(displays["a"].destroyed):
+        displays["a"].deleteLater()
+    assert "a" not in cache
+    assert len(cache) == 1
+
+
+def test_display_cache_skips_in_use(qtbot: QtBot):
+    cache = DeviceDisplayCache(max_displays=10, max_widgets=10)
+    tabs = QTabWidget()
+    qtbot.addWidget(tabs)
+    in_tab = make_display(5)
+    tabs.addTab(in_tab, "in tab")
+    tabs.addTab(make_display(), "current")
+    tabs.setCurrentIndex(1)
+    cache.add("in_tab", in_tab)
+    cache.add("spare", make_display(5))
+    cache.add("new", make_display(5))
+    assert "in_tab" in cache
+    assert "spare" not in cache
+    assert "new" in cache
+
+
+def test_display_prewarmer(qtbot: QtBot):
+    cache = DeviceDisplayCache(max_displays=2)
+    built = []
+
+    def build(device):
+        built.append(device)
+        cache.add(device, make_display())
+
+    prewarmer = DisplayPrewarmer(build=build, cache=cache, idle_ms=0, cpu_fraction=1)
+    for device in ("a", "b", "c"):
+        prewarmer.enqueue(device)
+    prewarmer.enqueue("urgent", urgent=True)
+    qtbot.waitUntil(lambda: len(built) == 2)
+    qtbot.wait(20)
+    # Stop once the cache is full instead of evicting
+    assert built == ["urgent", "a"]
+    assert prewarmer.pending() == 2
+
+
+def test_display_prewarmer_waits_for_idle(qtbot: QtBot):
+    cache = DeviceDisplayCache()
+    built = []
+
+    def build(device):
+        built.append(device)
+        cache.add(device, make_display())
+
+    widget = QWidget()
+    qtbot.addWidget(widget)
+    prewarmer = DisplayPrewarmer(build=build, cache=cache, idle_ms=100, cpu_fraction=1)
+    # Even urgent devices wait for the user to stop typing
+    prewarmer.enqueue("alarm", urgent=True)
+    for _ in range(4):
+        qtbot.wait(50)
+        qtbot.keyClick(widget, Qt.Key_A)
+    assert built == []
+    qtbot.waitUntil(lambda: built == ["alarm"], timeout=1000)
+    assert not prewarmer._watching_input
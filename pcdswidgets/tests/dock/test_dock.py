@@ -11,6 +11,7 @@ from qtpy.QtGui import QCursor
 from qtpy.QtWidgets import QWidget
 
 import pcdswidgets.common.dock.tab_dock as dock_module
+from pcdswidgets.common.dock.screen_cache import DeferredScreen, screen_cache
 from pcdswidgets.common.dock.tab_dock import TabDock
 
 TESTS_DIR = Path(__file__).parent.resolve()
@@ -269,3 +270,154 @@ def test_multidock(tab_dock: TabDock, qtbot: QtBot):
     tab_dock.reattach_to_dock(widgets[1], tab_dock.tab_widgets[1][1])
     assert widgets[1] not in tab_dock.detached_widgets
     assert tab_dock.tab_widgets[1][1].currentWidget() is widgets[1]
+
+
+def test_hibernate_tabs(tab_dock: TabDock, qtbot: QtBot):
+    built = []
+
+    def make_builder(name: str):
+        def build():
+            widget = QWidget()
+            widget.setWindowTitle(name)
+            built.append(name)
+            return widget
+
+        return build
+
+    tab_widget = tab_dock.tab_widgets[0][0]
+    TabDock.add_to_dock(widget=make_builder("first"), new_tab=True)
+    first = tab_widget.currentWidget()
+    TabDock.add_to_dock(widget=make_builder("second"), new_tab=True)
+    # Tabs added as widgets can't be rebuilt, so they are never hibernated
+    plain = QWidget()
+    qtbot.add_widget(plain)
+    TabDock.add_to_dock(widget=plain, title="plain", new_tab=True)
+    assert built == ["first", "second"]
+
+    tab_dock.set_widget_budget(1)
+    tab_dock.check_hibernation()
+    assert isinstance(tab_widget.widget(0), dock_module.HibernatedTab)
+    assert isinstance(tab_widget.widget(1), dock_module.HibernatedTab)
+    assert tab_widget.widget(2) is plain
+    assert tab_widget.currentIndex() == 2
+    assert tab_widget.tabText(0) == "first"
+    qtbot.waitUntil(lambda: first not in tab_dock._recipes)
+
+    tab_widget.setCurrentIndex(0)
+    assert built == ["first", "second", "first"]
+    assert tab_widget.currentWidget().windowTitle() == "first"
+    assert tab_widget.currentIndex() == 0
+    assert isinstance(tab_widget.widget(1), dock_module.HibernatedTab)
+    # Only widgets that can be hibernated are tracked, placeholders are forgotten when swapped out
+    tab_dock.check_hibernation()
+    assert set(tab_dock._last_active) <= set(tab_dock._recipes)
+
+
+def test_load_in_background(tab_dock: TabDock, qtbot: QtBot):
+    filename = str(TESTS_DIR / "dock1.ui")
+    screen_cache.clear()
+    tab_widget = tab_dock.tab_widgets[0][0]
+    TabDock.add_to_dock(widget=DeferredScreen(filename), new_tab=True)
+    assert isinstance(tab_widget.currentWidget(), dock_module.LoadingTab)
+    assert tab_widget.tabText(tab_widget.currentIndex()) == "dock1.ui"
+    qtbot.waitUntil(lambda: not isinstance(tab_widget.currentWidget(), dock_module.LoadingTab))
+    screen = tab_widget.currentWidget()
+    assert screen_cache.is_current(filename)
+    assert tab_widget.tabText(tab_widget.currentIndex()) == screen.windowTitle()
+    # Screens from compiled files are built right away
+    TabDock.add_to_dock(widget=DeferredScreen(filename, title="again"), new_tab=True)
+    assert not isinstance(tab_widget.currentWidget(), dock_module.LoadingTab)
+    assert tab_widget.currentWidget() is not screen
+    assert not any(isinstance(widget, dock_module.LoadingTab) for widget in tab_dock._last_active)
+    screen_cache.clear()
+
+
+def test_retry_failed_load(tab_dock: TabDock, qtbot: QtBot, tmp_path: Path):
+    broken = tmp_path / "broken.ui"
+    broken.write_text("<ui version=")
+    tab_widget = tab_dock.tab_widgets[0][0]
+    TabDock.add_to_dock(widget=DeferredScreen(str(broken)), new_tab=True)
+    placeholder = tab_widget.currentWidget()
+    assert isinstance(placeholder, dock_module.LoadingTab)
+    qtbot.waitUntil(lambda: placeholder.failed)
+    assert not placeholder.retry_button.isHidden()
+
+    # Still broken, so it fails again
+    placeholder.retry_button.click()
+    assert not placeholder.failed
+    qtbot.waitUntil(lambda: placeholder.failed)
+
+    # Selecting the tab again after fixing the file loads it
+    broken.write_text((TESTS_DIR / "dock1.ui").read_text())
+    TabDock.add_to_dock(widget=QWidget(), title="other", new_tab=True)
+    tab_widget.setCurrentIndex(tab_widget.indexOf(placeholder))
+    qtbot.waitUntil(lambda: not isinstance(tab_widget.widget(0), dock_module.LoadingTab))
+    assert tab_widget.widget(0).windowTitle() == "DOCK1"
+    assert tab_widget.tabText(0) == "DOCK1"
+
+
+def test_save_restore_session(tab_dock: TabDock, qtbot: QtBot, tmp_path: Path):
+    screen_cache.clear()
+    dock1 = str(TESTS_DIR / "dock1.ui")
+    dock2 = str(TESTS_DIR / "dock2.ui")
+    TabDock.add_to_dock(widget=DeferredScreen(dock1, macros={"A": "1"}), title="one", new_tab=True)
+    TabDock.add_to_dock(widget=DeferredScreen(dock2), title="two", new_tab=True)
+    tab_widget = tab_dock.tab_widgets[0][0]
+    qtbot.waitUntil(lambda: not any(isinstance(tab_widget.widget(idx), dock_module.LoadingTab) for idx in range(2)))
+    # Plain widgets can't be saved
+    plain = QWidget()
+    qtbot.add_widget(plain)
+    TabDock.add_to_dock(widget=plain, title="plain", new_tab=True)
+    window = TabDock.open_in_new_window(widget=DeferredScreen(dock2, macros={"B": "2"}), title="window")
+    qtbot.add_widget(window)
+    window.setGeometry(100, 120, 300, 200)
+    tab_widget.setCurrentIndex(1)
+    session_file = tmp_path / "session.json"
+    TabDock.save_session(session_file)
+    window.close()
+
+    new_dock = TabDock()
+    qtbot.add_widget(new_dock)
+    screen_cache.clear()
+    TabDock.restore_session(session_file)
+    new_tabs = new_dock.tab_widgets[0][0]
+    assert [new_tabs.tabText(idx) for idx in range(new_tabs.count())] == ["one", "two"]
+    assert new_tabs.currentIndex() == 1
+    # Only the selected tab is loaded
+    assert isinstance(new_tabs.widget(0), dock_module.HibernatedTab)
+    assert new_tabs.widget(0).recipe.macros == {"A": "1"}
+    qtbot.waitUntil(lambda: not isinstance(new_tabs.widget(1), dock_module.HibernatedTab))
+    assert new_tabs.widget(1).windowTitle() == "DOCK2"
+    (restored,) = new_dock.detached_widgets
+    assert restored.windowTitle() == "window"
+    assert restored.geometry().width() == 300
+    restored.close()
+    screen_cache.clear()
+
+
+def test_restore_session_errors(tab_dock: TabDock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    warnings = []
+    monkeypatch.setattr(dock_module.QMessageBox, "warning", lambda *args: warnings.append(args[2]))
+    monkeypatch.setattr(dock_module, "DOCK_SESSION_FILE", tmp_path / "missing.json")
+    # The button reports the error instead of raising it in the slot
+    tab_dock._restore_session_clicked()
+    assert len(warnings) == 1
+    with pytest.raises(FileNotFoundError):
+        TabDock.restore_session(tmp_path / "missing.json")
+
+    corrupt = tmp_path / "corrupt.json"
+    corrupt.write_text('{"docks": [')
+    with pytest.raises(ValueError):
+        TabDock.restore_session(corrupt)
+
+    bad_row = {"rows": 1, "cols": 1, "docks": [{"row": 3, "col": 0, "tabs": [{"filename": "a.ui"}]}]}
+    with pytest.raises(ValueError, match="row 3"):
+        TabDock.apply_session(bad_row)
+    with pytest.raises(ValueError, match="filename"):
+        TabDock.apply_session({"docks": [{"row": 0, "col": 0, "tabs": [{"title": "no file"}]}]})
+    assert tab_dock.tab_widgets[0][0].count() == 0
+
+    monkeypatch.setattr(dock_module, "DOCK_SESSION_FILE", tmp_path / "not_a_dir.json" / "session.json")
+    (tmp_path / "not_a_dir.json").write_text("")
+    tab_dock._save_session_clicked()
+    assert len(warnings) == 2
@@ -7,6 +7,7 @@ from pathlib import Path
 import pytest
 from pytestqt.qtbot import QtBot
 
+from pcdswidgets.common.dock.screen_cache import screen_cache
 from pcdswidgets.common.dock.tab_dock_button import TabDockButton
 
 TESTS_DIR = Path(__file__).parent.resolve()
@@ -49,3 +50,26 @@ def test_build_widget_ui_edited(dock_button: TabDockButton, tmp_path: Path):
     widget2 = dock_button.build_widget()
     assert widget1 is not widget2
     assert widget2.windowTitle() == "NEW_EDIT"
+
+
+def test_build_widget_shared(qtbot: QtBot):
+    filename = str(TESTS_DIR / "dock2.ui")
+    screen_cache.clear()
+    buttons = []
+    for macro in ("", "A=1"):
+        button = TabDockButton()
+        qtbot.addWidget(button)
+        button.setFilename(filename)
+        button.setMacro(macro)
+        buttons.append(button)
+    widget1, widget2 = (button.build_widget() for button in buttons)
+    # The compiled file is shared, but each button has its own screen
+    assert len(screen_cache) == 1
+    assert widget1 is not widget2
+    assert buttons[0].cached_widget is widget1
+    assert buttons[0].build_widget() is widget1
+    # Deleted widgets are built again
+    with qtbot.waitSignal(widget1.destroyed):
+        widget1.deleteLater()
+    assert buttons[0].cached_widget is None
+    assert buttons[0].build_widget() is not widget1
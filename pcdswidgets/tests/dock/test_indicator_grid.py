@@ -87,3 +87,159 @@ def test_indicator_cell_add_device(cell):
         motor = SynAxis(name=f"motor_{i}")
         cell.add_device(motor)
     assert len(cell.devices) == 12
+
+
+class FakeSearchResult:
+    def __init__(self, name, location_group, functional_group):
+        self.metadata = {
+            "name": name,
+            "location_group": location_group,
+            "functional_group": functional_group,
+        }
+
+    def get(self, threaded=False):
+        return SynAxis(name=self.metadata["name"])
+
+
+class FakeClient:
+    def search(self, **kwargs):
+        return [
+            FakeSearchResult(f"motor_{i}", location_group=f"stand_{i % 2}", functional_group=f"sys_{i % 3}")
+            for i in range(12)
+        ]
+
+
+@pytest.mark.skipif(no_ophyd, reason=SKIP_REASON)
+def test_happi_loader_streams_devices(qtbot, monkeypatch):
+    from pcdswidgets.common.dock import indicator_grid
+
+    monkeypatch.setattr(indicator_grid, "_HAPPI_CLIENT", FakeClient())
+    results = {}
+    loader = indicator_grid.HappiLoader(
+        beamline=["TST"],
+        group_keys=("location_group", "functional_group"),
+        callbacks=[lambda devices: results.update(devices)],
+        max_workers=4,
+    )
+    layouts = []
+    streamed = []
+    loader.layout_loaded.connect(layouts.append)
+    loader.device_loaded.connect(lambda key, device: streamed.append((key, device.name)))
+    with qtbot.waitSignal(loader.finished, timeout=10000):
+        loader.start()
+    qtbot.waitUntil(lambda: len(results) == 6)
+    assert layouts == [sorted(f"stand_{i}|sys_{j}" for i in range(2) for j in range(3))]
+    assert len(streamed) == 12
+    assert [dev.name for dev in results["stand_0|sys_0"]] == ["motor_0", "motor_6"]
+    assert set(loader.load_times) == {f"motor_{i}" for i in range(12)}
+
+
+def test_happi_cache_roundtrip(tmp_path, monkeypatch):
+    import datetime
+    from types import SimpleNamespace
+
+    from pcdswidgets.common.dock import indicator_grid
+
+    monkeypatch.setattr(indicator_grid, "HAPPI_CACHE_DIR", tmp_path / "cache")
+    db = tmp_path / "db.json"
+    db.write_text("{}")
+    client = SimpleNamespace(backend=SimpleNamespace(path=str(db)))
+    fingerprint = indicator_grid.get_happi_fingerprint(client)
+    keys = ("location_group", "functional_group")
+    entries = [("stand|sys", {"name": "motor", "creation": datetime.datetime(2024, 1, 2, 3, 4, 5)})]
+
+    assert indicator_grid.load_happi_cache(["TST"], keys, fingerprint) is None
+    indicator_grid.save_happi_cache(["TST"], keys, fingerprint, entries)
+    assert indicator_grid.load_happi_cache(["TST"], keys, fingerprint) == entries
+    assert indicator_grid.load_happi_cache(["OTHER"], keys, fingerprint) is None
+
+    db.write_text('{"changed": true}')
+    new_fingerprint = indicator_grid.get_happi_fingerprint(client)
+    assert new_fingerprint != fingerprint
+    assert indicator_grid.load_happi_cache(["TST"], keys, new_fingerprint) is None
+    assert indicator_grid.get_happi_fingerprint(SimpleNamespace(backend=object())) is None
+
+
+@pytest.mark.skipif(no_ophyd, reason=SKIP_REASON)
+def test_indicator_grid_update_from_dict(qtbot):
+    from pcdswidgets.common.dock.indicator_grid import IndicatorGrid
+
+    grid = IndicatorGrid()
+    qtbot.addWidget(grid)
+    motors = [SynAxis(name=f"grid_motor_{i}") for i in range(4)]
+    grid.add_from_dict({"s0|a": motors[:2], "s1|a": motors[2:]})
+    kept_indicator = grid._device_entries["grid_motor_0"][2]
+    moved_indicator = grid._device_entries["grid_motor_1"][2]
+
+    replacement = SynAxis(name="grid_motor_3")
+    grid.update_from_dict({"s0|a": [motors[0]], "s1|a": [motors[1], replacement], "s1|b": [SynAxis(name="new")]})
+    assert grid._cells["s0|a"].devices == [motors[0]]
+    assert grid._cells["s1|a"].devices == [motors[1], replacement]
+    assert grid._cells["s1|b"].devices[0].name == "new"
+    assert "grid_motor_2" not in grid._device_entries
+    assert grid._device_entries["grid_motor_0"][2] is kept_indicator
+    assert grid._device_entries["grid_motor_1"][2] is moved_indicator
+    assert grid._cells["s1|a"].indicators[0] is moved_indicator
+
+
+def grid_layout(grid) -> dict[tuple[int, int], str]:
+    """Return the title or "stand|system" key of every header and cell, by grid position."""
+    names = {id(group): f"group {title}" for title, group in grid._groups.items()}
+    names.update({id(cell): f"cell {key}" for key, cell in grid._cells.items()})
+    layout = {}
+    for index in range(grid.grid.count()):
+        widget = grid.grid.itemAt(index).widget()
+        row, col, _, _ = grid.grid.getItemPosition(index)
+        layout[(row, col)] = names[id(widget)]
+    return layout
+
+
+def test_indicator_grid_update_matches_fresh_grid(qtbot):
+    from pcdswidgets.common.dock.indicator_grid import IndicatorGrid
+
+    grid = IndicatorGrid()
+    qtbot.addWidget(grid)
+    grid.add_from_dict({"s1|b": [], "s0|a": [], "s3|d": []})
+    # s3 and d are gone, s2 and c are new and sort before the end
+    layout = {"s2|a": [], "s0|c": [], "s1|b": []}
+    grid.update_from_dict(layout)
+    grid.update_from_dict(layout)
+    fresh = IndicatorGrid()
+    qtbot.addWidget(fresh)
+    fresh.add_from_dict(layout)
+    assert grid_layout(grid) == grid_layout(fresh)
+    assert sorted(grid._groups) == ["a", "b", "c", "s0", "s1", "s2"]
+    assert len(grid._cells) == 9
+    assert grid_layout(grid)[(1, 3)] == "cell s2|a"
+    assert all(len(group.cells) == 3 for group in grid._groups.values())
+
+
+def test_refresh_waits_for_running_loader(qtbot, monkeypatch):
+    import threading
+
+    from pcdswidgets.common.dock import indicator_grid
+
+    release = threading.Event()
+    started = []
+
+    def slow_load(self, row_group_key, col_group_key):
+        started.append(self)
+        release.wait(10)
+        return {}
+
+    monkeypatch.setattr(indicator_grid.HappiLoader, "_load_from_happi", slow_load)
+    grid = indicator_grid.IndicatorGrid()
+    qtbot.addWidget(grid)
+    grid._beamline = "TST"
+    grid.refresh_happi()
+    first = grid.loader
+    qtbot.waitUntil(lambda: len(started) == 1)
+    # The happi file changes again during the slow load
+    grid.refresh_happi()
+    assert grid.loader is first
+    assert grid._refresh_pending
+    release.set()
+    qtbot.waitUntil(lambda: len(started) == 2)
+    assert grid.loader is not first
+    assert not grid._refresh_pending
+    qtbot.waitUntil(lambda: not indicator_grid._RUNNING_LOADERS)
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+from pytestqt.qtbot import QtBot
+from qtpy.QtCore import Qt
+from qtpy.QtWidgets import QWidget
+
+from pcdswidgets.common.dock import screen_cache as screen_cache_module
+from pcdswidgets.common.dock.screen_cache import DeferredScreen, ScreenCache, ScreenPrewarmer, screen_cache
+
+TESTS_DIR = Path(__file__).parent.resolve()
+
+
+def test_prewarm_screens(qtbot: QtBot):
+    screen_cache.clear()
+    dock1 = str(TESTS_DIR / "dock1.ui")
+    dock2 = str(TESTS_DIR / "dock2.ui")
+    prewarmer = ScreenPrewarmer([dock2, str(TESTS_DIR / "missing.ui"), __file__, dock1, dock2], idle_ms=10)
+    with qtbot.waitSignal(prewarmer.finished, timeout=10000):
+        prewarmer.start()
+    assert prewarmer.prepared == [dock2, dock1]
+    assert prewarmer.pending() == 0
+    assert len(screen_cache) == 2
+    assert screen_cache.is_current(dock1)
+
+
+def test_prewarm_budget(qtbot: QtBot):
+    dock1 = str(TESTS_DIR / "dock1.ui")
+    dock2 = str(TESTS_DIR / "dock2.ui")
+    prewarmer = ScreenPrewarmer([dock1, dock2], idle_ms=10, max_files=1)
+    with qtbot.waitSignal(prewarmer.finished, timeout=10000):
+        prewarmer.start()
+    assert prewarmer.prepared == [dock1]
+
+
+def test_prewarm_pauses_on_input(qtbot: QtBot):
+    widget = QWidget()
+    qtbot.add_widget(widget)
+    prewarmer = ScreenPrewarmer([str(TESTS_DIR / "dock1.ui")], idle_ms=1000)
+    prewarmer.start()
+    qtbot.wait(500)
+    qtbot.keyClick(widget, Qt.Key_A)
+    assert prewarmer._timer.remainingTime() > 800
+    prewarmer.stop()
+    assert prewarmer.prepared == []
+
+
+def test_screen_cache_only_recompiles_changed_file(tmp_path: Path, monkeypatch):
+    compiled = []
+    compile_ui = screen_cache_module._compile_ui
+
+    def counting_compile(path):
+        compiled.append(path)
+        return compile_ui(path)
+
+    monkeypatch.setattr(screen_cache_module, "_compile_ui", counting_compile)
+    cache = ScreenCache(max_files=2)
+    text = (TESTS_DIR / "dock1.ui").read_text()
+    first, second, third = (tmp_path / f"screen{num}.ui" for num in range(3))
+    first.write_text(text)
+    second.write_text(text)
+    cache.compile(str(first))
+    cache.compile(str(second))
+    assert cache.compile(str(first)).class_name
+    assert compiled == [str(first), str(second)]
+
+    second.write_text(text.replace("DOCK1", "EDITED"))
+    assert not cache.is_current(str(second))
+    assert cache.is_current(str(first))
+    assert "EDITED" in cache.compile(str(second)).code
+    assert compiled == [str(first), str(second), str(second)]
+
+    # The least recently used file is dropped
+    third.write_text(text)
+    cache.compile(str(third))
+    assert str(first) not in cache
+    assert len(cache) == 2
+
+
+def test_screen_cache_fallback(qtbot: QtBot, monkeypatch):
+    # As if pydm didn't have the private helpers for loading compiled files
+    monkeypatch.setattr(screen_cache_module, "_compile_ui", None)
+    screen_cache.clear()
+    screen = DeferredScreen(str(TESTS_DIR / "dock1.ui"))
+    screen.prepare()
+    widget = screen.build()
+    qtbot.add_widget(widget)
+    assert widget.windowTitle() == "DOCK1"
+    assert len(screen_cache) == 0
+    assert ScreenPrewarmer([screen.filename]).pending() == 0
@@ -0,0 +1,266 @@
+"""
+Unit tests for the FilterSortWidgetTable.
+
+The template ui file uses local pydm channels so that every row gets
+a live channel value without any external servers.
+"""
+
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pytestqt.qtbot import QtBot
+
+from pcdswidgets.table import (
+    ChannelTableWidgetItem,
+    ColumnStore,
+    FilterSortWidgetTable,
+    UpdateCoalescer,
+    load_macros_file,
+)
+
+TESTS_DIR = Path(__file__).parent.resolve()
+ROW_UI = str(TESTS_DIR / "table_row.ui")
+
+
+def make_macros(count: int, prefix: str) -> list[dict[str, str]]:
+    return [{"name": f"{prefix}_{i}", "init": str(i - count // 2)} for i in range(count)]
+
+
+@pytest.fixture(scope="function")
+def table(qtbot: QtBot) -> FilterSortWidgetTable:
+    table = FilterSortWidgetTable()
+    qtbot.addWidget(table)
+    table.ui_filename = ROW_UI
+    return table
+
+
+@pytest.mark.parametrize("extension", (".json", ".jsonl", ".csv"))
+def test_load_macros_file(tmp_path: Path, extension: str):
+    macros = make_macros(5, "load")
+    path = tmp_path / f"macros{extension}"
+    if extension == ".json":
+        path.write_text(json.dumps(macros))
+    elif extension == ".jsonl":
+        path.write_text("\n".join(json.dumps(entry) for entry in macros) + "\n\n")
+    else:
+        path.write_text("name,init\n" + "\n".join(f"{entry['name']},{entry['init']}" for entry in macros))
+    assert load_macros_file(str(path)) == macros
+
+
+def test_incremental_population(table: FilterSortWidgetTable, qtbot: QtBot, tmp_path: Path):
+    macros = make_macros(10, "incremental")
+    path = tmp_path / "macros.jsonl"
+    path.write_text("\n".join(json.dumps(entry) for entry in macros))
+    progress = []
+    table.population_progress.connect(lambda done, total: progress.append((done, total)))
+    table.populate_chunk_size = 3
+    with qtbot.waitSignal(table.population_finished, timeout=5000):
+        table.macros_filename = str(path)
+    assert table.rowCount() == 10
+    assert progress == [(3, 10), (6, 10), (9, 10), (10, 10)]
+    assert not table.is_populating()
+
+
+def test_filter_expressions(table: FilterSortWidgetTable, qtbot: QtBot):
+    table.set_macros(make_macros(10, "filter"))
+    qtbot.waitUntil(lambda: table.get_column_values()["readback"].dtype == float)
+    table.filter_expressions = ["readback >= 0 and name != ''", "not valid >"]
+    assert list(table._filters) == ["readback >= 0 and name != ''"]
+    shown = [table.get_row_values(row)["readback"] for row in range(10) if not table.isRowHidden(row)]
+    assert shown == [0, 1, 2, 3, 4]
+
+
+def test_column_store():
+    store = ColumnStore()
+    rows = [store.add_row() for _ in range(20)]
+    for row in rows:
+        store.set_value(row, "int", row)
+        store.set_value(row, "num", row)
+        store.set_value(row, "text", str(row))
+        store.set_value(row, "flag", row % 2 == 0)
+        store.set_connected(row, "num", row != 3)
+    store.set_value(5, "num", 0.5)
+    order = np.arange(19, -1, -1)
+    columns = store.get_columns(order)
+    assert columns["int"].dtype.kind == "i"
+    assert columns["num"].dtype == float
+    assert columns["text"].dtype.kind == "U"
+    assert columns["flag"].dtype == bool
+    assert columns["int"][0] == 19
+    assert columns["num"][14] == 0.5
+    assert list(np.flatnonzero(~columns["connected"])) == [16]
+    # A value of another kind makes it an object column, until it is replaced again
+    store.set_value(5, "num", None)
+    assert store.get_columns(order)["num"].dtype == object
+    store.set_value(5, "num", 5)
+    assert store.get_columns(order)["num"].dtype.kind == "i"
+    store.set_connected(3, "num", True)
+    assert store.get_columns(order)["connected"].all()
+
+
+def test_column_values_follow_sorting(table: FilterSortWidgetTable, qtbot: QtBot):
+    table.set_macros(make_macros(6, "sorted"))
+    qtbot.waitUntil(lambda: table.get_column_values()["readback"].dtype == float)
+    table.sort_table("readback", ascending=False)
+    columns = table.get_column_values()
+    for row in range(6):
+        values = table.get_row_values(row)
+        assert {header: columns[header][row] for header in values} == values
+    assert list(columns["readback"]) == [2, 1, 0, -1, -2, -3]
+
+
+def test_suspend_hidden_rows(table: FilterSortWidgetTable, qtbot: QtBot):
+    table.set_macros(make_macros(6, "suspend"))
+    qtbot.waitUntil(lambda: table.get_column_values()["readback"].dtype == float)
+    table.suspend_hidden_rows = True
+    table.add_filter_expression("positive", "readback > 0")
+
+    def connected_rows():
+        return [row for row in range(table.rowCount()) if table.cellWidget(row, 0)._is_connected]
+
+    assert connected_rows() == [4, 5]
+    # Value cells stay connected so the filters keep working
+    assert all(table.get_row_values(row)["connected"] for row in range(table.rowCount()))
+    table.activate_filter(False, "positive")
+    assert connected_rows() == list(range(6))
+
+
+@pytest.mark.parametrize("fmt", ("csv", "jsonl", "parquet"))
+def test_export_snapshot(table: FilterSortWidgetTable, qtbot: QtBot, tmp_path: Path, fmt: str):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    table.set_macros(make_macros(4, "export"))
+    qtbot.waitUntil(lambda: table.get_column_values()["readback"].dtype == float)
+    path = tmp_path / f"snapshot.{fmt}"
+    with qtbot.waitSignal(table.export_finished, timeout=5000):
+        table.export_snapshot(str(path))
+    if fmt == "csv":
+        lines = path.read_text().splitlines()
+        assert lines[0] == "index,name,init,readback,connected"
+        assert lines[1] == "0,export_0,-2,-2.0,True"
+        assert len(lines) == 5
+    elif fmt == "jsonl":
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert rows[3] == {"index": 3, "name": "export_3", "init": "1", "readback": 1, "connected": True}
+    else:
+        import pyarrow.parquet
+
+        assert pyarrow.parquet.read_table(path).num_rows == 4
+
+
+def test_export_snapshot_bad_format(table: FilterSortWidgetTable, tmp_path: Path):
+    with pytest.raises(ValueError):
+        table.export_snapshot(str(tmp_path / "snapshot.txt"))
+
+
+def readback_item(table: FilterSortWidgetTable, row: int) -> ChannelTableWidgetItem:
+    return table.item(row, table._header_map["readback"])
+
+
+def test_column_config_file(table: FilterSortWidgetTable, qtbot: QtBot, tmp_path: Path):
+    path = tmp_path / "columns.json"
+    path.write_text(json.dumps({"readback": {"deadband": 0.5, "max_update_rate": 4}}))
+    table.default_deadband = 0.1
+    table.column_config_filename = str(path)
+    table.set_macros(make_macros(3, "config"))
+    assert table.get_column_config("readback").deadband == 0.5
+    assert table.get_column_config("readback").max_update_rate == 4
+    assert table.get_column_config("other").deadband == 0.1
+    assert all(readback_item(table, row).deadband == 0.5 for row in range(3))
+    assert all(readback_item(table, row).max_update_rate == 4 for row in range(3))
+    # Settings left out of set_column_config are kept
+    table.set_column_config("readback", max_update_rate=0)
+    assert readback_item(table, 0).deadband == 0.5
+    assert readback_item(table, 0).max_update_rate == 0
+    # A broken file is logged and leaves the settings alone
+    path.write_text("{")
+    table.reload_column_config_file()
+    assert table.get_column_config("readback").deadband == 0.5
+
+
+def test_column_deadband(table: FilterSortWidgetTable, qtbot: QtBot):
+    table.set_macros(make_macros(2, "deadband"))
+    qtbot.waitUntil(lambda: table.get_column_values()["readback"].dtype == float)
+    table.set_column_config("readback", deadband=0.5)
+    item = readback_item(table, 0)
+    received, applied = table.get_update_counts()["readback"]
+    item.update_value(item.get_value() + 0.1)
+    assert item.get_value() == -1
+    assert item.text() == "-1.0"
+    item.update_value(item.get_value() + 1)
+    assert item.get_value() == 0
+    assert table.get_update_counts()["readback"] == (received + 2, applied + 1)
+
+
+def test_default_max_update_rate(table: FilterSortWidgetTable, qtbot: QtBot):
+    table.set_macros(make_macros(2, "rate"))
+    qtbot.waitUntil(lambda: table.get_column_values()["readback"].dtype == float)
+    table.default_max_update_rate = 5
+    assert readback_item(table, 1).max_update_rate == 5
+    item = readback_item(table, 1)
+    received, applied = table.get_update_counts()["readback"]
+    item._last_applied = 0.0
+    for value in range(10):
+        item.update_value(float(value))
+    # The first value is shown right away and the rest wait for the interval
+    assert item.get_value() == 0
+    assert table.get_update_counts()["readback"] == (received + 10, applied + 1)
+    qtbot.waitUntil(lambda: item.get_value() == 9, timeout=1000)
+    assert table.get_update_counts()["readback"] == (received + 10, applied + 2)
+
+
+def test_update_coalescer(qtbot: QtBot):
+    coalescer = UpdateCoalescer()
+    items = [ChannelTableWidgetItem("value", default=0, max_update_rate=10, coalescer=coalescer) for _ in range(5)]
+    for item in items:
+        item.update_value(1)
+        item.update_value(2)
+        item.update_value(3)
+    assert [item.text() for item in items] == ["1"] * 5
+    # Only the first deferred item moves the timer, later items are due after it
+    deadline = coalescer._deadline
+    assert deadline <= time.monotonic() + 0.1
+    items[0].update_value(4)
+    assert coalescer._deadline == deadline
+    qtbot.waitUntil(lambda: [item.text() for item in items] == ["4"] + ["3"] * 4, timeout=1000)
+    assert not coalescer._deferred
+    assert not coalescer._timer.isActive()
+
+
+def test_group_summary(table: FilterSortWidgetTable, qtbot: QtBot):
+    macros = make_macros(6, "group")
+    for i, entry in enumerate(macros):
+        entry["area"] = "even" if i % 2 == 0 else "odd"
+    table.group_by_header = "area"
+    table.set_macros(macros)
+    qtbot.waitUntil(lambda: table.get_column_values()["readback"].dtype == float)
+    table.add_filter_expression("positive", "readback > 0")
+    summaries = {summary.group: summary for summary in table.get_group_summaries()}
+    assert list(summaries) == ["even", "odd"]
+    assert summaries["even"].rows == 3
+    assert summaries["even"].connected == 3
+    assert summaries["even"].columns["readback"].mean == -1
+    assert summaries["odd"].columns["readback"].max == 2
+    assert summaries["odd"].filters == {"positive": 1}
+    summary_table = table.show_group_summary()
+    qtbot.addWidget(summary_table)
+    assert summary_table.rowCount() == 2
+    assert summary_table.item(1, 0).text() == "odd"
+    # Refreshes follow the source's changes, and wait while hidden
+    summary_table._timer.setInterval(10)
+    assert not summary_table._timer.isActive()
+    table._aggregator.update_connected(1, "readback", False)
+    assert summary_table._timer.isActive()
+    qtbot.waitUntil(lambda: summary_table.item(1, 2).text() == "2", timeout=1000)
+    summary_table.hide()
+    table._aggregator.update_connected(1, "readback", True)
+    assert not summary_table._timer.isActive()
+    assert summary_table.item(1, 2).text() == "2"
+    summary_table.show()
+    assert summary_table.item(1, 2).text() == "3"
+    # Clearing group_by_header empties the summary
+    table.group_by_header = ""
+    qtbot.waitUntil(lambda: summary_table.rowCount() == 0, timeout=1000)
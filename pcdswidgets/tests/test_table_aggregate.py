@@ -0,0 +1,66 @@
+import pytest
+
+from pcdswidgets.table_aggregate import GroupAggregator
+
+
+@pytest.fixture(scope="function")
+def aggregator() -> GroupAggregator:
+    agg = GroupAggregator(value_headers=["value"])
+    for row_id, (group, value) in enumerate((("a", 1.0), ("a", 5.0), ("a", 3.0), ("b", 10.0))):
+        agg.add_row(row_id, group, {"value": value}, {"value": True})
+    return agg
+
+
+def test_add_rows(aggregator: GroupAggregator):
+    assert aggregator.groups() == ["a", "b"]
+    assert aggregator.pop_changed() == {"a", "b"}
+    assert aggregator.pop_changed() == set()
+    summary = aggregator.summary("a")
+    assert summary.rows == 3
+    assert summary.connected == 3
+    column = summary.columns["value"]
+    assert (column.count, column.min, column.max, column.mean) == (3, 1.0, 5.0, 3.0)
+
+
+def test_update_value(aggregator: GroupAggregator):
+    aggregator.pop_changed()
+    # Replacing the max with a smaller value forces a rescan of the group
+    aggregator.update_value(1, "value", 2.0)
+    assert aggregator.pop_changed() == {"a"}
+    column = aggregator.summary("a").columns["value"]
+    assert (column.min, column.max, column.mean) == (1.0, 3.0, 2.0)
+    # Non-numeric values are left out of the statistics
+    aggregator.update_value(0, "value", None)
+    column = aggregator.summary("a").columns["value"]
+    assert (column.count, column.min, column.max) == (2, 2.0, 3.0)
+
+
+def test_update_connected_and_filters(aggregator: GroupAggregator):
+    aggregator.update_connected(0, "value", False)
+    aggregator.update_connected(0, "other", False)
+    aggregator.update_connected(0, "value", True)
+    assert aggregator.summary("a").connected == 2
+    for row_id in range(4):
+        aggregator.update_filter(row_id, "big", row_id > 1)
+    assert aggregator.summary("a").filters == {"big": 1}
+    assert aggregator.summary("b").filters == {"big": 1}
+    aggregator.remove_row(3)
+    assert aggregator.groups() == ["a"]
+    aggregator.forget_filter("big")
+    assert aggregator.summary("a").filters == {}
+
+
+def test_on_change(aggregator: GroupAggregator):
+    calls = []
+    aggregator.on_change = lambda: calls.append(None)
+    # Already changed since the last pop, so no new notification
+    aggregator.update_value(0, "value", 2.0)
+    assert calls == []
+    aggregator.pop_changed()
+    aggregator.update_value(0, "value", 4.0)
+    aggregator.update_value(3, "value", 4.0)
+    assert len(calls) == 1
+    aggregator.pop_changed()
+    aggregator.clear()
+    assert len(calls) == 2
+    assert aggregator.pop_changed() == {"a", "b"}
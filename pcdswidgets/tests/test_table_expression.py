@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from pcdswidgets.table_expression import FilterExpression, FilterExpressionError
+
+ROWS = [
+    {"index": 0, "readback": 1.5, "row_name": "a", "connected": True},
+    {"index": 1, "readback": -2.0, "row_name": "b", "connected": True},
+    {"index": 2, "readback": 0.0, "row_name": "", "connected": False},
+    {"index": 3, "readback": 7.0, "row_name": "d", "connected": True},
+]
+
+
+def columns_from_rows(rows):
+    return {key: np.asarray([row[key] for row in rows]) for key in rows[0]}
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    (
+        ('readback >= 0 and row_name != ""', [True, False, False, True]),
+        ("readback < 0 or not connected", [False, True, True, False]),
+        ('row_name in ("a", "d")', [True, False, False, True]),
+        ('row_name not in ["a", "d"]', [False, True, True, False]),
+        ("0 <= readback < 5", [True, False, True, False]),
+        ("readback * 2 > index + 1", [True, False, False, True]),
+        ("-readback > 1", [False, True, False, False]),
+        ("True", [True, True, True, True]),
+    ),
+)
+def test_expression_row_and_columns_agree(text, expected):
+    expr = FilterExpression(text)
+    assert [expr.evaluate_row(row) for row in ROWS] == expected
+    shown = expr.evaluate_columns(columns_from_rows(ROWS), len(ROWS))
+    assert shown.tolist() == expected
+
+
+def test_expression_names():
+    expr = FilterExpression('readback >= 0 and row_name != ""')
+    assert expr.names == {"readback", "row_name"}
+
+
+@pytest.mark.parametrize(
+    "text",
+    (
+        "readback >=",
+        "__import__('os')",
+        "readback.real > 0",
+        "readback[0] > 0",
+        "lambda: 1",
+        "readback in (row_name,)",
+    ),
+)
+def test_expression_errors(text):
+    with pytest.raises(FilterExpressionError):
+        FilterExpression(text)
+
+
+def test_expression_column_fallback():
+    # Comparing None with a number can't be vectorized, we should fall back per row
+    column = np.empty(3, dtype=object)
+    column[:] = [1.0, None, -1.0]
+    expr = FilterExpression("readback > 0")
+    shown = expr.evaluate_columns({"readback": column}, 3)
+    # Rows that error are shown
+    assert shown.tolist() == [True, True, False]
@@ -0,0 +1,132 @@
+from pathlib import Path
+
+import pytest
+import yaml
+from pytestqt.qtbot import QtBot
+from qtpy.QtWidgets import QPushButton
+
+import pcdswidgets.common.toolbar.yaml_config as config_module
+from pcdswidgets.common.toolbar.yaml_config import ToolbarConfigError, load_toolbar_config
+from pcdswidgets.common.toolbar.yaml_toolbar import YamlToolbar
+
+
+@pytest.fixture(autouse=True)
+def toolbar_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(config_module, "TOOLBAR_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
+@pytest.fixture(scope="function")
+def config_file(tmp_path: Path) -> str:
+    config = {}
+    for tab in range(20):
+        buttons = {f"shell {tab} {num}": {"type": "shell", "commands": ["echo hi"]} for num in range(5)}
+        config[f"tab {tab}"] = {"buttons": buttons}
+    config["tab 3"]["buttons"]["dock"] = {"type": "dock", "filename": "dock1.ui"}
+    config["tab 7"]["buttons"]["default dock"] = {"type": "dock", "filename": "dock2.ui", "default": True}
+    path = tmp_path / "toolbar.yaml"
+    path.write_text(yaml.safe_dump(config, sort_keys=False))
+    return str(path)
+
+
+def built_tabs(toolbar: YamlToolbar) -> list[int]:
+    return [idx for idx in range(toolbar.tab.count()) if toolbar.tab.widget(idx).widget() is not None]
+
+
+def test_yaml_toolbar_lazy_tabs(qtbot: QtBot, config_file: str):
+    toolbar = YamlToolbar()
+    qtbot.add_widget(toolbar)
+    toolbar.filename = config_file
+    assert toolbar.tab.count() == 20
+    # Startup cost doesn't depend on the number of tabs
+    assert built_tabs(toolbar) == [0, 7]
+    assert len(toolbar.findChildren(QPushButton)) == 11
+    assert toolbar.default_dock_button is not None
+    assert toolbar.default_dock_button.text() == "default dock"
+
+    toolbar.tab.setCurrentIndex(3)
+    assert built_tabs(toolbar) == [0, 3, 7]
+    assert toolbar.default_dock_button.text() == "default dock"
+    assert toolbar.tab.widget(3).widget().layout().count() == 6
+
+
+def test_yaml_toolbar_background_build(qtbot: QtBot, config_file: str):
+    toolbar = YamlToolbar()
+    qtbot.add_widget(toolbar)
+    toolbar.buildInBackground = True
+    toolbar.filename = config_file
+    qtbot.waitUntil(lambda: len(built_tabs(toolbar)) == 20, timeout=5000)
+    assert len(toolbar.findChildren(QPushButton)) == 102
+
+
+def test_load_toolbar_config_cached(config_file: str, toolbar_cache_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    config = load_toolbar_config(config_file)
+    assert list(config) == [f"tab {tab}" for tab in range(20)]
+    assert len(list(toolbar_cache_dir.iterdir())) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Should not parse a cached file")
+
+    monkeypatch.setattr(config_module, "parse_toolbar_config", fail)
+    assert load_toolbar_config(config_file) == config
+
+
+def test_load_toolbar_config_names_are_text(tmp_path: Path, toolbar_cache_dir: Path):
+    path = tmp_path / "names.yaml"
+    path.write_text("1:\n  buttons:\n    yes:\n      type: shell\n      commands: [echo hi]\n")
+    expected = {"1": {"buttons": {"yes": {"type": "shell", "commands": ["echo hi"]}}}}
+    assert load_toolbar_config(str(path)) == expected
+    # The cached load returns exactly the same config
+    assert load_toolbar_config(str(path)) == expected
+    assert len(list(toolbar_cache_dir.iterdir())) == 1
+
+
+@pytest.mark.parametrize("setting", ("since: 2024-01-02", "2: two"))
+def test_load_toolbar_config_not_cached(tmp_path: Path, toolbar_cache_dir: Path, setting: str):
+    path = tmp_path / "not_json.yaml"
+    path.write_text(f"tab:\n  buttons:\n    one:\n      type: shell\n      {setting}\n")
+    config = load_toolbar_config(str(path))
+    # Dates and number keys don't survive json, so nothing is cached or left behind
+    assert not toolbar_cache_dir.exists() or not list(toolbar_cache_dir.iterdir())
+    assert load_toolbar_config(str(path)) == config
+
+
+@pytest.mark.parametrize(
+    "text,line,message",
+    (
+        ("- a\n- b\n", 1, "toolbar to be a mapping"),
+        ("tab:\n  buttons:\n    one:\n      type: bad\n", 4, "expected one of"),
+        ("tab:\n  buttons:\n    one:\n      filename: a.ui\n", 4, "missing a type"),
+        ("tab:\n  config:\n    cols: zero\n", 3, "positive integer"),
+        ("? [a, b]\n: {}\n", 1, "tab name to be text"),
+        (
+            "tab:\n  buttons:\n    one:\n      type: shell\n      commands: !!python/object/apply:os.system ['echo']\n",
+            5,
+            "invalid yaml",
+        ),
+    ),
+)
+def test_load_toolbar_config_errors(tmp_path: Path, text: str, line: int, message: str):
+    path = tmp_path / "bad.yaml"
+    path.write_text(text)
+    with pytest.raises(ToolbarConfigError) as exc_info:
+        load_toolbar_config(str(path))
+    error = str(exc_info.value)
+    assert message in error
+    assert error.startswith(str(path))
+    assert f"line {line}" in error or f":{line}:" in error
+
+
+def test_yaml_toolbar_dock_screen_files(qtbot: QtBot, config_file: str):
+    toolbar = YamlToolbar()
+    qtbot.add_widget(toolbar)
+    toolbar.filename = config_file
+    config_dir = Path(config_file).parent
+    # The default dock button first, then the tabs in order
+    assert toolbar.dock_screen_files() == [str(config_dir / "dock2.ui"), str(config_dir / "dock1.ui")]
+    toolbar.prewarmScreens = True
+    assert toolbar.prewarmer is not None
+    assert toolbar.prewarmer.pending() == 2
+    toolbar.prewarmScreens = False
+    assert toolbar.prewarmer.pending() == 0
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from pcdswidgets.common.tools.scan_buffer import POSITION, VALUE, ScanBuffer
+
+
+def test_scan_buffer_grows():
+    buffer = ScanBuffer(initial_capacity=2)
+    assert buffer.bounds(POSITION) is None
+    for num in range(10):
+        buffer.append(num, 10 * num, 100 + num)
+    assert len(buffer) == 10
+    np.testing.assert_array_equal(buffer.positions, np.arange(10))
+    np.testing.assert_array_equal(buffer.values, 10 * np.arange(10))
+    np.testing.assert_array_equal(buffer.timestamps, 100 + np.arange(10))
+    assert buffer.bounds(POSITION) == (0, 9)
+    assert buffer.bounds(VALUE) == (0, 90)
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.positions.size == 0
+
+
+def test_scan_buffer_views_share_memory():
+    buffer = ScanBuffer(initial_capacity=16)
+    buffer.append(1, 2)
+    buffer.append(3, 4)
+    positions = buffer.positions
+    buffer.append(5, 6)
+    assert np.shares_memory(positions, buffer.positions)
+
+
+@pytest.mark.parametrize("points", (3, 5, 12))
+def test_scan_buffer_ring(points: int):
+    buffer = ScanBuffer(max_points=5)
+    for num in range(points):
+        buffer.append(num, -num)
+    expected = np.arange(max(0, points - 5), points)
+    np.testing.assert_array_equal(buffer.positions, expected)
+    np.testing.assert_array_equal(buffer.values, -expected)
+    assert buffer.bounds(POSITION) == (expected[0], expected[-1])
+
+
+def test_scan_buffer_nan_bounds():
+    buffer = ScanBuffer()
+    buffer.append(1, np.nan)
+    assert buffer.bounds(VALUE) is None
+    buffer.append(2, 5)
+    assert buffer.bounds(VALUE) == (5, 5)
+
+
+def test_scan_buffer_change_cap():
+    buffer = ScanBuffer()
+    for num in range(10):
+        buffer.append(num, num)
+    buffer.max_points = 4
+    np.testing.assert_array_equal(buffer.positions, [6, 7, 8, 9])
+    buffer.append(10, 10)
+    np.testing.assert_array_equal(buffer.positions, [7, 8, 9, 10])
+    buffer.max_points = 0
+    buffer.append(11, 11)
+    np.testing.assert_array_equal(buffer.positions, [7, 8, 9, 10, 11])
+
+
+def test_scan_buffer_nearest():
+    buffer = ScanBuffer()
+    assert buffer.nearest(1.0) is None
+    for position in (5.0, 1.0, 3.0, 9.0):
+        buffer.append(position, position * 2)
+    assert buffer.nearest(-10) == 1
+    assert buffer.nearest(2.9) == 2
+    assert buffer.nearest(6.5) == 0
+    assert buffer.nearest(100) == 3
+    buffer.append(7.0, 14.0)
+    assert buffer.nearest(6.5) == 4
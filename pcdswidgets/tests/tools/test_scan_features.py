@@ -0,0 +1,76 @@
+import math
+
+import numpy as np
+import pytest
+
+from pcdswidgets.common.tools.scan_features import GAUSSIAN_FWHM, ScanFeatures
+
+
+def gaussian(positions: np.ndarray, center: float, sigma: float) -> np.ndarray:
+    return 2 + 5 * np.exp(-((positions - center) ** 2) / (2 * sigma**2))
+
+
+def erf_edge(positions: np.ndarray, center: float, sigma: float) -> np.ndarray:
+    return np.array([1 + 3 * math.erf((pos - center) / (math.sqrt(2) * sigma)) for pos in positions])
+
+
+def test_scan_features_empty():
+    features = ScanFeatures(fit="gaussian")
+    assert features.peak is None
+    assert features.centroid is None
+    assert features.fwhm is None
+    assert features.edge is None
+    assert features.fit is None
+    assert features.targets() == {}
+
+
+def test_scan_features_peak():
+    positions = np.linspace(1000, 1010, 201)
+    features = ScanFeatures(fit="gaussian")
+    for position, value in zip(positions, gaussian(positions, 1004.2, 0.8), strict=True):
+        features.add(position, value)
+    features.add(1005, np.nan)
+    assert features.count == 201
+    assert features.peak == pytest.approx(1004.2)
+    assert features.centroid == pytest.approx(1004.2, abs=0.05)
+    assert features.fwhm == pytest.approx(GAUSSIAN_FWHM * 0.8, rel=0.05)
+    assert features.fit.center == pytest.approx(1004.2, abs=1e-3)
+    assert features.fit.fwhm == pytest.approx(GAUSSIAN_FWHM * 0.8, rel=1e-3)
+    assert features.fit.amplitude == pytest.approx(5, rel=1e-2)
+    assert set(features.targets()) == {"peak", "centroid", "edge", "gaussian fit"}
+
+
+def test_scan_features_edge():
+    positions = np.linspace(-5, 5, 301)
+    features = ScanFeatures(fit="erf")
+    for position, value in zip(positions, erf_edge(positions, 1.5, 0.4)[::-1], strict=True):
+        features.add(position, value)
+    assert features.edge == pytest.approx(-1.5, abs=0.05)
+    assert features.fit.center == pytest.approx(-1.5, abs=0.02)
+    assert features.fit.sigma == pytest.approx(0.4, rel=0.05)
+    # A falling edge
+    assert features.fit.amplitude == pytest.approx(-6, rel=0.05)
+
+
+def test_scan_features_constant_size():
+    features = ScanFeatures(fit="gaussian", fit_points=16)
+    positions = np.linspace(0, 1, 10_000)
+    for position, value in zip(positions, gaussian(positions, 0.5, 0.1), strict=True):
+        features.add(position, value)
+    # The fit sample stays the same size and spans the whole scan
+    sample = features._sample[:, : features._sample_count]
+    assert features._sample_count <= 16
+    assert sample[0].min() == 0
+    assert sample[0].max() > 0.9
+    assert features.fit.center == pytest.approx(0.5, abs=0.01)
+
+
+def test_scan_features_reset():
+    features = ScanFeatures(fit="erf")
+    for position in range(10):
+        features.add(position, position)
+    features.reset()
+    assert features.count == 0
+    assert features.targets() == {}
+    with pytest.raises(ValueError):
+        features.fit_type = "lorentzian"
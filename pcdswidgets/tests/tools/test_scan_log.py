@@ -0,0 +1,58 @@
+import os
+from pathlib import Path
+
+import numpy as np
+from pytestqt.qtbot import QtBot
+
+from pcdswidgets.common.tools.scan_log import (
+    ScanRecorder,
+    find_incomplete_scan,
+    new_scan_log_path,
+    prune_scan_logs,
+    read_scan_log,
+)
+
+
+def test_scan_recorder_roundtrip(qtbot: QtBot, tmp_path: Path):
+    path = new_scan_log_path("MTR:01", "DET:01", directory=tmp_path)
+    recorder = ScanRecorder(path, header={"step_size": 0.5})
+    for num in range(5):
+        recorder.record(num, 2 * num, 100 + num)
+    recorder.close()
+
+    scan = find_incomplete_scan("MTR:01", "DET:01", directory=tmp_path)
+    assert scan is not None
+    assert scan.filename == path
+    assert scan.header == {"step_size": 0.5}
+    np.testing.assert_array_equal(scan.points[:, 0], np.arange(5))
+    np.testing.assert_array_equal(scan.points[:, 1], 2 * np.arange(5))
+    assert not scan.complete
+    assert find_incomplete_scan("MTR:01", "DET:02", directory=tmp_path) is None
+
+    # Resume the scan, then finish it
+    recorder = ScanRecorder(path, header={"ignored": True})
+    recorder.record(5, 10, 105)
+    recorder.finish()
+    scan = read_scan_log(path)
+    assert scan.complete
+    assert scan.header == {"step_size": 0.5}
+    assert len(scan.points) == 6
+    assert find_incomplete_scan("MTR:01", "DET:01", directory=tmp_path) is None
+
+
+def test_read_truncated_scan_log(tmp_path: Path):
+    path = tmp_path / "scan.jsonl"
+    path.write_text('{"header": {}}\n[1, 2, 3]\n[4, 5, NaN]\n[6, 7')
+    scan = read_scan_log(path)
+    assert not scan.complete
+    assert scan.points.shape == (2, 3)
+    assert np.isnan(scan.points[1, 2])
+
+
+def test_prune_scan_logs(tmp_path: Path):
+    for num in range(5):
+        path = tmp_path / f"scan{num}.jsonl"
+        path.write_text("")
+        os.utime(path, (num, num))
+    prune_scan_logs(tmp_path, keep=2)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["scan3.jsonl", "scan4.jsonl"]
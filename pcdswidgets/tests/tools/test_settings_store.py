@@ -0,0 +1,51 @@
+import json
+from pathlib import Path
+
+from pytestqt.qtbot import QtBot
+
+from pcdswidgets.common.tools.settings_store import SettingsStore
+
+
+def test_settings_store_debounced(qtbot: QtBot, tmp_path: Path):
+    path = tmp_path / "settings.json"
+    store = SettingsStore(path, debounce_ms=50)
+    store.set("a::b", {"step_size": 1})
+    store.set("a::b", {"step_size": 2})
+    # Nothing is written until the edits stop
+    assert not path.exists()
+    assert store.get("a::b") == {"step_size": 2}
+    qtbot.waitUntil(path.exists)
+    assert json.loads(path.read_text()) == {"a::b": {"step_size": 2}}
+
+
+def test_settings_store_merges(tmp_path: Path):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"old::key": {"step_size": 0}}))
+    first = SettingsStore(path)
+    second = SettingsStore(path)
+    first.set("m1::d1", {"step_size": 1})
+    second.set("m2::d2", {"step_size": 2})
+    second.delete("old::key")
+    first.flush()
+    second.flush()
+    assert json.loads(path.read_text()) == {"m1::d1": {"step_size": 1}, "m2::d2": {"step_size": 2}}
+    assert first.get("m2::d2") == {"step_size": 2}
+    assert first.get("old::key") is None
+    assert sorted(first.keys()) == ["m1::d1", "m2::d2"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_settings_store_presets(tmp_path: Path):
+    path = tmp_path / "settings.json"
+    first = SettingsStore(path)
+    second = SettingsStore(path)
+    first.save_preset("coarse", {"step_size": 1.0})
+    second.save_preset("fine", {"step_size": 0.01})
+    first.flush()
+    second.flush()
+    assert first.preset_names() == ["coarse", "fine"]
+    assert first.get_preset("fine") == {"step_size": 0.01}
+    assert first.keys() == []
+    first.delete_preset("coarse")
+    assert first.preset_names() == ["fine"]
+    assert first.get_preset("coarse") is None
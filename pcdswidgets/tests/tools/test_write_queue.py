@@ -0,0 +1,50 @@
+import threading
+
+import pytest
+from pytestqt.qtbot import QtBot
+
+import pcdswidgets.common.tools.write_queue as write_queue_module
+from pcdswidgets.common.tools.write_queue import PVWriteQueue, WriteRequest
+
+
+@pytest.fixture(scope="function")
+def fake_caput(monkeypatch: pytest.MonkeyPatch) -> list:
+    writes = []
+
+    def caput(pvname, value, wait=False, connection_timeout=5.0):
+        writes.append((pvname, value, threading.current_thread()))
+        if pvname == "MISSING":
+            return None
+        if pvname == "BROKEN":
+            raise RuntimeError("broken")
+        return 1
+
+    monkeypatch.setattr(write_queue_module, "caput", caput)
+    return writes
+
+
+def test_write_queue(qtbot: QtBot, fake_caput: list):
+    write_queue = PVWriteQueue(timeout=0.5)
+    results = []
+
+    def callback(request: WriteRequest):
+        results.append((request, threading.current_thread()))
+
+    with qtbot.waitSignals([write_queue.write_finished] * 3, timeout=5000):
+        write_queue.put("MOTOR.VAL", 1.5, callback=callback)
+        write_queue.put("MISSING", 2, callback=callback)
+        write_queue.put("BROKEN", 3, callback=callback, timeout=0.1)
+    qtbot.waitUntil(lambda: len(results) == 3)
+    write_queue.stop()
+
+    assert [write[:2] for write in fake_caput] == [("MOTOR.VAL", 1.5), ("MISSING", 2), ("BROKEN", 3)]
+    assert all(write[2] is not threading.main_thread() for write in fake_caput)
+    assert all(thread is threading.main_thread() for _, thread in results)
+    ok, missing, broken = (request for request, _ in results)
+    assert ok.ok
+    assert ok.latency is not None and ok.latency >= 0
+    assert not missing.ok
+    assert "0.5 s" in missing.error
+    assert not broken.ok
+    assert broken.error == "broken"
+    assert broken.timeout == 0.1